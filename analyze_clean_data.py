@@ -1,11 +1,73 @@
 """
 Script untuk menganalisis kelayakan data clean 3-class dan 5-class untuk training IndoBERT
+
+Statistik dihitung per chunk lalu digabung, jadi file besar bisa dianalisis
+dengan memori terbatas (ANALYZE_CHUNK_ROWS); None = baca sekaligus.
 """
 import pandas as pd
 import re
 
-def analyze_clean_data(filepath, class_type):
-    df = pd.read_csv(filepath)
+from stream_utils import SeenSet, ReservoirSampler
+
+ANALYZE_CHUNK_ROWS = None  # Baris per chunk (mis. 100000 untuk file besar); None = satu chunk
+
+EMOJI_PATTERN = r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]'
+URL_PATTERN = r'http[s]?://\S+'
+
+def iter_frames(filepath, chunksize=None):
+    """DataFrame per chunk (atau satu DataFrame jika chunksize None)"""
+    if chunksize:
+        yield from pd.read_csv(filepath, chunksize=chunksize)
+    else:
+        yield pd.read_csv(filepath)
+
+def add_counts(total, counts):
+    """Jumlahkan dua Series hitungan (index digabung)"""
+    return counts if total is None else total.add(counts, fill_value=0).astype(int)
+
+def analyze_clean_data(filepath, class_type, chunksize=ANALYZE_CHUNK_ROWS):
+    total = missing = 0
+    columns = None
+    sent_dist = rating_sent = None
+    length_min = length_max = words_min = words_max = None
+    length_sum = words_sum = 0
+    short = medium = good = long_text = 0
+    dup = empty = has_emoji = has_url = 0
+    samples = {}
+    
+    with SeenSet() as seen:
+        for df in iter_frames(filepath, chunksize):
+            total += len(df)
+            columns = list(df.columns) if columns is None else columns
+            missing += df.isna().sum().sum()
+            sent_dist = add_counts(sent_dist, df['sentiment'].value_counts())
+            
+            content_length = df['content_clean'].astype(str).str.len()
+            word_count = df['content_clean'].astype(str).str.split().str.len()
+            if len(df) and length_min is None:
+                length_min, length_max = content_length.min(), content_length.max()
+                words_min, words_max = word_count.min(), word_count.max()
+            elif len(df):
+                length_min = min(length_min, content_length.min())
+                length_max = max(length_max, content_length.max())
+                words_min = min(words_min, word_count.min())
+                words_max = max(words_max, word_count.max())
+            length_sum += content_length.sum()
+            words_sum += word_count.sum()
+            
+            short += int((content_length < 20).sum())
+            medium += int(((content_length >= 20) & (content_length < 50)).sum())
+            good += int(((content_length >= 50) & (content_length < 100)).sum())
+            long_text += int((content_length >= 100).sum())
+            
+            dup += int((~seen.add_new(df['content_clean'])).sum())
+            empty += int((df['content_clean'].str.strip() == '').sum())
+            has_emoji += int(df['content_clean'].str.contains(EMOJI_PATTERN, regex=True, na=False).sum())
+            has_url += int(df['content_clean'].str.contains(URL_PATTERN, regex=True, na=False).sum())
+            
+            for sent, rows in df.groupby('sentiment', sort=False):
+                samples.setdefault(sent, ReservoirSampler(2, seed=42)).add(rows[['content_clean']])
+            rating_sent = add_counts(rating_sent, df.groupby(['rating', 'sentiment']).size())
     
     print('='*60)
     print(f'ANALISIS DATA {class_type.upper()} - {filepath.split("/")[-1]}')
@@ -13,14 +75,13 @@ def analyze_clean_data(filepath, class_type):
     
     # Basic info
     print(f'\n1. INFORMASI DASAR:')
-    print(f'   Total rows: {len(df):,}')
-    print(f'   Columns: {list(df.columns)}')
-    print(f'   Missing values: {df.isna().sum().sum()}')
+    print(f'   Total rows: {total:,}')
+    print(f'   Columns: {columns}')
+    print(f'   Missing values: {missing}')
     
     # Distribusi sentiment
     print(f'\n2. DISTRIBUSI SENTIMENT:')
-    sent_dist = df['sentiment'].value_counts()
-    total = len(df)
+    sent_dist = sent_dist.sort_values(ascending=False, kind='stable')
     for sent, count in sent_dist.items():
         pct = (count/total)*100
         bar = '█' * int(pct/2)
@@ -38,19 +99,11 @@ def analyze_clean_data(filepath, class_type):
     
     # Analisis content_clean
     print(f'\n3. STATISTIK CONTENT_CLEAN:')
-    df['content_length'] = df['content_clean'].astype(str).str.len()
-    df['word_count'] = df['content_clean'].astype(str).str.split().str.len()
-    
-    print(f'   Karakter - Min: {df["content_length"].min()}, Max: {df["content_length"].max()}, Mean: {df["content_length"].mean():.1f}')
-    print(f'   Kata - Min: {df["word_count"].min()}, Max: {df["word_count"].max()}, Mean: {df["word_count"].mean():.1f}')
+    print(f'   Karakter - Min: {length_min}, Max: {length_max}, Mean: {length_sum / total:.1f}')
+    print(f'   Kata - Min: {words_min}, Max: {words_max}, Mean: {words_sum / total:.1f}')
     
     # Distribution of lengths
     print(f'\n4. DISTRIBUSI PANJANG REVIEW:')
-    short = len(df[df['content_length'] < 20])
-    medium = len(df[(df['content_length'] >= 20) & (df['content_length'] < 50)])
-    good = len(df[(df['content_length'] >= 50) & (df['content_length'] < 100)])
-    long_text = len(df[df['content_length'] >= 100])
-    
     print(f'   < 20 karakter:    {short:>6,} ({short/total*100:>5.1f}%)')
     print(f'   20-50 karakter:   {medium:>6,} ({medium/total*100:>5.1f}%)')
     print(f'   50-100 karakter:  {good:>6,} ({good/total*100:>5.1f}%)')
@@ -58,37 +111,22 @@ def analyze_clean_data(filepath, class_type):
     
     # Check for problematic content
     print(f'\n5. CEK KONTEN:')
-    
-    # Duplicates
-    dup = df.duplicated(subset=['content_clean']).sum()
     print(f'   Duplikat content_clean: {dup:,} ({dup/total*100:.1f}%)')
-    
-    # Empty or very short
-    empty = df[df['content_clean'].str.strip() == ''].shape[0]
     print(f'   Empty content: {empty:,}')
-    
-    # Check if still has emoji
-    emoji_pattern = r'[\U0001F600-\U0001F64F\U0001F300-\U0001F5FF\U0001F680-\U0001F6FF\U0001F1E0-\U0001F1FF]'
-    has_emoji = df['content_clean'].str.contains(emoji_pattern, regex=True, na=False).sum()
     print(f'   Masih ada emoji: {has_emoji:,}')
-    
-    # Check if still has URL
-    url_pattern = r'http[s]?://\S+'
-    has_url = df['content_clean'].str.contains(url_pattern, regex=True, na=False).sum()
     print(f'   Masih ada URL: {has_url:,}')
     
-    # Sample per sentiment
+    # Sample per sentiment (reservoir 2 baris per kelas)
     print(f'\n6. SAMPLE CONTENT_CLEAN PER SENTIMENT:')
-    for sent in df['sentiment'].unique():
-        sample = df[df['sentiment'] == sent].sample(2, random_state=42)['content_clean'].values
+    for sent, reservoir in samples.items():
         print(f'\n   [{sent}]:')
-        for text in sample:
+        for text in reservoir.sample()['content_clean'].values:
             text_preview = str(text)[:80] + '...' if len(str(text)) > 80 else str(text)
             print(f'      "{text_preview}"')
     
     # Check rating vs sentiment mapping
     print(f'\n7. CEK MAPPING RATING → SENTIMENT:')
-    rating_sent = df.groupby(['rating', 'sentiment']).size().reset_index(name='count')
+    rating_sent = rating_sent.sort_index().reset_index(name='count')
     print(rating_sent.to_string(index=False))
     
     # Final verdict
@@ -7,13 +7,22 @@ import pandas as pd
 import numpy as np
 import re
 import os
-import random
+
+from augmentation import Augmenter
+from balancing import class_positions
+from cleaning_utils import map_unique
+from near_dedup import drop_near_duplicates
+from preprocessing import get_profile
 
 # ============================================
 # CONFIGURATION
 # ============================================
 OUTPUT_DIR = 'data'
 TARGET_PER_CLASS = 5000
+NEAR_DEDUP_THRESHOLD = 0.8  # Jaccard himpunan kata (per sentiment); None = hanya dedup exact
+AUGMENT_SEED = 42           # Seed engine augmentasi (hasil identik antar run)
+AUGMENT_WORKERS = 1         # Proses worker augmentasi (hasil sama untuk berapa pun worker)
+AUGMENT_ATTEMPTS_PER_ROW = 10  # Batas percobaan = kekurangan * nilai ini (pasti berhenti)
 
 # ============================================
 # TEXT AUGMENTATION FUNCTIONS
@@ -44,114 +53,14 @@ INDONESIAN_SYNONYMS = {
     'kecewa': ['sedih', 'disappointed'],
 }
 
-def synonym_replacement(text, n=1):
-    """Ganti n kata dengan sinonimnya"""
-    words = text.split()
-    new_words = words.copy()
-    
-    replaceable = [w for w in words if w.lower() in INDONESIAN_SYNONYMS]
-    
-    if not replaceable:
-        return text
-    
-    n = min(n, len(replaceable))
-    words_to_replace = random.sample(replaceable, n)
-    
-    for word in words_to_replace:
-        synonyms = INDONESIAN_SYNONYMS.get(word.lower(), [])
-        if synonyms:
-            idx = words.index(word)
-            new_words[idx] = random.choice(synonyms)
-    
-    return ' '.join(new_words)
-
-def random_swap(text, n=1):
-    """Swap n pasang kata random"""
-    words = text.split()
-    if len(words) < 2:
-        return text
-    
-    new_words = words.copy()
-    for _ in range(n):
-        if len(new_words) >= 2:
-            idx1, idx2 = random.sample(range(len(new_words)), 2)
-            new_words[idx1], new_words[idx2] = new_words[idx2], new_words[idx1]
-    
-    return ' '.join(new_words)
-
-def random_deletion(text, p=0.1):
-    """Hapus kata dengan probabilitas p"""
-    words = text.split()
-    if len(words) <= 3:
-        return text
-    
-    new_words = [w for w in words if random.random() > p]
-    
-    if len(new_words) == 0:
-        return random.choice(words)
-    
-    return ' '.join(new_words)
-
-def random_insertion(text, n=1):
-    """Insert n kata random dari sinonim"""
-    words = text.split()
-    new_words = words.copy()
-    
-    all_synonyms = [s for syns in INDONESIAN_SYNONYMS.values() for s in syns]
-    
-    for _ in range(n):
-        insert_word = random.choice(all_synonyms)
-        insert_pos = random.randint(0, len(new_words))
-        new_words.insert(insert_pos, insert_word)
-    
-    return ' '.join(new_words)
-
-def augment_text(text, num_aug=4):
-    """Generate multiple augmented versions of text"""
-    augmented = []
-    
-    # Original
-    augmented.append(text)
-    
-    # Synonym replacement
-    for _ in range(num_aug):
-        aug = synonym_replacement(text, n=random.randint(1, 2))
-        if aug != text:
-            augmented.append(aug)
-    
-    # Random swap
-    for _ in range(num_aug // 2):
-        aug = random_swap(text, n=1)
-        if aug != text:
-            augmented.append(aug)
-    
-    # Random deletion
-    for _ in range(num_aug // 2):
-        aug = random_deletion(text, p=0.1)
-        if aug != text:
-            augmented.append(aug)
-    
-    return list(set(augmented))  # Remove duplicates
-
 # ============================================
 # CLEANING FUNCTIONS
 # ============================================
+CLEAN_PROFILE = get_profile('lowercase-basic')
+
 def clean_text(text):
-    """Bersihkan text review"""
-    if pd.isna(text) or not isinstance(text, str):
-        return ""
-    
-    text = str(text)
-    text = text.lower()
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-    text = re.sub(r'\S+@\S+', '', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'#\w+', '', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'[^\w\s]', ' ', text)
-    text = ' '.join(text.split())
-    
-    return text.strip()
+    """Bersihkan text review (profile 'lowercase-basic')"""
+    return CLEAN_PROFILE.clean(text)
 
 def is_valid_review(text, min_words=3, max_words=500):
     """Cek apakah review valid"""
@@ -200,7 +109,7 @@ def main():
         df3 = pd.read_csv('data/gojek_reviews_balanced_9997.csv')
         # Clean this data
         if 'content_clean' not in df3.columns:
-            df3['content_clean'] = df3['content'].apply(clean_text)
+            df3['content_clean'] = map_unique(df3['content'], clean_text)
         print(f"   ✓ gojek_reviews_balanced_9997.csv: {len(df3)} rows")
         all_data.append(df3)
     
@@ -215,14 +124,14 @@ def main():
     
     # Ensure content_clean exists
     if 'content_clean' not in df.columns:
-        df['content_clean'] = df['content'].apply(clean_text)
+        df['content_clean'] = map_unique(df['content'], clean_text)
     else:
         # Fill missing content_clean
         mask = df['content_clean'].isna() | (df['content_clean'] == '')
-        df.loc[mask, 'content_clean'] = df.loc[mask, 'content'].apply(clean_text)
+        df.loc[mask, 'content_clean'] = map_unique(df.loc[mask, 'content'], clean_text)
     
     # Filter valid reviews
-    df = df[df['content_clean'].apply(is_valid_review)]
+    df = df[map_unique(df['content_clean'], is_valid_review).astype(bool)]
     print(f"   After filtering: {len(df)}")
     
     # Remove duplicates based on content_clean
@@ -243,6 +152,16 @@ def main():
     # Filter only 3 classes
     df = df[df['sentiment'].isin(['negative', 'neutral', 'positive'])]
     
+    # Remove near-duplicates (review sama dari beberapa sumber dengan beda kecil);
+    # himpunan kata mengabaikan urutan, jadi hanya di antara review dengan sentiment sama
+    if NEAR_DEDUP_THRESHOLD:
+        df = drop_near_duplicates(df, 'content_clean', threshold=NEAR_DEDUP_THRESHOLD, by='sentiment')
+        print(f"   After near-dedup: {len(df)}")
+    
+    # Satu grup per review asli; hasil augmentasi mewarisi grup sumbernya
+    # (prepare_data_for_training membagi train/val/test per source_group: near-copy tidak bocor)
+    df = df.assign(source_group=np.arange(len(df)))
+    
     print(f"\n📊 Distribution before augmentation:")
     print(df['sentiment'].value_counts())
     
@@ -256,9 +175,12 @@ def main():
     target = min(TARGET_PER_CLASS, max_count)
     
     augmented_dfs = []
+    groups = class_positions(df['sentiment'])  # Posisi baris per kelas (satu pass)
+    augmenter = Augmenter(INDONESIAN_SYNONYMS, is_valid=is_valid_review, seed=AUGMENT_SEED)
+    seen = set(df['content_clean'])
     
     for sentiment in ['negative', 'neutral', 'positive']:
-        df_class = df[df['sentiment'] == sentiment].copy()
+        df_class = df.take(groups.get(sentiment, np.empty(0, dtype=np.int64)))
         current_count = len(df_class)
         
         print(f"\n   {sentiment.upper()}: {current_count} samples")
@@ -275,35 +197,27 @@ def main():
             needed = target - current_count
             print(f"      → Need {needed} more samples via augmentation")
             
-            # Augment
-            augmented_texts = []
-            original_rows = df_class.to_dict('records')
-            
-            while len(augmented_texts) < needed:
-                row = random.choice(original_rows)
-                text = row['content_clean']
-                
-                # Generate augmented versions
-                aug_versions = augment_text(text, num_aug=4)
-                
-                for aug_text in aug_versions[1:]:  # Skip original
-                    if len(augmented_texts) >= needed:
-                        break
-                    if is_valid_review(aug_text):
-                        new_row = {
-                            'userName': row.get('userName', 'augmented'),
-                            'content': aug_text,
-                            'content_clean': aug_text,
-                            'score': row.get('score', 3),
-                            'at': row.get('at', ''),
-                            'sentiment': sentiment
-                        }
-                        augmented_texts.append(new_row)
+            # Augment (engine ber-seed, dedup terhadap korpus asli & hasil sebelumnya)
+            sources, texts = augmenter.generate(df_class['content_clean'], needed, seen=seen,
+                                                max_attempts=needed * AUGMENT_ATTEMPTS_PER_ROW,
+                                                workers=AUGMENT_WORKERS)
+            seen.update(texts)
             
-            if augmented_texts:
-                df_aug = pd.DataFrame(augmented_texts)
+            if texts:
+                src = df_class.iloc[sources]
+                df_aug = pd.DataFrame({
+                    'userName': src['userName'].to_numpy() if 'userName' in src else 'augmented',
+                    'content': texts,
+                    'content_clean': texts,
+                    'score': src['score'].to_numpy() if 'score' in src else 3,
+                    'at': src['at'].to_numpy() if 'at' in src else '',
+                    'sentiment': sentiment,
+                    'source_group': src['source_group'].to_numpy(),
+                })
                 augmented_dfs.append(df_aug)
-                print(f"      → Added {len(augmented_texts)} augmented samples")
+                print(f"      → Added {len(texts)} augmented samples")
+            if len(texts) < needed:
+                print(f"      ⚠️ Batas percobaan tercapai: kurang {needed - len(texts)} sampel")
     
     # Combine all
     df_final = pd.concat(augmented_dfs, ignore_index=True)
@@ -312,7 +226,7 @@ def main():
     df_final = df_final.sample(frac=1, random_state=42).reset_index(drop=True)
     
     # Keep needed columns
-    columns_to_keep = ['userName', 'content', 'content_clean', 'score', 'at', 'sentiment']
+    columns_to_keep = ['userName', 'content', 'content_clean', 'score', 'at', 'sentiment', 'source_group']
     df_final = df_final[[c for c in columns_to_keep if c in df_final.columns]]
     
     print(f"\n📊 Final distribution:")
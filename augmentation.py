@@ -0,0 +1,192 @@
+"""
+Engine augmentasi teks (EDA: sinonim, swap, hapus, sisip) yang reprodusibel
+
+Dibanding versi lama di augment_data.py:
+- indeks sinonim dihitung sekali (SynonymIndex), termasuk daftar semua
+  sinonim untuk random_insertion; penggantian memakai posisi kata (tanpa
+  words.index yang linear dan selalu mengganti kemunculan pertama)
+- setiap percobaan memakai RNG sendiri, di-seed dengan integer
+  (seed, putaran, posisi) yang dipak bit (tanpa hash string, tidak
+  bergantung PYTHONHASHSEED). Hasil identik bit-per-bit antar run dan
+  berapa pun jumlah worker
+- varian unik dengan urutan tetap (dict.fromkeys, bukan list(set(...)))
+- jumlah percobaan dibatasi (max_attempts), jadi pasti berhenti walau
+  augmentasi terus gagal validasi
+- dedup langsung terhadap korpus asli + hasil augmentasi sebelumnya
+
+Percobaan ke-j memakai baris sumber order[j % n] (order = permutasi baris
+ber-seed), putaran j // n; semua baris sumber terpakai merata sebelum ada
+yang diulang.
+
+Contoh:
+    augmenter = Augmenter(INDONESIAN_SYNONYMS, is_valid=is_valid_review, seed=42)
+    sources, texts = augmenter.generate(df_class['content_clean'], needed=2000,
+                                        seen=df['content_clean'])
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import random
+
+import numpy as np
+
+NUM_AUG = 4              # Varian sinonim per percobaan (swap & hapus: NUM_AUG // 2)
+ATTEMPTS_PER_ROW = 10    # Default batas percobaan = needed * ATTEMPTS_PER_ROW
+CHUNK_ATTEMPTS = 20000   # Percobaan per task worker
+
+# =====================================================
+# INDEKS SINONIM
+# =====================================================
+class SynonymIndex:
+    """Kata (lowercase) -> tuple sinonim, plus semua sinonim untuk penyisipan"""
+
+    def __init__(self, synonyms):
+        self.synonyms = {word.lower(): tuple(options) for word, options in synonyms.items() if options}
+        self.all_synonyms = tuple(s for options in synonyms.values() for s in options)
+
+    def replaceable(self, words):
+        """Posisi kata yang punya sinonim"""
+        synonyms = self.synonyms
+        return [i for i, word in enumerate(words) if word.lower() in synonyms]
+
+# =====================================================
+# OPERASI (words -> words, rng = random.Random)
+# =====================================================
+def synonym_replacement(words, index, rng, n=1):
+    """Ganti n kata (posisi berbeda) dengan sinonimnya"""
+    positions = index.replaceable(words)
+    if not positions:
+        return words
+    new_words = list(words)
+    for i in rng.sample(positions, min(n, len(positions))):
+        new_words[i] = rng.choice(index.synonyms[words[i].lower()])
+    return new_words
+
+def random_swap(words, rng, n=1):
+    """Swap n pasang kata random"""
+    if len(words) < 2:
+        return words
+    new_words = list(words)
+    for _ in range(n):
+        idx1, idx2 = rng.sample(range(len(new_words)), 2)
+        new_words[idx1], new_words[idx2] = new_words[idx2], new_words[idx1]
+    return new_words
+
+def random_deletion(words, rng, p=0.1):
+    """Hapus kata dengan probabilitas p (teks <= 3 kata tidak diubah)"""
+    if len(words) <= 3:
+        return words
+    new_words = [w for w in words if rng.random() > p]
+    return new_words or [rng.choice(words)]
+
+def random_insertion(words, index, rng, n=1):
+    """Sisipkan n sinonim random di posisi random"""
+    new_words = list(words)
+    for _ in range(n):
+        new_words.insert(rng.randint(0, len(new_words)), rng.choice(index.all_synonyms))
+    return new_words
+
+# =====================================================
+# ENGINE
+# =====================================================
+class Augmenter:
+    """
+    Generator varian teks ber-seed. is_valid(text) -> bool (opsional,
+    fungsi level modul agar bisa dipakai worker process).
+    """
+
+    def __init__(self, synonyms, is_valid=None, seed=42, num_aug=NUM_AUG, insertions=0):
+        self.index = synonyms if isinstance(synonyms, SynonymIndex) else SynonymIndex(synonyms)
+        self.is_valid = is_valid
+        self.seed = seed
+        self.num_aug = num_aug
+        self.insertions = insertions
+        self._rng = random.Random()
+
+    def attempt_seed(self, position, round_):
+        """Seed integer unik per (seed, putaran, posisi): masing-masing 32 bit, tanpa hash"""
+        return (((self.seed & 0xFFFFFFFF) << 32 | round_) << 32) | position
+
+    def rng(self, position, round_):
+        """RNG untuk satu percobaan: bergantung hanya pada seed, posisi baris & putaran"""
+        return random.Random(self.attempt_seed(position, round_))
+
+    def variants(self, text, rng):
+        """Varian unik (tanpa teks asli), urutan tetap untuk rng yang sama"""
+        words = text.split()
+        index = self.index
+        out = []
+        for _ in range(self.num_aug):
+            out.append(synonym_replacement(words, index, rng, n=rng.randint(1, 2)))
+        for _ in range(self.num_aug // 2):
+            out.append(random_swap(words, rng, n=1))
+        for _ in range(self.num_aug // 2):
+            out.append(random_deletion(words, rng, p=0.1))
+        for _ in range(self.insertions):
+            out.append(random_insertion(words, index, rng, n=1))
+        return [v for v in dict.fromkeys(' '.join(w) for w in out) if v != text]
+
+    def attempt(self, texts, order, j):
+        """Percobaan ke-j: (posisi sumber, varian valid)"""
+        position = int(order[j % len(order)])
+        # Satu objek RNG di-seed ulang per percobaan (stream sama dengan self.rng(...))
+        rng = self._rng
+        rng.seed(self.attempt_seed(position, j // len(order)))
+        candidates = self.variants(texts[position], rng)
+        if self.is_valid is not None:
+            candidates = [c for c in candidates if self.is_valid(c)]
+        return position, candidates
+
+    def generate(self, texts, needed, seen=(), max_attempts=None, workers=1,
+                 chunk_attempts=CHUNK_ATTEMPTS):
+        """
+        (posisi sumber, teks) untuk `needed` varian baru: valid, tidak ada di
+        `seen` (korpus asli) dan tidak duplikat satu sama lain. Berhenti
+        setelah max_attempts percobaan (default needed * ATTEMPTS_PER_ROW),
+        jadi hasil bisa kurang dari needed. workers > 1: percobaan dibagi per
+        chunk ke process pool; hasil identik dengan workers=1.
+        """
+        texts = [str(t) for t in texts]
+        if needed <= 0 or not texts:
+            return [], []
+        if max_attempts is None:
+            max_attempts = needed * ATTEMPTS_PER_ROW
+        order = np.random.RandomState(self.seed).permutation(len(texts))
+        seen = set(seen)
+        sources, out = [], []
+
+        def accept(results):
+            for position, candidates in results:
+                for candidate in candidates:
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        sources.append(position)
+                        out.append(candidate)
+                        if len(out) >= needed:
+                            return True
+            return False
+
+        bounds = [(start, min(start + chunk_attempts, max_attempts))
+                  for start in range(0, max_attempts, chunk_attempts)]
+        if workers > 1 and len(bounds) > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self, texts, order)) as pool:
+                # Satu gelombang = `workers` chunk berurutan; digabung sesuai urutan percobaan
+                for wave in range(0, len(bounds), workers):
+                    for results in pool.map(_run_chunk, bounds[wave:wave + workers]):
+                        if accept(results):
+                            return sources, out
+        else:
+            for start, stop in bounds:
+                if accept(self.attempt(texts, order, j) for j in range(start, stop)):
+                    break
+        return sources, out
+
+# State worker process (diisi sekali per worker oleh initializer)
+_WORKER = {}
+
+def _init_worker(augmenter, texts, order):
+    _WORKER.update(augmenter=augmenter, texts=texts, order=order)
+
+def _run_chunk(bounds):
+    augmenter, texts, order = _WORKER['augmenter'], _WORKER['texts'], _WORKER['order']
+    return [augmenter.attempt(texts, order, j) for j in range(*bounds)]
@@ -0,0 +1,226 @@
+"""
+Balancing kelas berbasis posisi baris (undersample / oversample / cap)
+
+Pola lama di setiap script:
+    df_balanced = pd.DataFrame()
+    for sentiment in classes:
+        df_class = df[df['sentiment'] == sentiment]          # scan penuh per kelas
+        df_balanced = pd.concat([df_balanced, df_class.sample(n, random_state=42)])
+    df_balanced = df_balanced.sample(frac=1, random_state=42)
+
+memindai seluruh frame sekali per kelas dan menyalin ulang hasil sementara
+di setiap concat. Di sini label dikelompokkan sekali (factorize + argsort
+stabil -> posisi baris per kelas), sampling dilakukan pada array posisi,
+dan baris dimaterialisasi sekali dengan `take`.
+
+Hasil identik dengan pola lama untuk seed yang sama:
+- df.sample(n, random_state=s) dan sklearn resample(replace=False,
+  n_samples=n, random_state=s) sama-sama mengambil
+  RandomState(s).permutation(len)[:n]
+- shuffle akhir df.sample(frac=1, random_state=s) = RandomState(s).permutation
+- oversample (replace) mengikuti RandomOverSampler: semua baris asli +
+  RandomState(s).randint(0, len, kekurangan)
+
+Mode hash (balance_by_hash): per kelas diambil k baris dengan hash key
+(mis. review_id) terkecil -- bottom-k. Pilihan tidak bergantung pada urutan
+atau jumlah baris lain, jadi saat data baru masuk hanya baris marjinal yang
+masuk/keluar (baris baru dengan hash di bawah ambang kelas menggantikan
+baris dengan hash terbesar); cache hilir (teks bersih, tokenisasi, split)
+tetap valid untuk baris sisanya. Urutan hasil = urutan hash (acak tetapi
+stabil).
+
+Contoh:
+    df_balanced = balance(df, 'sentiment', classes=['negative', 'neutral', 'positive'])
+    df_balanced = balance(df, ['app_name', 'rating'], target='max', oversample=True, cap=5000)
+    df_balanced = balance_by_hash(df, 'sentiment', key='review_id', target=5000)
+    df['split'] = group_split(df['sentiment'], df['source_group'])
+"""
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 42
+
+# =====================================================
+# POSISI PER KELAS
+# =====================================================
+def class_positions(labels):
+    """
+    {kelas: posisi baris (naik)} dalam satu pass, urut kemunculan pertama.
+    `labels` = Series (satu kolom) atau DataFrame (kombinasi kolom, kelas =
+    tuple). Label NaN tidak masuk kelas mana pun (seperti df[df[col] == x]).
+    """
+    if isinstance(labels, pd.DataFrame):
+        # Kode gabungan per kolom (di-factorize ulang tiap kolom agar tetap kecil)
+        combined = np.zeros(len(labels), dtype=np.int64)
+        missing = np.zeros(len(labels), dtype=bool)
+        for column in labels.columns:
+            col_codes, col_uniques = pd.factorize(labels[column], use_na_sentinel=True)
+            missing |= col_codes < 0
+            combined, _ = pd.factorize(combined * (len(col_uniques) + 1) + col_codes)
+        valid = np.flatnonzero(~missing)
+        codes = np.full(len(labels), -1, dtype=np.int64)
+        codes[valid], _ = pd.factorize(combined[valid])
+        _, first = np.unique(codes[valid], return_index=True)
+        keys = list(labels.iloc[valid[first]].itertuples(index=False, name=None))
+    else:
+        codes, keys = pd.factorize(pd.Series(labels), use_na_sentinel=True)
+        keys = list(keys)
+
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(keys)))])
+    order = order[np.count_nonzero(codes < 0):]
+    return {key: order[bounds[i]:bounds[i + 1]] for i, key in enumerate(keys)}
+
+def class_targets(counts, target='min', cap=None):
+    """
+    {kelas: jumlah baris target} dari {kelas: jumlah tersedia}.
+    target: 'min' / 'max' (dari kelas yang ada), int, atau dict per kelas;
+    cap: batas atas per kelas (mis. target='min', cap=3000).
+    """
+    available = [count for count in counts.values() if count > 0]
+    if isinstance(target, dict):
+        targets = {cls: int(target.get(cls, 0)) for cls in counts}
+    else:
+        if target == 'min':
+            value = min(available, default=0)
+        elif target == 'max':
+            value = max(available, default=0)
+        else:
+            value = int(target)
+        targets = {cls: value for cls in counts}
+    if cap is not None:
+        targets = {cls: min(value, int(cap)) for cls, value in targets.items()}
+    return targets
+
+# =====================================================
+# BALANCING
+# =====================================================
+def sample_positions(positions, n, oversample=False, seed=DEFAULT_SEED, sample_at_target=True):
+    """
+    Ambil n posisi dari satu kelas (hasil sama dengan df_class.sample(n, random_state=seed)):
+    - len > n: undersample tanpa pengembalian
+    - len == n: tetap di-sample (urutan diacak); sample_at_target=False = apa adanya
+    - len < n: semua posisi; oversample=True menambah len - n posisi acak
+      dengan pengembalian
+    """
+    size = len(positions)
+    if size > n or (size == n and sample_at_target):
+        return positions[np.random.RandomState(seed).permutation(size)[:n]]
+    if size < n and oversample and size > 0:
+        extra = positions[np.random.RandomState(seed).randint(0, size, n - size)]
+        return np.concatenate([positions, extra])
+    return positions
+
+def balanced_positions(labels, classes=None, target='min', cap=None, oversample=False,
+                       seed=DEFAULT_SEED, shuffle=True, sample_at_target=True):
+    """
+    Posisi baris hasil balancing (untuk df.take). `classes` = urutan kelas
+    yang diambil (default: urut kemunculan; kelas lain diabaikan). Setiap
+    kelas di-sample dengan RandomState(seed) sendiri, lalu gabungan
+    di-shuffle dengan RandomState(seed) jika shuffle=True.
+    """
+    groups = class_positions(labels)
+    if classes is None:
+        classes = list(groups)
+    empty = np.empty(0, dtype=np.int64)
+    groups = {cls: groups.get(cls, empty) for cls in classes}
+    targets = class_targets({cls: len(pos) for cls, pos in groups.items()}, target, cap)
+
+    picked = [sample_positions(groups[cls], targets[cls], oversample, seed, sample_at_target)
+              for cls in classes]
+    positions = np.concatenate(picked) if picked else empty
+    if shuffle:
+        positions = positions[np.random.RandomState(seed).permutation(len(positions))]
+    return positions
+
+def balance(df, by, classes=None, target='min', cap=None, oversample=False,
+            seed=DEFAULT_SEED, shuffle=True, sample_at_target=True):
+    """
+    DataFrame seimbang per kelas kolom `by` (nama kolom atau list kolom),
+    dimaterialisasi sekali dengan take; index di-reset. Parameter lain
+    sama dengan balanced_positions.
+    """
+    labels = df[by] if isinstance(by, str) else df[list(by)]
+    positions = balanced_positions(labels, classes, target, cap, oversample, seed, shuffle,
+                                   sample_at_target)
+    return df.take(positions).reset_index(drop=True)
+
+# =====================================================
+# MODE HASH (STABIL SAAT DATA BERTAMBAH)
+# =====================================================
+def stable_hash(keys, salt=''):
+    """
+    Hash uint64 deterministik per key (dibandingkan sebagai str), sama di
+    setiap run, proses, dan mesin. `salt` berbeda = urutan acak lain.
+    """
+    values = pd.Series(keys, dtype=object).astype(str)
+    if salt:
+        values = salt + '\x00' + values
+    return pd.util.hash_array(values.to_numpy(dtype=object), categorize=False)
+
+def bottom_k_positions(labels, keys, classes=None, target='min', cap=None, salt=''):
+    """
+    Posisi baris hasil balancing mode hash: per kelas min(target, jumlah)
+    baris dengan stable_hash(keys) terkecil, diurutkan menurut hash.
+    Parameter kelas/target/cap sama dengan balanced_positions (tanpa
+    oversample: bottom-k tidak mengulang baris).
+    """
+    hashes = stable_hash(keys, salt)
+    groups = class_positions(labels)
+    if classes is None:
+        classes = list(groups)
+    empty = np.empty(0, dtype=np.int64)
+    groups = {cls: groups.get(cls, empty) for cls in classes}
+    targets = class_targets({cls: len(pos) for cls, pos in groups.items()}, target, cap)
+
+    picked = []
+    for cls in classes:
+        positions, k = groups[cls], targets[cls]
+        if k <= 0:
+            continue
+        if k < len(positions):
+            positions = positions[np.argpartition(hashes[positions], k - 1)[:k]]
+        picked.append(positions)
+    positions = np.concatenate(picked) if picked else empty
+    return positions[np.argsort(hashes[positions], kind='stable')]
+
+def balance_by_hash(df, by, key, classes=None, target='min', cap=None, salt=''):
+    """balance() mode hash: bottom-k per kelas berdasarkan hash kolom `key` (mis. review_id)"""
+    labels = df[by] if isinstance(by, str) else df[list(by)]
+    positions = bottom_k_positions(labels, df[key], classes, target, cap, salt)
+    return df.take(positions).reset_index(drop=True)
+
+def membership_delta(previous, current):
+    """(masuk, keluar): key yang baru ada di `current` / hilang dari `previous` (urutan dipertahankan)"""
+    previous = pd.Index(previous)
+    current = pd.Index(current)
+    return list(current[~current.isin(previous)]), list(previous[~previous.isin(current)])
+
+# =====================================================
+# SPLIT PER GRUP (TRAIN / VAL / TEST)
+# =====================================================
+def group_split(labels, groups, fractions=(('train', 0.7), ('val', 0.15), ('test', 0.15)),
+                seed=DEFAULT_SEED):
+    """
+    Nama split per baris; semua baris satu grup (mis. review asli + hasil
+    augmentasinya) masuk split yang sama, jadi near-copy tidak bocor antar
+    split. Per kelas (stratified) grup diacak dengan RandomState(seed) lalu
+    dibagi menurut jumlah baris kumulatif sesuai `fractions`. Grup yang
+    berisi beberapa kelas ikut kelas baris pertamanya; label NaN = split pertama.
+    """
+    names = np.array([name for name, _ in fractions], dtype=object)
+    bounds = np.cumsum([fraction for _, fraction in fractions], dtype=np.float64)
+    bounds /= bounds[-1]
+    group_codes, _ = pd.factorize(pd.Series(groups), use_na_sentinel=False)
+    first = pd.Series(np.arange(len(group_codes))).groupby(group_codes).first().to_numpy()
+    sizes = np.bincount(group_codes)
+    group_split_codes = np.zeros(len(sizes), dtype=np.int64)
+
+    group_labels = pd.Series(labels).iloc[first].reset_index(drop=True)
+    for positions in class_positions(group_labels).values():
+        order = positions[np.random.RandomState(seed).permutation(len(positions))]
+        start = np.cumsum(sizes[order]) - sizes[order]
+        total = sizes[order].sum()
+        group_split_codes[order] = np.searchsorted(bounds, start / total, side='right')
+    return names[np.minimum(group_split_codes[group_codes], len(names) - 1)]
@@ -0,0 +1,148 @@
+"""
+Benchmark & cek engine augmentasi (augmentation.py) vs loop lama augment_data
+
+Cek:
+- reprodusibel: dua run dengan seed sama identik; workers 1 vs N identik
+- dedup: tidak ada hasil yang sama dengan korpus asli atau duplikat
+- valid: semua hasil lolos is_valid_review
+- pasti berhenti: is_valid yang selalu False berhenti setelah max_attempts
+Waktu: loop lama (random.choice + augment_text + list(set(...))) vs
+Augmenter.generate untuk NEEDED baris, lalu throughput BIG_NEEDED baris.
+
+Jalankan: python benchmark_augmentation.py
+"""
+
+import os
+import random
+import time
+
+import pandas as pd
+
+from augment_data import INDONESIAN_SYNONYMS, clean_text, is_valid_review
+from augmentation import Augmenter
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+INPUT_FILES = [
+    'data/gojek_reviews_3class_raw_balanced.csv',
+    'data/gojek_reviews_5class_raw_balanced.csv',
+]
+SOURCE_ROWS = 5000      # Baris sumber (kelas minoritas)
+NEEDED = 20000          # Baris augmentasi untuk perbandingan dengan loop lama
+BIG_NEEDED = 300000     # Baris augmentasi untuk throughput
+WORKERS = min(4, os.cpu_count() or 1)  # Worker untuk throughput paralel
+CHECK_WORKERS = max(2, WORKERS)          # Worker untuk cek kesamaan (selalu lewat process pool)
+
+# =====================================================
+# LOOP LAMA (referensi waktu)
+# =====================================================
+def legacy_synonym_replacement(text, n=1):
+    words = text.split()
+    new_words = words.copy()
+    replaceable = [w for w in words if w.lower() in INDONESIAN_SYNONYMS]
+    if not replaceable:
+        return text
+    for word in random.sample(replaceable, min(n, len(replaceable))):
+        synonyms = INDONESIAN_SYNONYMS.get(word.lower(), [])
+        if synonyms:
+            new_words[words.index(word)] = random.choice(synonyms)
+    return ' '.join(new_words)
+
+def legacy_random_swap(text, n=1):
+    words = text.split()
+    if len(words) < 2:
+        return text
+    new_words = words.copy()
+    for _ in range(n):
+        idx1, idx2 = random.sample(range(len(new_words)), 2)
+        new_words[idx1], new_words[idx2] = new_words[idx2], new_words[idx1]
+    return ' '.join(new_words)
+
+def legacy_random_deletion(text, p=0.1):
+    words = text.split()
+    if len(words) <= 3:
+        return text
+    new_words = [w for w in words if random.random() > p]
+    return ' '.join(new_words) if new_words else random.choice(words)
+
+def legacy_augment_text(text, num_aug=4):
+    augmented = [text]
+    augmented += [legacy_synonym_replacement(text, n=random.randint(1, 2)) for _ in range(num_aug)]
+    augmented += [legacy_random_swap(text) for _ in range(num_aug // 2)]
+    augmented += [legacy_random_deletion(text) for _ in range(num_aug // 2)]
+    return list(set(augmented))
+
+def legacy_generate(texts, needed, max_iterations):
+    """Loop lama augment_data.main (dengan batas iterasi agar benchmark pasti berhenti)"""
+    random.seed(42)
+    out = []
+    for _ in range(max_iterations):
+        if len(out) >= needed:
+            break
+        text = random.choice(texts)
+        for aug in legacy_augment_text(text)[1:]:
+            if len(out) >= needed:
+                break
+            if is_valid_review(aug):
+                out.append(aug)
+    return out
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def never_valid(text):
+    return False
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK AUGMENTASI')
+    print('=' * 60)
+
+    corpus = pd.concat([pd.read_csv(path)['content'] for path in INPUT_FILES], ignore_index=True)
+    corpus = corpus.map(clean_text)
+    corpus = corpus[corpus.map(is_valid_review)].drop_duplicates().reset_index(drop=True)
+    texts = corpus.iloc[:SOURCE_ROWS].tolist()
+    print(f'Korpus: {len(corpus):,} teks valid, sumber: {len(texts):,} teks')
+
+    augmenter = Augmenter(INDONESIAN_SYNONYMS, is_valid=is_valid_review, seed=42)
+
+    # Reprodusibel & paralel
+    first = augmenter.generate(texts, NEEDED, seen=corpus)
+    again = augmenter.generate(texts, NEEDED, seen=corpus)
+    assert first == again, 'Hasil berbeda untuk seed yang sama!'
+    parallel = augmenter.generate(texts, NEEDED, seen=corpus, workers=CHECK_WORKERS, chunk_attempts=2000)
+    assert first == parallel, f'Hasil {CHECK_WORKERS} worker berbeda dari 1 worker!'
+    sources, out = first
+    assert len(out) == len(set(out)) and not set(out) & set(corpus), 'Ada duplikat / sama dengan korpus!'
+    assert all(is_valid_review(t) for t in out), 'Ada hasil yang tidak valid!'
+    assert all(0 <= s < len(texts) for s in sources)
+    print(f'✅ Reprodusibel (1 vs {CHECK_WORKERS} worker identik), tanpa duplikat, semua valid')
+
+    # Pasti berhenti
+    stuck = Augmenter(INDONESIAN_SYNONYMS, is_valid=never_valid, seed=42)
+    t_stuck, (_, none) = timed(stuck.generate, texts, NEEDED, max_attempts=5000)
+    assert none == [], 'is_valid selalu False harus menghasilkan 0 baris'
+    print(f'✅ Validasi selalu gagal: berhenti setelah 5,000 percobaan ({t_stuck:.2f}s)')
+
+    # Waktu vs loop lama
+    t_old, old = timed(legacy_generate, texts, NEEDED, NEEDED * 10)
+    t_new, new = timed(augmenter.generate, texts, NEEDED, seen=corpus)
+    print(f'\n{"Versi":<26}{"baris":>10}{"waktu":>10}{"baris/menit":>14}')
+    print('-' * 60)
+    print(f'{"loop lama":<26}{len(old):>10,}{t_old:>9.2f}s{len(old) / t_old * 60:>14,.0f}')
+    print(f'{"Augmenter (1 worker)":<26}{len(new[1]):>10,}{t_new:>9.2f}s{len(new[1]) / t_new * 60:>14,.0f}')
+
+    big_texts = corpus.tolist()
+    t_big, (_, big) = timed(augmenter.generate, big_texts, BIG_NEEDED, seen=corpus)
+    print(f'{"Augmenter (1 worker)":<26}{len(big):>10,}{t_big:>9.2f}s{len(big) / t_big * 60:>14,.0f}')
+    if WORKERS > 1:
+        t_par, (_, big_par) = timed(augmenter.generate, big_texts, BIG_NEEDED, seen=corpus, workers=WORKERS)
+        assert big_par == big, 'Hasil paralel berbeda!'
+        print(f'{f"Augmenter ({WORKERS} worker)":<26}{len(big_par):>10,}{t_par:>9.2f}s'
+              f'{len(big_par) / t_par * 60:>14,.0f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark & cek kesamaan output balancing.py vs loop concat lama
+
+Membandingkan:
+- loop lama: df[df[col] == kelas] per kelas + pd.concat berulang + shuffle
+- balance(): satu pass posisi per kelas, sampling posisi, satu take
+
+Output harus identik (DataFrame.equals) untuk undersample (df.sample dan
+sklearn-style resample), cap, kelas yang tepat di target (sample_at_target)
+dan kelas yang lebih kecil dari target. Oversample dicek terhadap definisi
+RandomOverSampler (semua baris asli + randint dengan pengembalian).
+Waktu diukur pada ROWS baris dengan 3 kelas dan dengan app x rating
+(CLASS_APPS x 5 kelas).
+
+Mode hash (balance_by_hash): setelah APPEND_FRACTION baris baru ditambahkan,
+baris yang keluar harus persis baris dengan hash terbesar yang digeser
+baris baru (churn marjinal), dibandingkan churn mode sample(random_state).
+
+Jalankan: python benchmark_balancing.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from balancing import balance, balance_by_hash, class_positions, membership_delta, stable_hash
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+ROWS = 2000000     # Ukuran frame benchmark
+CLASS_APPS = 8     # Jumlah app untuk kelas app x rating (8 x 5 = 40 kelas)
+CHECK_ROWS = 20000 # Ukuran frame untuk cek kesamaan (banyak variasi)
+APPEND_FRACTION = 0.01  # Porsi baris baru untuk cek stabilitas mode hash
+
+def make_frame(rows, seed=42):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'content': pd.Series(rng.integers(0, 10**9, rows)).astype(str),
+        'sentiment': rng.choice(['negative', 'neutral', 'positive', None], rows, p=[0.3, 0.2, 0.49, 0.01]),
+        'app_name': rng.choice([f'app{i}' for i in range(CLASS_APPS)], rows),
+        'rating': rng.choice([1, 2, 3, 4, 5], rows, p=[0.25, 0.1, 0.1, 0.15, 0.4]),
+        'review_id': [f'{seed}-{i}' for i in range(rows)],
+    })
+
+def legacy_balance(df, by, classes, target, sample_at_target=True):
+    """Pola lama: scan per kelas + concat berulang + shuffle frac=1"""
+    df_balanced = pd.DataFrame()
+    for cls in classes:
+        if isinstance(by, str):
+            df_class = df[df[by] == cls]
+        else:
+            mask = np.ones(len(df), dtype=bool)
+            for column, value in zip(by, cls):
+                mask &= (df[column] == value).to_numpy()
+            df_class = df[mask]
+        if len(df_class) > target or (len(df_class) == target and sample_at_target):
+            df_class = df_class.sample(n=target, random_state=42)
+        df_balanced = pd.concat([df_balanced, df_class])
+    return df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+
+def legacy_resample(df, by, classes, n_samples):
+    """Pola sklearn.utils.resample(replace=False, random_state=42): shuffle arange lalu potong"""
+    df_balanced = pd.DataFrame()
+    for cls in classes:
+        df_class = df[df[by] == cls]
+        indices = np.arange(len(df_class))
+        np.random.RandomState(42).shuffle(indices)
+        df_balanced = pd.concat([df_balanced, df_class.iloc[indices[:n_samples]]])
+    return df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def check_equivalence():
+    df = make_frame(CHECK_ROWS, seed=7)
+    counts = df['sentiment'].value_counts()
+    classes = ['negative', 'neutral', 'positive']
+    for target in (counts.min(), 1000, counts['neutral'], counts.max(), 0):
+        for sample_at_target in (True, False):
+            expected = legacy_balance(df, 'sentiment', classes, target, sample_at_target)
+            actual = balance(df, 'sentiment', classes=classes, target=target,
+                             sample_at_target=sample_at_target)
+            assert expected.equals(actual), f'Beda: target={target}, sample_at_target={sample_at_target}'
+    assert legacy_resample(df, 'sentiment', classes, counts.min()).equals(
+        balance(df, 'sentiment', classes=classes)), 'Beda dengan pola resample'
+    assert legacy_balance(df, 'sentiment', list(counts.index), min(counts.min(), 3000)).equals(
+        balance(df, 'sentiment', classes=counts.index, target='min', cap=3000)), 'Beda (cap)'
+
+    by = ['app_name', 'rating']
+    keys = list(df[by].drop_duplicates().itertuples(index=False, name=None))
+    assert list(class_positions(df[by])) == keys, 'Urutan kelas multi-kolom berbeda'
+    assert legacy_balance(df, by, keys, 200).equals(balance(df, by, target=200)), 'Beda (multi-kolom)'
+
+    # Oversample: semua baris asli + randint(0, len, kekurangan) per kelas
+    small = df.iloc[:500]
+    over = balance(small, 'sentiment', classes=classes, target='max', oversample=True, shuffle=False)
+    target = small['sentiment'].value_counts().max()
+    for cls in classes:
+        rows = small[small['sentiment'] == cls]
+        extra = np.random.RandomState(42).randint(0, len(rows), target - len(rows))
+        expected = pd.concat([rows, rows.iloc[extra]]) if len(rows) < target else rows.sample(n=target, random_state=42)
+        assert over[over['sentiment'] == cls].reset_index(drop=True).equals(expected.reset_index(drop=True)), \
+            f'Oversample berbeda ({cls})'
+    print(f'✅ Output identik dengan loop lama (undersample, cap, resample, multi-kolom, oversample)')
+
+def check_hash_stability(df, target):
+    """Tambah baris baru: mode hash hanya mengganti baris marjinal, mode sample berubah total"""
+    new_rows = make_frame(int(len(df) * APPEND_FRACTION), seed=99)
+    grown = pd.concat([df, new_rows], ignore_index=True).sample(frac=1, random_state=1)
+    classes = ['negative', 'neutral', 'positive']
+
+    before = balance_by_hash(df, 'sentiment', key='review_id', classes=classes, target=target)
+    t_hash, after = timed(balance_by_hash, grown, 'sentiment', key='review_id', classes=classes, target=target)
+    added, removed = membership_delta(before['review_id'], after['review_id'])
+    assert set(added) <= set(new_rows['review_id']), 'Mode hash memasukkan baris lama'
+    # Yang keluar = baris dengan hash terbesar per kelas, sebanyak baris baru yang masuk
+    for cls in classes:
+        old = before[before['sentiment'] == cls]
+        n_in = int(new_rows['review_id'].isin(added)[new_rows['sentiment'] == cls].sum())
+        evicted = old['review_id'].iloc[len(old) - n_in:] if n_in else old['review_id'].iloc[:0]
+        assert set(evicted) == set(removed) & set(old['review_id']), f'Eviction bukan marjinal ({cls})'
+    assert (np.diff(stable_hash(after['review_id']).astype(np.float64)) >= 0).all(), 'Urutan bukan urutan hash'
+    assert balance_by_hash(grown.iloc[::-1], 'sentiment', key='review_id', classes=classes,
+                           target=target).equals(after), 'Mode hash bergantung urutan baris'
+
+    random_before = balance(df, 'sentiment', classes=classes, target=target)
+    random_after = balance(grown, 'sentiment', classes=classes, target=target)
+    r_added, r_removed = membership_delta(random_before['review_id'], random_after['review_id'])
+    print(f'\nTambah {len(new_rows):,} baris baru ({APPEND_FRACTION:.0%}), target {target:,} per kelas:')
+    print(f'   hash   : +{len(added):,} / -{len(removed):,} baris ({t_hash:.2f}s)')
+    print(f'   sample : +{len(r_added):,} / -{len(r_removed):,} baris')
+    print('✅ Mode hash: hanya baris marjinal yang berubah, tidak bergantung urutan')
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK BALANCING')
+    print('=' * 60)
+    check_equivalence()
+
+    df = make_frame(ROWS)
+    print(f'\nFrame: {len(df):,} baris')
+    print(f'\n{"Kasus":<28}{"kelas":>7}{"loop lama":>12}{"balance":>10}{"speedup":>10}')
+    print('-' * 67)
+
+    classes = ['negative', 'neutral', 'positive']
+    t_old, old = timed(legacy_balance, df, 'sentiment', classes, df['sentiment'].value_counts().min())
+    t_new, new = timed(balance, df, 'sentiment', classes=classes)
+    assert old.equals(new), 'Output berbeda (sentiment)'
+    print(f'{"sentiment (undersample)":<28}{len(classes):>7}{t_old:>11.2f}s{t_new:>9.2f}s{t_old / t_new:>9.1f}x')
+
+    by = ['app_name', 'rating']
+    keys = list(class_positions(df[by]))
+    target = df.groupby(by).size().min()
+    t_old, old = timed(legacy_balance, df, by, keys, target)
+    t_new, new = timed(balance, df, by, target='min')
+    assert old.equals(new), 'Output berbeda (app x rating)'
+    print(f'{"app x rating (undersample)":<28}{len(keys):>7}{t_old:>11.2f}s{t_new:>9.2f}s{t_old / t_new:>9.1f}x')
+
+    t_new, new = timed(balance, df, by, target='max', oversample=True, cap=100000)
+    print(f'{"app x rating (oversample)":<28}{len(keys):>7}{"-":>12}{t_new:>9.2f}s{"":>10}  ({len(new):,} baris)')
+
+    check_hash_stability(df, target=df['sentiment'].value_counts().min() // 2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark & cek kesamaan output clean_text (clean_raw_data.py)
+
+Membandingkan:
+- clean_text_stepwise: 11 tahap terpisah (referensi)
+- clean_text: engine gabungan (pattern precompiled, regex dengan guard,
+  tahap token digabung jadi satu pass)
+- clean_text_series / is_valid_review_series: versi per kolom (teks unik
+  & token unik diproses sekali) vs .apply per baris, pada COLUMN_ROWS baris
+- clean_and_validate dengan 1..N worker process (WORKER_COUNTS, dibatasi
+  jumlah core): hasil harus identik, waktu per jumlah worker
+- clean_and_validate dengan CleanCache (cache kosong vs cache hangat)
+
+Output semua versi harus identik byte-per-byte untuk semua review di CSV
+raw_balanced dan untuk kasus-kasus khusus (URL, email, telepon, HTML,
+emoji, slang, angka, karakter tunggal) + teks acak.
+
+Jalankan: python benchmark_cleaning.py
+"""
+
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from clean_cache import CleanCache
+from clean_raw_data import (clean_text, clean_text_stepwise, clean_text_series,
+                            is_valid_review, is_valid_review_series, clean_and_validate,
+                            CLEANING_VERSION)
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+INPUT_FILES = [
+    'data/gojek_reviews_3class_raw_balanced.csv',
+    'data/gojek_reviews_5class_raw_balanced.csv',
+]
+REPEAT = 3            # Ambil waktu terbaik dari beberapa kali ulang
+FUZZ_SAMPLES = 20000  # Jumlah teks acak untuk cek kesamaan
+COLUMN_ROWS = 1000000 # Ukuran kolom untuk benchmark versi per kolom
+WORKER_COUNTS = (1, 2, 4, 8, 16)  # Jumlah worker clean_and_validate yang diukur
+
+EDGE_CASES = [
+    None, float('nan'), '', '   ', 123, 'A',
+    'Cek https://gojek.com/promo dan www.gojek.co.id sekarang!!',
+    'hubungi cs@gojek.com atau @gojekindonesia #kecewa',
+    'telp 0812-3456-7890 / +62 812 3456 7890 / 6281234567890',
+    '<b>Driver</b> <i>ramah</i> <br/> mantul',
+    'Mantap 👍👍 😡😡 ❤️ ✨ 🇮🇩 ok',
+    'GK BISA LOGIN, APK LEMOT BGT!!! thx',
+    'a i b c d 1 22 333 x1 1x ²³ ٣٤',
+    'ΣΊΣΥΦΟΣ ΑΣ İstanbul ß ﬁ',
+    'ww<x>w.gojek.com ht<br>tp://a.b e<i>@</i>mail 0<b>812345678</b>',
+    'order ke-2 udh 3x gagal, saldo Rp50.000 hilang :(',
+    'tab\there\nnewline\r\nend‍zwj️',
+]
+
+_FUZZ_ALPHABET = (list('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789')
+                  + list(' \t\n.,!?@#:/<>-+_') + ['http', 'www.', '62', 'gk', 'yg', 'bgt', 'apk',
+                  '😡', '👍', '❤', '️', '‍', 'é', 'Σ', 'İ', '²'])
+
+def fuzz_texts(n, seed=42):
+    rng = random.Random(seed)
+    return [''.join(rng.choice(_FUZZ_ALPHABET) for _ in range(rng.randint(0, 60))) for _ in range(n)]
+
+def best_time(fn, texts, repeat=REPEAT):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [fn(t) for t in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def column_corpora(texts, rows=COLUMN_ROWS, seed=42):
+    """
+    Dua kolom berukuran `rows`:
+    - resampled: review asli diambil ulang (duplikat seperti data asli)
+    - unique: gabungan dua review acak (hampir tanpa duplikat)
+    """
+    rng = np.random.default_rng(seed)
+    values = np.array(texts, dtype=object)
+    resampled = pd.Series(values[rng.integers(0, len(values), rows)])
+    left = values[rng.integers(0, len(values), rows)]
+    right = values[rng.integers(0, len(values), rows)]
+    unique = pd.Series([f'{a} {b}' for a, b in zip(left, right)], dtype=object)
+    return {'resampled': resampled, 'unique': unique}
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+def benchmark_columns(texts):
+    """clean_text_series & is_valid_review_series vs .apply per baris"""
+    print(f'\n{"Kolom":<12}{"Tahap":<10}{"apply":>10}{"series":>10}{"speedup":>10}')
+    print('-' * 52)
+    for name, column in column_corpora(texts).items():
+        t_row, out_row = timed(column.apply, clean_text)
+        t_col, out_col = timed(clean_text_series, column)
+        assert out_row.equals(out_col), f'clean_text_series berbeda dari .apply ({name})'
+        print(f'{name:<12}{"clean":<10}{t_row:>9.2f}s{t_col:>9.2f}s{t_row / t_col:>9.1f}x')
+
+        t_row, valid_row = timed(out_row.apply, is_valid_review)
+        t_col, valid_col = timed(is_valid_review_series, out_row)
+        assert valid_row.astype(bool).equals(valid_col), f'is_valid_review_series berbeda ({name})'
+        print(f'{name:<12}{"valid":<10}{t_row:>9.2f}s{t_col:>9.2f}s{t_row / t_col:>9.1f}x')
+    print(f'✅ Output per kolom identik ({COLUMN_ROWS:,} baris per kolom)')
+
+def benchmark_workers(texts):
+    """clean_and_validate (clean_dataset) dengan beberapa jumlah worker process"""
+    column = column_corpora(texts)['unique']
+    counts = [w for w in WORKER_COUNTS if w <= (os.cpu_count() or 1)]
+    print(f'\n{"Workers":<10}{"Waktu":>10}{"reviews/s":>14}{"scaling":>10}')
+    print('-' * 44)
+    baseline = expected = None
+    for workers in counts:
+        elapsed, result = timed(clean_and_validate, column, workers)
+        if expected is None:
+            baseline, expected = elapsed, result
+        assert result.equals(expected), f'clean_and_validate berbeda untuk {workers} worker'
+        print(f'{workers:<10}{elapsed:>9.2f}s{len(column) / elapsed:>14,.0f}{baseline / elapsed:>9.1f}x')
+    print(f'✅ Output identik untuk {", ".join(map(str, counts))} worker')
+
+def benchmark_cache(texts):
+    """clean_and_validate tanpa cache vs cache kosong vs cache hangat (rerun)"""
+    column = pd.Series(texts, dtype=object)
+    t_plain, expected = timed(clean_and_validate, column, 1)
+    print(f'\n{"Cache":<10}{"Waktu":>10}{"reviews/s":>14}')
+    print('-' * 34)
+    print(f'{"tanpa":<10}{t_plain:>9.2f}s{len(column) / t_plain:>14,.0f}')
+    with tempfile.TemporaryDirectory() as tmp:
+        with CleanCache(os.path.join(tmp, 'clean_cache.db'), version=CLEANING_VERSION) as cache:
+            for name in ('kosong', 'hangat'):
+                elapsed, result = timed(clean_and_validate, column, 1, len(column), cache)
+                assert result.equals(expected), f'clean_and_validate dengan cache ({name}) berbeda'
+                print(f'{name:<10}{elapsed:>9.2f}s{len(column) / elapsed:>14,.0f}')
+    print('✅ Output dengan cache identik')
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK clean_text')
+    print('=' * 60)
+
+    texts = []
+    for path in INPUT_FILES:
+        texts.extend(pd.read_csv(path)['content'].tolist())
+    print(f'Reviews: {len(texts):,} ({", ".join(INPUT_FILES)})')
+
+    # Kesamaan output
+    checks = EDGE_CASES + fuzz_texts(FUZZ_SAMPLES)
+    mismatches = [t for t in checks if clean_text(t) != clean_text_stepwise(t)]
+    print(f'Edge cases + fuzz: {len(checks):,} teks, {len(mismatches)} beda')
+    assert not mismatches, f'Output berbeda untuk: {mismatches[:5]!r}'
+    column = pd.Series(checks, dtype=object)
+    assert clean_text_series(column).equals(column.apply(clean_text)), 'clean_text_series berbeda!'
+    strings = pd.Series([t for t in checks if isinstance(t, str)] + [None], dtype=object)
+    assert clean_text_series(strings).equals(strings.apply(clean_text)), 'clean_text_series berbeda!'
+    cleaned = strings.apply(clean_text)
+    for values in (strings, cleaned):
+        assert is_valid_review_series(values).equals(values.apply(is_valid_review).astype(bool)), \
+            'is_valid_review_series berbeda!'
+
+    t_step, out_step = best_time(clean_text_stepwise, texts)
+    t_fused, out_fused = best_time(clean_text, texts)
+    assert out_step == out_fused, 'Output clean_text berbeda dari clean_text_stepwise!'
+    print(f'✅ Output identik untuk {len(texts):,} reviews')
+
+    print(f'\n{"Versi":<24}{"Waktu":>10}{"reviews/s":>14}')
+    print('-' * 48)
+    print(f'{"stepwise (11 tahap)":<24}{t_step:>9.3f}s{len(texts) / t_step:>14,.0f}')
+    print(f'{"fused":<24}{t_fused:>9.3f}s{len(texts) / t_fused:>14,.0f}')
+    print(f'\n🚀 Speedup: {t_step / t_fused:.2f}x')
+
+    benchmark_cache(texts)
+    benchmark_columns(texts)
+    benchmark_workers(texts)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark & cek kesamaan hitungan leksikon sentiment (lexicon_matcher.py)
+
+Membandingkan:
+- scan lama: sum(1 for word in WORDS if word in text) per kategori
+  (satu scan substring per entry leksikon)
+- LexiconMatcher: satu automaton Aho-Corasick, satu pass per teks
+
+untuk leksikon clean_5class_data.py (4 kategori) dan
+scrape_reviews_complete.py (positif/negatif neutral check). Hitungan per
+kategori harus identik untuk semua review di CSV raw_balanced dan untuk
+teks acak yang menumpuk potongan leksikon (overlap, prefix, duplikat).
+
+Juga: check_consistency_batch (clean_5class_data) vs
+df.apply(check_consistency, axis=1) pada kolom review hasil resample,
+dan waktu versi batch untuk jutaan baris (SCALE_ROWS).
+
+Jalankan: python benchmark_lexicon.py
+"""
+
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from clean_5class_data import SENTIMENT_LEXICON, VERY_NEGATIVE_WORDS, NEGATIVE_WORDS, \
+    POSITIVE_WORDS, VERY_POSITIVE_WORDS, check_consistency, check_consistency_batch
+from lexicon_matcher import LexiconMatcher
+from scrape_reviews_complete import NEUTRAL_LEXICON, NEUTRAL_POSITIVE_WORDS, NEUTRAL_NEGATIVE_WORDS
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+INPUT_FILES = [
+    'data/gojek_reviews_3class_raw_balanced.csv',
+    'data/gojek_reviews_5class_raw_balanced.csv',
+]
+REPEAT = 3            # Ambil waktu terbaik dari beberapa kali ulang
+FUZZ_SAMPLES = 20000  # Jumlah teks acak untuk cek kesamaan
+APPLY_ROWS = 200000   # Baris untuk perbandingan .apply(axis=1) vs batch
+SCALE_ROWS = 5000000  # Baris untuk mengukur versi batch saja
+
+LEXICONS = {
+    'clean_5class_data': (SENTIMENT_LEXICON, [VERY_NEGATIVE_WORDS, NEGATIVE_WORDS,
+                                              POSITIVE_WORDS, VERY_POSITIVE_WORDS]),
+    'scrape_reviews_complete': (NEUTRAL_LEXICON, [NEUTRAL_POSITIVE_WORDS, NEUTRAL_NEGATIVE_WORDS]),
+}
+
+EDGE_CASES = [
+    '', ' ', 'a', 'ok', 'oke', 'okay', 'tai', 'taik', 'terbaik', 'aplikasi terbaik',
+    'jelek banget jelek banget', 'sangat bagus sangat baik', 'tidak bisa ga bisa gak bisa',
+    'thank you thanks', 'bintang 1 bintang 1', 'tidak recommended', 'lamaaaa', 'lambat',
+    'never ever', 'ga akan lagi', '😡 sampah 👍 mantap', 'top up gagal', 'stopwatch',
+]
+
+def scan_counts(lists, text):
+    """Hitungan cara lama: satu `in`-scan per entry leksikon"""
+    return tuple(sum(1 for word in words if word in text) for words in lists)
+
+def fuzz_texts(lists, n, seed=42):
+    """Teks acak dari potongan entry leksikon + karakter pengisi"""
+    rng = random.Random(seed)
+    pieces = [word for words in lists for word in words]
+    pieces += [word[:rng.randint(1, len(word))] for word in pieces]  # prefix entry
+    pieces += list(' abcdegiklmnoprstuy') + ['😡', '👍', '\n']
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(0, 25))) for _ in range(n)]
+
+def best_time(fn, texts, repeat=REPEAT):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = [fn(t) for t in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def review_frame(texts, rows, seed=42):
+    """DataFrame review + rating acak (review diambil ulang, duplikat seperti data asli)"""
+    rng = np.random.default_rng(seed)
+    values = np.array(texts, dtype=object)
+    return pd.DataFrame({'review': values[rng.integers(0, len(values), rows)],
+                         'rating': rng.integers(1, 6, rows)})
+
+def benchmark_consistency(texts):
+    """check_consistency_batch vs df.apply(check_consistency, axis=1)"""
+    print(f'\n{"Baris":<12}{"apply":>10}{"batch":>10}{"speedup":>10}')
+    print('-' * 42)
+    df = review_frame(texts, APPLY_ROWS)
+    start = time.perf_counter()
+    results = df.apply(check_consistency, axis=1)
+    expected = pd.DataFrame({'is_consistent': results.apply(lambda x: x[0]),
+                             'inconsistency_type': results.apply(lambda x: x[1])})
+    t_apply = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = check_consistency_batch(df['review'], df['rating'])
+    t_batch = time.perf_counter() - start
+    assert batch.equals(expected), 'check_consistency_batch berbeda dari check_consistency!'
+    print(f'{APPLY_ROWS:<12,}{t_apply:>9.2f}s{t_batch:>9.2f}s{t_apply / t_batch:>9.1f}x')
+
+    df = review_frame(texts, SCALE_ROWS)
+    start = time.perf_counter()
+    check_consistency_batch(df['review'], df['rating'])
+    t_batch = time.perf_counter() - start
+    print(f'{SCALE_ROWS:<12,}{"-":>10}{t_batch:>9.2f}s{"":>10}')
+    print(f'✅ is_consistent & inconsistency_type identik ({APPLY_ROWS:,} baris)')
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK lexicon matcher')
+    print('=' * 60)
+
+    texts = []
+    for path in INPUT_FILES:
+        texts.extend(str(t).lower() for t in pd.read_csv(path)['content'])
+    print(f'Reviews: {len(texts):,} ({", ".join(INPUT_FILES)})')
+
+    # Entry kosong & duplikat dalam satu list ikut dihitung seperti scan lama
+    lists = [['ok', 'ok', ''], ['ok', 'oke'], []]
+    matcher = LexiconMatcher({'a': lists[0], 'b': lists[1], 'c': lists[2]})
+    for text in ('', 'ok', 'oke', 'xyz'):
+        assert matcher.counts(text) == scan_counts(lists, text), f'Hitungan berbeda: {text!r}'
+
+    print(f'\n{"Leksikon":<26}{"Entry":>7}{"scan":>10}{"AC":>10}{"speedup":>10}')
+    print('-' * 63)
+    for name, (matcher, lists) in LEXICONS.items():
+        checks = EDGE_CASES + fuzz_texts(lists, FUZZ_SAMPLES)
+        mismatches = [t for t in checks if matcher.counts(t) != scan_counts(lists, t)]
+        assert not mismatches, f'{name}: hitungan berbeda untuk {mismatches[:5]!r}'
+        assert (matcher.count_matrix(checks).tolist()
+                == [list(scan_counts(lists, t)) for t in checks]), f'{name}: count_matrix berbeda'
+
+        t_scan, out_scan = best_time(lambda t: scan_counts(lists, t), texts)
+        t_ac, out_ac = best_time(matcher.counts, texts)
+        assert out_scan == out_ac, f'{name}: hitungan LexiconMatcher berbeda dari scan lama!'
+        entries = sum(len(words) for words in lists)
+        print(f'{name:<26}{entries:>7}{t_scan:>9.3f}s{t_ac:>9.3f}s{t_scan / t_ac:>9.2f}x')
+
+    print(f'\n✅ Hitungan identik ({len(texts):,} reviews + {len(EDGE_CASES) + FUZZ_SAMPLES:,} '
+          f'teks uji per leksikon)')
+
+    benchmark_consistency(texts)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark & cek akurasi near-duplicate detection (near_dedup.py)
+
+- Akurasi: pada SAMPLE_DOCS review bersih + varian Augmenter, pasangan
+  dengan Jaccard >= threshold dihitung brute-force O(n^2) lalu
+  dibandingkan dengan cluster MinHash/LSH (recall pasangan, jumlah baris
+  yang dibuang, false positive dengan Jaccard jauh di bawah threshold)
+- Skala: waktu tiap tahap (signature, kandidat LSH, verifikasi, cluster)
+  untuk SCALE_ROWS review sintetis (gabungan dua review acak)
+
+Jalankan: python benchmark_near_dedup.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from augment_data import INDONESIAN_SYNONYMS
+from augmentation import Augmenter
+from clean_raw_data import clean_text_series
+from near_dedup import (THRESHOLD, minhash_signatures, lsh_params, candidate_pairs,
+                        signature_similarity, connected_groups, near_duplicate_groups)
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+INPUT_FILES = [
+    'data/gojek_reviews_3class_raw_balanced.csv',
+    'data/gojek_reviews_5class_raw_balanced.csv',
+]
+SAMPLE_DOCS = 3000      # Review asli untuk cek brute-force
+AUGMENTED_SOURCES = 300 # Review yang diberi varian Augmenter (sinonim, swap, hapus)
+SCALE_ROWS = 1000000    # Baris untuk benchmark skala
+MIN_RECALL = 0.95
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def check_accuracy(texts):
+    """Cluster LSH vs pasangan Jaccard brute-force"""
+    augmenter = Augmenter(INDONESIAN_SYNONYMS, seed=42)
+    docs = texts[:SAMPLE_DOCS]
+    for position, text in enumerate(texts[:AUGMENTED_SOURCES]):
+        docs += augmenter.variants(text, augmenter.rng(position, 0))
+    sets = [frozenset(text.split()) for text in docs]
+
+    start = time.perf_counter()
+    pairs = [(i, j) for i in range(len(sets)) for j in range(i + 1, len(sets))
+             if jaccard(sets[i], sets[j]) >= THRESHOLD]
+    t_brute = time.perf_counter() - start
+    start = time.perf_counter()
+    groups = near_duplicate_groups(docs, THRESHOLD)
+    t_lsh = time.perf_counter() - start
+
+    recovered = sum(1 for i, j in pairs if groups[i] == groups[j])
+    dropped_brute = len({j for _, j in pairs})
+    dropped_lsh = int((groups != np.arange(len(docs))).sum())
+    far = sum(1 for i in np.flatnonzero(groups != np.arange(len(docs)))
+              if jaccard(sets[i], sets[groups[i]]) < THRESHOLD - 0.2)
+    print(f'Teks: {len(docs):,} ({SAMPLE_DOCS:,} asli + varian Augmenter), threshold {THRESHOLD}')
+    print(f'   Brute-force: {t_brute:.2f}s, {len(pairs):,} pasangan, {dropped_brute:,} baris dibuang')
+    print(f'   MinHash/LSH: {t_lsh:.2f}s, recall pasangan {recovered / max(len(pairs), 1):.1%}, '
+          f'{dropped_lsh:,} baris dibuang, {far} jauh di bawah threshold')
+    assert recovered / max(len(pairs), 1) >= MIN_RECALL, 'Recall near-duplicate terlalu rendah!'
+
+def benchmark_scale(texts):
+    """Waktu per tahap untuk SCALE_ROWS review"""
+    rng = np.random.default_rng(42)
+    values = np.array(texts, dtype=object)
+    left = values[rng.integers(0, len(values), SCALE_ROWS)]
+    right = values[rng.integers(0, len(values), SCALE_ROWS)]
+    column = [f'{a} {b}' for a, b in zip(left, right)]
+
+    print(f'\n{"Tahap":<14}{"Waktu":>10}')
+    print('-' * 24)
+    start = total = time.perf_counter()
+    signatures = minhash_signatures(column)
+    print(f'{"signature":<14}{time.perf_counter() - start:>9.2f}s')
+    start = time.perf_counter()
+    pairs = candidate_pairs(signatures, *lsh_params())
+    print(f'{"kandidat LSH":<14}{time.perf_counter() - start:>9.2f}s  ({len(pairs):,} pasangan)')
+    start = time.perf_counter()
+    pairs = pairs[signature_similarity(signatures, pairs) >= THRESHOLD]
+    print(f'{"verifikasi":<14}{time.perf_counter() - start:>9.2f}s  ({len(pairs):,} lolos)')
+    start = time.perf_counter()
+    groups = connected_groups(len(column), pairs)
+    print(f'{"cluster":<14}{time.perf_counter() - start:>9.2f}s')
+    elapsed = time.perf_counter() - total
+    print(f'{"total":<14}{elapsed:>9.2f}s  ({SCALE_ROWS / elapsed:,.0f} reviews/s, '
+          f'{int((groups != np.arange(len(column))).sum()):,} near-duplicate)')
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK near-duplicate (MinHash/LSH)')
+    print('=' * 60)
+
+    texts = []
+    for path in INPUT_FILES:
+        texts.extend(pd.read_csv(path)['content'].tolist())
+    texts = clean_text_series(pd.Series(texts)).drop_duplicates().tolist()
+    texts = [text for text in texts if text]
+    print(f'Reviews unik (bersih): {len(texts):,}\n')
+
+    check_accuracy(texts)
+    benchmark_scale(texts)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark & cek kesamaan output profile preprocessing (package preprocessing)
+
+Setiap profile dibandingkan dengan implementasi clean_text lama yang
+digantikannya (salinan di bawah, LEGACY):
+- aggressive-normalized : clean_raw_data.clean_text_stepwise
+- indobert-minimal      : prepare_data_for_training.clean_for_indobert
+- lowercase-basic       : augment_data / scrape_reviews_complete.clean_text
+- lowercase-punct       : clean_3class_data.clean_text
+- cased-punct           : clean_5class_data.clean_text
+
+Output harus identik untuk semua review di CSV raw_balanced, kasus-kasus
+khusus, dan teks acak. Micro-benchmark per profile: waktu per teks
+(profile.clean vs versi lama) dan per kolom (profile.clean_series pada
+COLUMN_ROWS baris dengan duplikat seperti data asli).
+
+Jalankan: python benchmark_preprocessing.py
+"""
+
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmark_cleaning import EDGE_CASES, fuzz_texts, best_time
+from clean_raw_data import clean_text_stepwise
+from preprocessing import PROFILES
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+INPUT_FILES = [
+    'data/gojek_reviews_3class_raw_balanced.csv',
+    'data/gojek_reviews_5class_raw_balanced.csv',
+]
+FUZZ_SAMPLES = 20000   # Jumlah teks acak untuk cek kesamaan
+COLUMN_ROWS = 1000000  # Ukuran kolom untuk benchmark clean_series
+
+EXTRA_CASES = [
+    '  ...Mantap!!!  ', '!?.,', '#promo @gojek www.gojek.com https://x.y',
+    'http://a.b/c?d=e,f.', 'Harga Rp.10.000,- ok??', '<p>Halo</p><br>dunia < 5 >',
+    'wwwgojek hhttp xhttps', 'tab\there nbsp em',
+]
+
+# =====================================================
+# IMPLEMENTASI LAMA (referensi)
+# =====================================================
+def legacy_indobert_minimal(text):
+    if pd.isna(text):
+        return ""
+    text = str(text)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'http\S+|www\.\S+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+def legacy_lowercase_basic(text):
+    if pd.isna(text) or not isinstance(text, str):
+        return ""
+    text = str(text)
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    text = ' '.join(text.split())
+    return text.strip()
+
+def legacy_lowercase_punct(text):
+    if pd.isna(text):
+        return ""
+    text = str(text)
+    text = text.lower()
+    text = re.sub(r'http\S+|www\.\S+', '', text)
+    text = re.sub(r'@\w+|#\w+', '', text)
+    text = re.sub(r'[^\w\s.,!?-]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    text = re.sub(r'^[.,!?\s]+|[.,!?\s]+$', '', text)
+    return text
+
+def legacy_cased_punct(text):
+    if pd.isna(text):
+        return ""
+    text = str(text).strip()
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?-]', '', text)
+    return text.strip()
+
+LEGACY = {
+    'aggressive-normalized': clean_text_stepwise,
+    'indobert-minimal': legacy_indobert_minimal,
+    'lowercase-basic': legacy_lowercase_basic,
+    'lowercase-punct': legacy_lowercase_punct,
+    'cased-punct': legacy_cased_punct,
+}
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+def check_equivalence(profile, legacy, checks):
+    mismatches = [t for t in checks if profile.clean(t) != legacy(t)]
+    assert not mismatches, f'{profile.name}: output berbeda untuk {mismatches[:5]!r}'
+    column = pd.Series(checks, dtype=object)
+    assert profile.clean_series(column).equals(column.map(legacy)), \
+        f'{profile.name}: clean_series berbeda!'
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK PROFILE PREPROCESSING')
+    print('=' * 60)
+
+    texts = []
+    for path in INPUT_FILES:
+        texts.extend(pd.read_csv(path)['content'].tolist())
+    print(f'Reviews: {len(texts):,} ({", ".join(INPUT_FILES)})')
+    assert set(LEGACY) == set(PROFILES), 'Setiap profile harus punya implementasi referensi'
+
+    checks = EDGE_CASES + EXTRA_CASES + fuzz_texts(FUZZ_SAMPLES)
+    rng = np.random.default_rng(42)
+    column = pd.Series(np.array(texts, dtype=object)[rng.integers(0, len(texts), COLUMN_ROWS)])
+
+    print(f'\n{"Profile":<24}{"versi":>18}{"lama":>9}{"clean":>9}{"speedup":>9}'
+          f'{"kolom":>9}{"baris/s":>12}')
+    print('-' * 90)
+    for name, profile in PROFILES.items():
+        legacy = LEGACY[name]
+        check_equivalence(profile, legacy, checks)
+        t_old, out_old = best_time(legacy, texts)
+        t_new, out_new = best_time(profile.clean, texts)
+        assert out_old == out_new, f'{name}: output berbeda pada review asli!'
+        t_col, out_col = timed(profile.clean_series, column)
+        print(f'{name:<24}{profile.version:>18}{t_old:>8.3f}s{t_new:>8.3f}s'
+              f'{t_old / t_new:>8.2f}x{t_col:>8.2f}s{len(column) / t_col:>12,.0f}')
+    print(f'\n✅ Semua profile identik dengan implementasi lama '
+          f'({len(texts):,} reviews + {len(checks):,} kasus khusus/acak)')
+
+if __name__ == '__main__':
+    main()
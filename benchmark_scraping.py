@@ -0,0 +1,176 @@
+"""
+Benchmark semua mode scraper secara offline (tanpa Play Store)
+
+reviews() diganti SyntheticPlayStore / ReplayPlayStore (fake_play_store.py),
+lalu setiap mode dijalankan dan diukur:
+- pages/s   : halaman review yang berhasil di-serve per detik
+- reviews/s : review yang terkumpul di scraper per detik
+- peak MB   : puncak alokasi Python selama mode berjalan (tracemalloc)
+
+Jeda adaptif RETRY_POLICY tiap script diganti policy tanpa jeda agar yang
+terukur adalah latency simulasi + overhead pipeline (pakai --real-pacing
+untuk memakai policy asli).
+
+Jalankan:
+    python benchmark_scraping.py
+    python benchmark_scraping.py --latency 0.2 --error-rate 0.05 --target 1000
+    python benchmark_scraping.py --replay data/replay/play_store_pages.jsonl
+"""
+
+from collections import Counter
+from contextlib import redirect_stdout
+import argparse
+import io
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from fake_play_store import SyntheticPlayStore, ReplayPlayStore, use_store, DEFAULT_RATING_WEIGHTS
+from scraping_utils import RetryPolicy, PLAY_STORE_HOST, prefetch
+import scrape_raw_reviews
+import scrape_balanced_reviews
+import scrape_reviews_complete
+import scrape_multi_app
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+TARGET = 3000             # Target review per mode (per rating untuk mode balanced)
+LATENCY = 0.05            # Detik per request (rata-rata, jitter +-50%)
+ERROR_RATE = 0.0          # Peluang request gagal
+REVIEWS_PER_APP = 50000   # Ukuran stream sintetis per (app, locale)
+
+# Policy tanpa jeda (backoff tetap ada tapi kecil, agar error rate tetap teruji)
+BENCH_POLICY = RetryPolicy(initial_delay=0.0, min_delay=0.0, backoff_base=0.01,
+                           backoff_max=0.05, max_retries=5)
+BENCH_RPS = 1000.0
+
+# =====================================================
+# MODE SCRAPER
+# =====================================================
+def run_raw(target):
+    buffer = scrape_raw_reviews.scrape_gojek_reviews(target)
+    return len(scrape_raw_reviews.create_dataframe(buffer))
+
+def run_balanced(target, concurrent):
+    combined, _ = scrape_balanced_reviews.scrape_by_score(target_per_score=target,
+                                                          concurrent=concurrent, max_rps=BENCH_RPS)
+    return len(scrape_balanced_reviews.process_to_dataframe(combined))
+
+def run_complete(target):
+    """Pipeline streaming scrape_reviews_complete (scrape -> clean -> label -> CSV)"""
+    m = scrape_reviews_complete
+    stats = Counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = m.CsvSink(os.path.join(tmp, 'scraped.csv'))
+        stop = threading.Event()
+        source = prefetch(m.iter_reviews(m.APP_ID, count=m.MAX_REVIEWS, stop=stop),
+                          depth=m.PREFETCH_BATCHES, stop=stop)
+        labeled = m.label_stage(m.validate_stage(m.clean_stage(source, stats), stats), stats)
+        for batch in labeled:
+            sink.write(batch)
+            if sink.target_reached(target):
+                break
+        labeled.close()
+        sink.close()
+        return stats['raw']
+
+def run_multi_app(target):
+    jobs = scrape_multi_app.build_jobs()
+    partitions = scrape_multi_app.run_jobs(jobs, target_per_job=target,
+                                           host_rates={PLAY_STORE_HOST: BENCH_RPS})
+    return sum(len(df) for frames in partitions.values() for df in frames)
+
+MODES = [
+    ('raw (sequential)', scrape_raw_reviews, lambda t: run_raw(t)),
+    ('balanced (sequential)', scrape_balanced_reviews, lambda t: run_balanced(t // 5, False)),
+    ('balanced (concurrent)', scrape_balanced_reviews, lambda t: run_balanced(t // 5, True)),
+    ('complete (streaming)', scrape_reviews_complete, lambda t: run_complete(t // 3)),
+    ('multi-app (15 jobs)', scrape_multi_app, lambda t: run_multi_app(t // 15)),
+]
+
+# =====================================================
+# BENCHMARK
+# =====================================================
+def benchmark_mode(name, module, run, store, target, real_pacing=False):
+    store.reset_stats()
+    original_policy = module.RETRY_POLICY
+    if not real_pacing:
+        module.RETRY_POLICY = BENCH_POLICY
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        with use_store(store), redirect_stdout(io.StringIO()):
+            collected = run(target)
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        module.RETRY_POLICY = original_policy
+    stats = store.stats()
+    return {
+        'mode': name,
+        'seconds': elapsed,
+        'pages': stats['pages'],
+        'errors': stats['errors'],
+        'reviews': collected,
+        'pages_per_sec': stats['pages'] / elapsed if elapsed else 0.0,
+        'reviews_per_sec': collected / elapsed if elapsed else 0.0,
+        'peak_mb': peak / 1024 ** 2,
+    }
+
+def print_results(results):
+    print(f'\n{"Mode":<24}{"Time":>8}{"Pages":>8}{"Errors":>8}{"Reviews":>9}'
+          f'{"pages/s":>10}{"reviews/s":>11}{"peak MB":>9}')
+    print('-' * 87)
+    for r in results:
+        print(f'{r["mode"]:<24}{r["seconds"]:>7.2f}s{r["pages"]:>8,}{r["errors"]:>8,}'
+              f'{r["reviews"]:>9,}{r["pages_per_sec"]:>10.1f}{r["reviews_per_sec"]:>11,.0f}'
+              f'{r["peak_mb"]:>9.1f}')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark scraper offline')
+    parser.add_argument('--target', type=int, default=TARGET,
+                        help='Target review per mode (dibagi rata ke rating/kelas/job)')
+    parser.add_argument('--latency', type=float, default=LATENCY, help='Detik per request')
+    parser.add_argument('--error-rate', type=float, default=ERROR_RATE)
+    parser.add_argument('--reviews-per-app', type=int, default=REVIEWS_PER_APP)
+    parser.add_argument('--rating-weights', type=float, nargs=5, default=DEFAULT_RATING_WEIGHTS,
+                        help='Bobot rating 1..5 untuk data sintetis')
+    parser.add_argument('--replay', default=None, help='JSONL hasil fake_play_store.py (replay)')
+    parser.add_argument('--modes', nargs='+', default=None,
+                        help='Subset mode (awalan nama, mis. raw balanced)')
+    parser.add_argument('--real-pacing', action='store_true',
+                        help='Pakai RETRY_POLICY asli tiap script (jeda AIMD)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if args.replay:
+        store = ReplayPlayStore(args.replay, latency=args.latency, error_rate=args.error_rate)
+        source = f'replay {args.replay}'
+    else:
+        store = SyntheticPlayStore(reviews_per_app=args.reviews_per_app,
+                                   rating_weights=tuple(args.rating_weights),
+                                   latency=args.latency, error_rate=args.error_rate)
+        source = f'synthetic ({args.reviews_per_app:,} reviews/app)'
+
+    print('=' * 60)
+    print('⏱️  SCRAPER BENCHMARK (OFFLINE)')
+    print('=' * 60)
+    print(f'Source: {source}')
+    print(f'Latency: {args.latency}s | Error rate: {args.error_rate:.0%} | Target: {args.target:,}')
+    print(f'Pacing: {"RETRY_POLICY asli" if args.real_pacing else "tanpa jeda"}')
+
+    results = []
+    for name, module, run in MODES:
+        if args.modes and not any(name.startswith(m) for m in args.modes):
+            continue
+        print(f'   ▶️ {name}...')
+        results.append(benchmark_mode(name, module, run, store, args.target, args.real_pacing))
+    print_results(results)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark & cek cache multi-view (view_cache.py) vs augmentasi + tokenisasi per epoch
+
+Tokenizer pengganti (WordTokenizer) meniru signature tokenizer HuggingFace
+(tokenizer(list, padding='max_length', truncation=True, max_length=L) ->
+input_ids / attention_mask) dengan vocab kata + [CLS]/[SEP]/[PAD]/[UNK],
+jadi benchmark jalan tanpa transformers. Dengan tokenizer WordPiece asli
+selisihnya lebih besar (tokenisasi jauh lebih mahal dari split()).
+
+Cek:
+- reprodusibel: dua build dengan seed sama identik; rebuild dengan
+  parameter sama dilewati (cache key)
+- isi cache = tokenisasi langsung dari teks view yang sama
+- ViewCacheDataset memakai view (epoch + seed) % VIEWS dan attention_mask
+  sesuai panjang token
+Waktu: EPOCHS epoch on-the-fly (augmentasi + tokenisasi per sampel, pola
+SentimentDataset) vs build cache sekali + EPOCHS epoch baca memmap.
+
+Jalankan: python benchmark_view_cache.py
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from view_cache import POLICIES, ViewCacheDataset, build_view_cache, view_texts
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+INPUT_FILE = 'data/gojek_reviews_3class_raw_balanced.csv'
+TEXT_COLUMN = 'content'
+ROWS = 20000        # Sampel training untuk benchmark
+VIEWS = 8
+EPOCHS = 20
+MAX_LENGTH = 128
+POLICY = 'enhanced'
+
+class WordTokenizer:
+    """Tokenizer kata sederhana dengan signature panggilan gaya HuggingFace"""
+
+    name_or_path = 'word-tokenizer'
+
+    def __init__(self, texts):
+        words = sorted({w for text in texts for w in str(text).lower().split()})
+        self.vocab = {w: i + 4 for i, w in enumerate(words)}  # 0 PAD, 1 UNK, 2 CLS, 3 SEP
+        self.vocab_size = len(self.vocab) + 4
+
+    def encode_plus(self, text, add_special_tokens=True, max_length=MAX_LENGTH,
+                    padding='max_length', truncation=True, return_attention_mask=True):
+        ids = [self.vocab.get(w, 1) for w in text.lower().split()][:max_length - 2]
+        ids = [2] + ids + [3]
+        mask = [1] * len(ids) + [0] * (max_length - len(ids))
+        return {'input_ids': ids + [0] * (max_length - len(ids)), 'attention_mask': mask}
+
+    def __call__(self, texts, **kwargs):
+        encodings = [self.encode_plus(text, **kwargs) for text in texts]
+        return {key: [e[key] for e in encodings] for key in ('input_ids', 'attention_mask')}
+
+def load_texts():
+    if os.path.exists(INPUT_FILE):
+        texts = pd.read_csv(INPUT_FILE)[TEXT_COLUMN].dropna().astype(str)
+        return texts.iloc[:ROWS].tolist()
+    # Tanpa data: kalimat sintetis dari kosakata kecil
+    rng = random.Random(0)
+    words = [f'kata{i}' for i in range(3000)]
+    return [' '.join(rng.choices(words, k=rng.randint(3, 40))) for _ in range(ROWS)]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def on_the_fly_epochs(texts, labels, tokenizer, epochs):
+    """Pola SentimentDataset.__getitem__: augmentasi + encode_plus per sampel setiap epoch"""
+    augment = POLICIES[POLICY]
+    rng = random.Random(42)
+    for _ in range(epochs):
+        for idx in range(len(texts)):
+            encoding = tokenizer.encode_plus(augment(texts[idx], rng), max_length=MAX_LENGTH)
+            item = {'input_ids': np.asarray(encoding['input_ids'], dtype=np.int64),
+                    'attention_mask': np.asarray(encoding['attention_mask'], dtype=np.int64),
+                    'label': labels[idx]}
+    return item
+
+def cached_epochs(cache_dir, epochs):
+    """Baca EPOCHS epoch dari cache yang sudah dibangun"""
+    dataset = ViewCacheDataset(cache_dir)
+    for epoch in range(epochs):
+        dataset.set_epoch(epoch)
+        for idx in range(len(dataset)):
+            item = dataset[idx]
+    return item
+
+def check_cache(texts, labels, tokenizer, cache_dir):
+    meta = build_view_cache(texts, labels, tokenizer, cache_dir, views=VIEWS, max_length=MAX_LENGTH,
+                            policy=POLICY, seed=42)
+    first = np.load(os.path.join(cache_dir, 'input_ids.npy'))
+    mtime = os.path.getmtime(os.path.join(cache_dir, 'meta.json'))
+    again = build_view_cache(texts, labels, tokenizer, cache_dir, views=VIEWS, max_length=MAX_LENGTH,
+                             policy=POLICY, seed=42)
+    assert again == meta and os.path.getmtime(os.path.join(cache_dir, 'meta.json')) == mtime, \
+        'Cache dengan key sama dibangun ulang'
+    build_view_cache(texts, labels, tokenizer, cache_dir, views=VIEWS, max_length=MAX_LENGTH,
+                     policy=POLICY, seed=42, force=True)
+    assert np.array_equal(first, np.load(os.path.join(cache_dir, 'input_ids.npy'))), 'Build tidak reprodusibel'
+    print(f'✅ Reprodusibel, rebuild dilewati ({meta["unique_texts"]:,} teks unik dari '
+          f'{VIEWS} x {len(texts):,} view)')
+
+    seed = 3
+    dataset = ViewCacheDataset(cache_dir, seed=seed)
+    for epoch in (0, 1, VIEWS - 1, VIEWS + 2):
+        dataset.set_epoch(epoch)
+        view = (epoch + seed) % VIEWS
+        expected = tokenizer(view_texts(texts, view, POLICY, seed=42), max_length=MAX_LENGTH)
+        for idx in (0, len(texts) // 2, len(texts) - 1):
+            item = dataset[idx]
+            assert item['input_ids'].tolist() == expected['input_ids'][idx], f'Token beda (view {view}, {idx})'
+            assert item['attention_mask'].tolist() == expected['attention_mask'][idx], 'attention_mask beda'
+            assert item['label'] == labels[idx]
+    views = {tuple(np.load(os.path.join(cache_dir, 'input_ids.npy'), mmap_mode='r')[v, 0]) for v in range(VIEWS)}
+    print(f'✅ Isi cache = tokenisasi teks view; view (epoch + seed) % {VIEWS} '
+          f'({len(views)} view berbeda untuk sampel 0)')
+
+def main():
+    print('=' * 60)
+    print('⏱️  BENCHMARK VIEW CACHE')
+    print('=' * 60)
+
+    texts = load_texts()
+    labels = np.arange(len(texts)) % 3
+    tokenizer = WordTokenizer(texts)
+    print(f'Sampel: {len(texts):,}, {VIEWS} view, {EPOCHS} epoch, policy={POLICY}')
+
+    cache_dir = tempfile.mkdtemp(prefix='view_cache_')
+    try:
+        check_cache(texts, labels, tokenizer, cache_dir)
+        t_old, _ = timed(on_the_fly_epochs, texts, labels, tokenizer, EPOCHS)
+        t_build, _ = timed(build_view_cache, texts, labels, tokenizer, cache_dir, views=VIEWS,
+                           max_length=MAX_LENGTH, policy=POLICY, seed=42, force=True)
+        t_read, _ = timed(cached_epochs, cache_dir, EPOCHS)
+        size = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in os.listdir(cache_dir))
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print(f'\n{"Versi":<34}{"waktu":>10}{"per epoch":>12}')
+    print('-' * 56)
+    print(f'{"on-the-fly (augment + tokenize)":<34}{t_old:>9.2f}s{t_old / EPOCHS:>11.3f}s')
+    print(f'{"cache (build sekali)":<34}{t_build:>9.2f}s{"":>12}')
+    print(f'{"cache (baca memmap)":<34}{t_read:>9.2f}s{t_read / EPOCHS:>11.3f}s')
+    print(f'Speedup per epoch: {t_old / t_read:.1f}x, total (build + {EPOCHS} epoch): '
+          f'{t_old / (t_build + t_read):.1f}x, ukuran cache {size / 1e6:.1f} MB')
+
+if __name__ == '__main__':
+    main()
@@ -3,40 +3,23 @@ Script untuk membersihkan data sentiment 3 kelas
 """
 
 import pandas as pd
-import re
 import os
 
+from cleaning_utils import map_unique
+from preprocessing import get_profile
+from row_filters import RowFilter, duplicated
+
+CLEAN_PROFILE = get_profile('lowercase-punct')
+
 def clean_text(text):
-    """Bersihkan teks dari karakter tidak perlu"""
-    if pd.isna(text):
-        return ""
-    
-    text = str(text)
-    
-    # Lowercase
-    text = text.lower()
-    
-    # Hapus URLs
-    text = re.sub(r'http\S+|www\.\S+', '', text)
-    
-    # Hapus mentions dan hashtags
-    text = re.sub(r'@\w+|#\w+', '', text)
-    
-    # Hapus emoji (basic)
-    text = re.sub(r'[^\w\s.,!?-]', ' ', text)
-    
-    # Hapus multiple spaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    # Hapus leading/trailing punctuation
-    text = re.sub(r'^[.,!?\s]+|[.,!?\s]+$', '', text)
-    
-    return text
+    """Bersihkan teks dari karakter tidak perlu (profile 'lowercase-punct')"""
+    return CLEAN_PROFILE.clean(text)
 
 def main():
     # Load data
     input_path = 'data/gojek_reviews_relabelled_text_based.csv'
     output_path = 'data/gojek_reviews_3class_clean.csv'
+    stats_path = 'data/gojek_reviews_3class_clean_filter_stats.csv'
     
     print("=" * 60)
     print("PEMBERSIHAN DATA 3 KELAS SENTIMENT")
@@ -52,31 +35,26 @@ def main():
     
     # === CLEANING STEPS ===
     
-    # Step 1: Hapus data ambigu - score 3 dengan label positive (seharusnya neutral)
-    # Karena score 3 secara natural adalah netral, bukan positif
-    ambigu_count = len(df[(df['score'] == 3) & (df['sentiment'] == 'positive')])
-    print(f"\n3. Menghapus {ambigu_count} review ambigu (score=3, sentiment=positive)")
-    df_clean = df[~((df['score'] == 3) & (df['sentiment'] == 'positive'))].copy()
-    
-    # Step 2: Bersihkan teks
-    print("\n4. Membersihkan teks...")
-    df_clean['content_clean'] = df_clean['content'].apply(clean_text)
-    
-    # Step 3: Hapus teks yang terlalu pendek (< 3 kata)
-    df_clean['word_count'] = df_clean['content_clean'].apply(lambda x: len(str(x).split()))
-    short_count = len(df_clean[df_clean['word_count'] < 3])
-    print(f"5. Menghapus {short_count} review terlalu pendek (< 3 kata)")
-    df_clean = df_clean[df_clean['word_count'] >= 3]
-    
-    # Step 4: Hapus duplikat
-    dup_count = df_clean['content_clean'].duplicated().sum()
-    print(f"6. Menghapus {dup_count} duplikat")
-    df_clean = df_clean.drop_duplicates(subset=['content_clean'])
-    
-    # Step 5: Hapus teks yang terlalu panjang (> 500 kata) - mungkin bukan review asli
-    too_long = len(df_clean[df_clean['word_count'] > 500])
-    print(f"7. Menghapus {too_long} review terlalu panjang (> 500 kata)")
-    df_clean = df_clean[df_clean['word_count'] <= 500]
+    # Bersihkan teks & hitung jumlah kata (sekali untuk semua baris)
+    print(f"\n3. Membersihkan teks (profile {CLEAN_PROFILE.id})...")
+    df['content_clean'] = map_unique(df['content'], clean_text)
+    df['word_count'] = map_unique(df['content_clean'], lambda x: len(str(x).split()))
+    
+    # Semua rule dievaluasi sekali (bitmask alasan drop), hasil dimaterialisasi sekali
+    rows = (RowFilter()
+            # Score 3 secara natural adalah netral, bukan positif
+            .add('ambiguous', lambda d, alive: (d['score'] == 3) & (d['sentiment'] == 'positive'),
+                 'review ambigu (score=3, sentiment=positive)')
+            .add('too_short', lambda d, alive: d['word_count'] < 3,
+                 'review terlalu pendek (< 3 kata)')
+            .add('duplicate', duplicated('content_clean'), 'duplikat')
+            # > 500 kata mungkin bukan review asli
+            .add('too_long', lambda d, alive: d['word_count'] > 500,
+                 'review terlalu panjang (> 500 kata)'))
+    df_clean, filter_stats = rows.apply(df)
+    for step, rule in enumerate(filter_stats.itertuples(), start=4):
+        print(f"{step}. Menghapus {rule.dropped} {rule.description}")
+    filter_stats.to_csv(stats_path, index=False)
     
     # Final cleanup
     df_final = df_clean[['userName', 'content', 'content_clean', 'score', 'at', 'sentiment']].copy()
@@ -100,6 +78,7 @@ def main():
     df_final.drop(columns=['word_count'], inplace=True)
     df_final.to_csv(output_path, index=False)
     print(f"\n✓ Data tersimpan di: {output_path}")
+    print(f"✓ Statistik filter per rule: {stats_path}")
     
     return df_final
 
@@ -5,19 +5,19 @@ Memperbaiki inkonsistensi antara rating, sentiment, dan konten review.
 
 import pandas as pd
 import numpy as np
-import re
 from collections import Counter
+from pandas.api.types import infer_dtype
+
+from balancing import balance
+from cleaning_utils import map_unique
+from lexicon_matcher import LexiconMatcher
+from preprocessing import get_profile
+
+CLEAN_PROFILE = get_profile('cased-punct')
 
 def clean_text(text):
-    """Clean review text"""
-    if pd.isna(text):
-        return ""
-    text = str(text).strip()
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    # Remove special characters but keep Indonesian words
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    return text.strip()
+    """Clean review text (profile 'cased-punct')"""
+    return CLEAN_PROFILE.clean(text)
 
 def get_sentiment_from_rating(rating):
     """Map rating to sentiment label (5 classes)"""
@@ -69,15 +69,20 @@ VERY_POSITIVE_WORDS = [
     'awesome', 'fantastic', 'wonderful', 'best app', 'aplikasi terbaik'
 ]
 
+# Satu automaton Aho-Corasick untuk keempat leksikon (satu scan per teks)
+SENTIMENT_LEXICON = LexiconMatcher({
+    'very_negative': VERY_NEGATIVE_WORDS,
+    'negative': NEGATIVE_WORDS,
+    'positive': POSITIVE_WORDS,
+    'very_positive': VERY_POSITIVE_WORDS,
+})
+
 def analyze_text_sentiment(text):
     """Analyze text to detect sentiment based on keywords"""
     text_lower = str(text).lower()
     
-    # Count sentiment words
-    very_neg_count = sum(1 for word in VERY_NEGATIVE_WORDS if word in text_lower)
-    neg_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
-    pos_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
-    very_pos_count = sum(1 for word in VERY_POSITIVE_WORDS if word in text_lower)
+    # Count sentiment words (substring match, sama dengan `word in text_lower`)
+    very_neg_count, neg_count, pos_count, very_pos_count = SENTIMENT_LEXICON.counts(text_lower)
     
     # Return detected sentiment
     scores = {
@@ -120,6 +125,59 @@ def check_consistency(row):
     
     return True, 'consistent'
 
+# Aturan inkonsistensi, urutan = prioritas (sama dengan if-chain check_consistency)
+INCONSISTENCY_TYPES = [
+    'negative_text_high_rating',
+    'positive_text_low_rating',
+    'negative_sentiment_high_rating',
+    'positive_sentiment_low_rating',
+]
+
+def sentiment_count_matrix(texts):
+    """
+    Matriks (n, 4) jumlah kata very_negative, negative, positive,
+    very_positive per teks (tanpa dikali 2). Setiap teks unik hanya di-scan
+    sekali oleh SENTIMENT_LEXICON.
+    """
+    texts = pd.Series(texts, dtype=object)
+    if infer_dtype(texts, skipna=True) in ('string', 'empty'):
+        codes, uniques = pd.factorize(texts, use_na_sentinel=False)
+    else:
+        codes, uniques = np.arange(len(texts)), texts.to_numpy()
+    return SENTIMENT_LEXICON.count_matrix([str(text).lower() for text in uniques])[codes]
+
+def check_consistency_batch(reviews, ratings):
+    """
+    Versi per kolom dari check_consistency: matriks hitungan leksikon untuk
+    semua review sekaligus, lalu keempat aturan dievaluasi sebagai operasi
+    boolean NumPy. Return DataFrame (index = reviews) dengan kolom
+    is_consistent dan inconsistency_type.
+    """
+    reviews = pd.Series(reviews)
+    counts = sentiment_count_matrix(reviews)
+    rating = pd.Series(ratings).astype(int).to_numpy()
+
+    very_negative = counts[:, 0] * 2
+    negative = counts[:, 1]
+    positive = counts[:, 2]
+    very_positive = counts[:, 3] * 2
+    overall_score = (very_positive * 2 + positive) - (very_negative * 2 + negative)
+
+    high_rating = rating >= 4
+    low_rating = rating <= 2
+    rules = [
+        (very_negative >= 2) & high_rating,
+        (very_positive >= 2) & low_rating,
+        (overall_score <= -3) & high_rating,
+        (overall_score >= 3) & low_rating,
+    ]
+    inconsistency_type = np.select(rules, INCONSISTENCY_TYPES, default='consistent').astype(object)
+
+    return pd.DataFrame({
+        'is_consistent': inconsistency_type == 'consistent',
+        'inconsistency_type': inconsistency_type,
+    }, index=reviews.index)
+
 def main():
     # Load data
     print("Loading data...")
@@ -131,8 +189,8 @@ def main():
     print(df['sentiment_label'].value_counts())
     
     # Clean text
-    print("\nCleaning text...")
-    df['review'] = df['review'].apply(clean_text)
+    print(f"\nCleaning text (profile {CLEAN_PROFILE.id})...")
+    df['review'] = map_unique(df['review'], clean_text)
     
     # Remove empty reviews
     df = df[df['review'].str.len() > 5]
@@ -144,9 +202,9 @@ def main():
     
     # Check consistency
     print("\nChecking consistency...")
-    consistency_results = df.apply(check_consistency, axis=1)
-    df['is_consistent'] = consistency_results.apply(lambda x: x[0])
-    df['inconsistency_type'] = consistency_results.apply(lambda x: x[1])
+    consistency = check_consistency_batch(df['review'], df['rating'])
+    df['is_consistent'] = consistency['is_consistent']
+    df['inconsistency_type'] = consistency['inconsistency_type']
     
     # Show inconsistency stats
     inconsistent = df[~df['is_consistent']]
@@ -186,15 +244,10 @@ def main():
     
     print(f"\nTarget per class: {target_count}")
     
-    # Balance by undersampling
-    df_balanced = pd.DataFrame()
-    for label in ['sangat_negatif', 'negatif', 'netral', 'positif', 'sangat_positif']:
-        df_class = df_clean[df_clean['sentiment_label'] == label]
-        if len(df_class) > target_count:
-            df_class = df_class.sample(n=target_count, random_state=42)
-        df_balanced = pd.concat([df_balanced, df_class])
-    
-    df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)  # Shuffle
+    # Balance by undersampling (kelas yang tepat target_count baris dipakai apa adanya), lalu shuffle
+    df_balanced = balance(df_clean, 'sentiment_label',
+                          classes=['sangat_negatif', 'negatif', 'netral', 'positif', 'sangat_positif'],
+                          target=target_count, seed=42, sample_at_target=False)
     
     print("\nFinal distribution:")
     print(df_balanced['sentiment_label'].value_counts())
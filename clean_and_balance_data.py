@@ -4,7 +4,9 @@ gojek_reviews_relabelled_text_based.csv
 """
 import pandas as pd
 import numpy as np
-from sklearn.utils import resample
+
+from balancing import balance
+from row_filters import RowFilter, duplicated
 
 # Load data
 df = pd.read_csv('data/gojek_reviews_relabelled_text_based.csv')
@@ -12,18 +14,18 @@ print(f'Original data: {len(df):,}')
 print(f'\nOriginal distribution:')
 print(df['sentiment'].value_counts())
 
-# 1. Remove score 3 yang labeled positive (ambiguous - 269 rows)
-df_clean = df[~((df['score'] == 3) & (df['sentiment'] == 'positive'))].copy()
-print(f'\nAfter removing ambiguous score 3 positive: {len(df_clean):,}')
-
-# 2. Remove duplicates
-df_clean = df_clean.drop_duplicates(subset=['content'])
-print(f'After removing duplicates: {len(df_clean):,}')
-
-# 3. Add word count and remove very short texts
-df_clean['word_count'] = df_clean['content'].astype(str).apply(lambda x: len(x.split()))
-df_clean = df_clean[df_clean['word_count'] >= 4]
-print(f'After removing short texts: {len(df_clean):,}')
+# 1-3. Filter dalam satu pass: ambiguous score 3 positive (269 rows), duplikat, teks sangat pendek
+df['word_count'] = df['content'].astype(str).str.split().str.len()
+rows = (RowFilter()
+        .add('ambiguous', lambda d, alive: (d['score'] == 3) & (d['sentiment'] == 'positive'),
+             'removing ambiguous score 3 positive')
+        .add('duplicate', duplicated('content'), 'removing duplicates')
+        .add('too_short', lambda d, alive: d['word_count'] < 4, 'removing short texts'))
+df_clean, filter_stats = rows.apply(df)
+print()
+for rule in filter_stats.itertuples():
+    print(f'After {rule.description}: {rule.remaining:,}')
+filter_stats.to_csv('data/gojek_reviews_cleaned_filter_stats.csv', index=False)
 
 print(f'\nCleaned distribution:')
 print(df_clean['sentiment'].value_counts())
@@ -33,13 +35,7 @@ sentiment_counts = df_clean['sentiment'].value_counts()
 min_count = sentiment_counts.min()
 print(f'\nMin class count: {min_count}')
 
-df_balanced = pd.DataFrame()
-for sentiment in df_clean['sentiment'].unique():
-    df_class = df_clean[df_clean['sentiment'] == sentiment]
-    df_sampled = resample(df_class, replace=False, n_samples=min_count, random_state=42)
-    df_balanced = pd.concat([df_balanced, df_sampled])
-
-df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+df_balanced = balance(df_clean, 'sentiment', target=min_count, seed=42)
 
 print(f'\nBalanced data: {len(df_balanced):,}')
 print(f'\nBalanced distribution:')
@@ -0,0 +1,138 @@
+"""
+Cache hasil cleaning di disk, content-addressed (data/clean_cache.db)
+
+Key = blake2b(versi config cleaning + teks mentah), 16 byte. Value =
+content_clean + is_valid. Teks yang sama (rerun, dataset 3 kelas & 5 kelas
+dari review yang sama, scraping inkremental) cukup dibersihkan sekali;
+mengubah config cleaning (pattern, SLANG_DICT, ...) otomatis memakai key
+baru karena versinya ikut di-hash.
+
+Ukuran dibatasi max_entries: entry yang paling lama tidak dipakai
+(last_used) dibuang lebih dulu. Jumlah entry dihitung sekali lalu
+dilacak dari jumlah insert/delete (tanpa COUNT(*) di setiap put).
+
+Lookup memakai tabel TEMP (executemany + JOIN), bukan satu query per
+900 key; key bisa dihitung di worker process dengan cache_key(prefix, teks)
+(prefix = cache.prefix), jadi proses utama tidak perlu hashing per teks.
+
+Contoh:
+    with CleanCache(version=CLEANING_VERSION) as cache:
+        cached = cache.get_many(keys)
+"""
+
+import hashlib
+from operator import itemgetter
+import os
+import sqlite3
+import time
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+CACHE_PATH = 'data/clean_cache.db'
+MAX_ENTRIES = 2000000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clean_cache (
+    key           BLOB PRIMARY KEY,
+    content_clean TEXT NOT NULL,
+    is_valid      INTEGER NOT NULL,
+    last_used     INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_clean_cache_last_used ON clean_cache(last_used);
+"""
+
+# =====================================================
+# CACHE
+# =====================================================
+def cache_key(prefix, text):
+    """Key content-addressed: blake2b(prefix versi + teks mentah), 16 byte"""
+    return hashlib.blake2b(prefix + text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+class CleanCache:
+    """Key-value store SQLite: hash(versi + teks) -> (content_clean, is_valid)"""
+
+    def __init__(self, path=CACHE_PATH, version='', max_entries=MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.prefix = f'{version}\x00'.encode('utf-8')
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute('CREATE TEMP TABLE lookup (key BLOB PRIMARY KEY) WITHOUT ROWID')
+        self._count = None
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.conn.execute('SELECT COUNT(*) FROM clean_cache').fetchone()[0]
+        return self._count
+
+    def is_empty(self):
+        """True jika cache belum berisi entry (lookup bisa dilewati)"""
+        return self.conn.execute('SELECT 1 FROM clean_cache LIMIT 1').fetchone() is None
+
+    def key(self, text):
+        """Key content-addressed untuk teks mentah (versi config ikut di-hash)"""
+        return cache_key(self.prefix, text)
+
+    def get_many(self, keys):
+        """{key: (content_clean, is_valid)} untuk key yang ada di cache; last_used diperbarui"""
+        keys = list(dict.fromkeys(keys))
+        with self.conn:
+            self.conn.execute('DELETE FROM lookup')
+            self.conn.executemany('INSERT INTO lookup (key) VALUES (?)', ((key,) for key in keys))
+            rows = self.conn.execute(
+                'SELECT c.key, c.content_clean, c.is_valid FROM lookup l JOIN clean_cache c ON c.key = l.key'
+            ).fetchall()
+            if rows:
+                self.conn.execute('UPDATE clean_cache SET last_used = ? '
+                                  'WHERE key IN (SELECT key FROM lookup)', (int(time.time()),))
+        found = {key: (content_clean, bool(is_valid)) for key, content_clean, is_valid in rows}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        """
+        Simpan (key, content_clean, is_valid), lalu evict jika melebihi
+        max_entries. Key yang sudah ada dilewati (key content-addressed:
+        value-nya pasti sama); urut key agar insert B-tree berurutan.
+        """
+        now = int(time.time())
+        rows = sorted(((key, content_clean, int(is_valid), now) for key, content_clean, is_valid in items),
+                      key=itemgetter(0))
+        count = len(self)
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO clean_cache (key, content_clean, is_valid, last_used) '
+                'VALUES (?, ?, ?, ?)', rows
+            )
+        self._count = count + self.conn.total_changes - before
+        self.evict()
+
+    def evict(self):
+        """Buang entry dengan last_used tertua sampai jumlah entry <= max_entries"""
+        excess = len(self) - self.max_entries
+        if excess <= 0:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                'DELETE FROM clean_cache WHERE key IN '
+                '(SELECT key FROM clean_cache ORDER BY last_used LIMIT ?)', (excess,)
+            )
+        self._count -= excess
+        return excess
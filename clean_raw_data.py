@@ -2,9 +2,15 @@
 Script untuk Cleaning Data Review Gojek
 Untuk persiapan training IndoBERT
 
-Input:
-- data/gojek_reviews_3class_raw_balanced.csv
-- data/gojek_reviews_5class_raw_balanced.csv
+Input (--source, default INPUT_SOURCE = store):
+- store: dataset '3class_raw_balanced' & '5class_raw_balanced' di data/reviews.db
+  (ditulis scrape_balanced_reviews.py; CSV lama: review_store.py import --dataset)
+- csv: data/gojek_reviews_3class_raw_balanced.csv
+       data/gojek_reviews_5class_raw_balanced.csv
+
+Jalankan:
+    python clean_raw_data.py                 # dari ReviewStore
+    python clean_raw_data.py --source csv    # dari CSV export
 
 Output:
 - data/gojek_reviews_3class_clean.csv
@@ -12,60 +18,90 @@ Output:
 """
 
 import pandas as pd
-import re
-import string
+import argparse
+import functools
+import hashlib
+import os
 from datetime import datetime
 
+from balancing import balance, balance_by_hash
+from clean_cache import CleanCache, cache_key
+from cleaning_utils import map_unique, map_unique_chunks
+from near_dedup import near_duplicated
+from preprocessing import get_profile
+from preprocessing.profiles import (URL_PATTERN, EMAIL_PATTERN, PHONE_PATTERN, EMOJI_PATTERN,
+                                    HTML_PATTERN, SPECIAL_CHAR_PATTERN, KEEP_SINGLE_CHARS, SLANG_DICT)
+from review_store import ReviewStore
+from row_filters import RowFilter, among_alive, duplicated
+from stream_utils import SeenSet, ReservoirSampler
+
+# Sumber input: 'csv' (input_path) atau 'store' (dataset balanced di REVIEW_STORE_PATH);
+# tidak ada fallback diam-diam antar sumber
+INPUT_SOURCE = 'store'
+REVIEW_STORE_PATH = 'data/reviews.db'
+STORE_COLUMNS = ['review_id', 'user_name', 'content', 'rating', 'thumbs_up', 'app_version',
+                 'review_date', 'reply_content', 'reply_date', 'sentiment', 'scraped_at']
+
+# Cleaning paralel: jumlah proses worker maksimum (1 = tanpa process pool) & teks unik per chunk.
+# Pool hanya dipakai mulai CLEAN_POOL_MIN_UNIQUE teks unik: start worker (spawn, Windows)
+# ~1.3 detik, setara membersihkan ~65rb teks di satu core. pipeline.py membagi core
+# antar stage yang jalan bersamaan (CLEAN_WORKERS di-set per stage)
+CLEAN_WORKERS = os.cpu_count() or 1
+CLEAN_CHUNK_ROWS = 50000
+CLEAN_POOL_MIN_UNIQUE = 100000
+
+# Cache hasil cleaning di disk (key = hash teks mentah + CLEANING_VERSION)
+USE_CLEAN_CACHE = True
+CLEAN_CACHE_PATH = 'data/clean_cache.db'
+CLEAN_CACHE_MAX_ENTRIES = 2000000
+
+# Near-duplicate (MinHash/LSH): Jaccard himpunan kata >= threshold dianggap duplikat (None = nonaktif).
+# Himpunan kata mengabaikan urutan, jadi hanya review dengan label NEAR_DEDUP_BY yang sama digabung
+NEAR_DEDUP_THRESHOLD = 0.8
+NEAR_DEDUP_BY = 'sentiment'
+
+# Balancing default: sample(random_state=42) seperti sebelumnya. Opt-in: nama kolom
+# (mis. 'review_id', atau --balance-hash-key) = bottom-k per kelas berdasarkan hash
+# kolom itu (stabil saat data bertambah), tetapi baris terpilih BERBEDA dari mode sample
+BALANCE_HASH_KEY = None
+
+# Mode streaming (out-of-core): CSV dibaca per chunk, memori tidak tumbuh dengan ukuran input
+STREAMING = False
+STREAM_CHUNK_ROWS = 100000     # Baris CSV per chunk
+STREAM_MAX_PER_CLASS = 200000  # Kapasitas reservoir per kelas (batas atas output balanced)
+STREAM_SEEN_PATH = None        # None = hash dedup di memori; path .db = dedup di SQLite
+
 # =====================================================
 # CLEANING FUNCTIONS
 # =====================================================
 
+# Pattern, SLANG_DICT & profile cleaning ada di package preprocessing (dipakai bersama script lain)
+CLEANING_PROFILE = get_profile('aggressive-normalized')
+
 def remove_urls(text):
     """Hapus URL"""
-    url_pattern = re.compile(r'https?://\S+|www\.\S+')
-    return url_pattern.sub('', text)
+    return URL_PATTERN.sub('', text)
 
 def remove_emails(text):
     """Hapus email"""
-    email_pattern = re.compile(r'\S+@\S+')
-    return email_pattern.sub('', text)
+    return EMAIL_PATTERN.sub('', text)
 
 def remove_phone_numbers(text):
     """Hapus nomor telepon"""
-    phone_pattern = re.compile(r'(\+62|62|0)[\s-]?\d{2,4}[\s-]?\d{3,4}[\s-]?\d{3,4}')
-    return phone_pattern.sub('', text)
+    return PHONE_PATTERN.sub('', text)
 
 def remove_emojis(text):
     """Hapus emoji"""
-    emoji_pattern = re.compile("["
-        u"\U0001F600-\U0001F64F"  # emoticons
-        u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-        u"\U0001F680-\U0001F6FF"  # transport & map symbols
-        u"\U0001F1E0-\U0001F1FF"  # flags
-        u"\U00002702-\U000027B0"
-        u"\U000024C2-\U0001F251"
-        u"\U0001f926-\U0001f937"
-        u"\U00010000-\U0010ffff"
-        u"\u2640-\u2642"
-        u"\u2600-\u2B55"
-        u"\u200d"
-        u"\u23cf"
-        u"\u23e9"
-        u"\u231a"
-        u"\ufe0f"
-        u"\u3030"
-        "]+", flags=re.UNICODE)
-    return emoji_pattern.sub('', text)
+    return EMOJI_PATTERN.sub('', text)
 
 def remove_html_tags(text):
     """Hapus HTML tags"""
-    html_pattern = re.compile(r'<.*?>')
-    return html_pattern.sub('', text)
+    return HTML_PATTERN.sub('', text)
 
 def remove_special_characters(text):
     """Hapus karakter khusus, simpan huruf, angka, dan spasi"""
     # Keep Indonesian characters
-    text = re.sub(r'[^\w\s]', ' ', text)
+    text = SPECIAL_CHAR_PATTERN.sub(' ', text)
     return text
 
 def remove_extra_whitespace(text):
@@ -75,7 +111,7 @@ def remove_extra_whitespace(text):
 def remove_single_characters(text):
     """Hapus karakter tunggal (kecuali 'a' dan 'i' yang bermakna dalam bahasa Indonesia)"""
     words = text.split()
-    words = [w for w in words if len(w) > 1 or w.lower() in ['a', 'i']]
+    words = [w for w in words if len(w) > 1 or w.lower() in KEEP_SINGLE_CHARS]
     return ' '.join(words)
 
 def remove_numbers_only(text):
@@ -85,171 +121,22 @@ def remove_numbers_only(text):
     return ' '.join(words)
 
 def normalize_slang(text):
-    """Normalisasi kata-kata slang/singkatan umum Indonesia"""
-    slang_dict = {
-        # Negasi
-        'gk': 'tidak',
-        'ga': 'tidak',
-        'gak': 'tidak',
-        'tdk': 'tidak',
-        'gx': 'tidak',
-        'ngga': 'tidak',
-        'nggak': 'tidak',
-        'enggak': 'tidak',
-        'kagak': 'tidak',
-        'kaga': 'tidak',
-        # Kata penghubung
-        'yg': 'yang',
-        'dgn': 'dengan',
-        'dg': 'dengan',
-        'utk': 'untuk',
-        'krn': 'karena',
-        'karna': 'karena',
-        'krna': 'karena',
-        # Waktu
-        'sdh': 'sudah',
-        'udh': 'sudah',
-        'udah': 'sudah',
-        'blm': 'belum',
-        'blum': 'belum',
-        'blom': 'belum',
-        'skrg': 'sekarang',
-        'skrng': 'sekarang',
-        'lg': 'lagi',
-        'lgi': 'lagi',
-        # Kata umum
-        'jg': 'juga',
-        'jga': 'juga',
-        'jd': 'jadi',
-        'jdi': 'jadi',
-        'klo': 'kalau',
-        'kalo': 'kalau',
-        'klau': 'kalau',
-        'bs': 'bisa',
-        'bsa': 'bisa',
-        'dr': 'dari',
-        'dri': 'dari',
-        'sm': 'sama',
-        'sma': 'sama',
-        'spt': 'seperti',
-        'sprti': 'seperti',
-        'spy': 'supaya',
-        'biar': 'supaya',
-        'tp': 'tapi',
-        'tpi': 'tapi',
-        # Pronouns
-        'sy': 'saya',
-        'gw': 'saya',
-        'gue': 'saya',
-        'gua': 'saya',
-        'ane': 'saya',
-        'kmu': 'kamu',
-        'lu': 'kamu',
-        'lo': 'kamu',
-        'elu': 'kamu',
-        'ente': 'kamu',
-        # Kata lain
-        'org': 'orang',
-        'orng': 'orang',
-        'ornag': 'orang',
-        'hrs': 'harus',
-        'hrus': 'harus',
-        'dpt': 'dapat',
-        'dpat': 'dapat',
-        'dapet': 'dapat',
-        'msh': 'masih',
-        'msih': 'masih',
-        'emg': 'memang',
-        'emang': 'memang',
-        'mmg': 'memang',
-        'knp': 'kenapa',
-        'knapa': 'kenapa',
-        'gmn': 'bagaimana',
-        'gmna': 'bagaimana',
-        'gimana': 'bagaimana',
-        'dmn': 'dimana',
-        'dmna': 'dimana',
-        'kpn': 'kapan',
-        # Ucapan
-        'thx': 'terima kasih',
-        'tks': 'terima kasih',
-        'thanks': 'terima kasih',
-        'makasih': 'terima kasih',
-        'mksh': 'terima kasih',
-        'makasi': 'terima kasih',
-        'trims': 'terima kasih',
-        'trmksh': 'terima kasih',
-        'ok': 'oke',
-        'okey': 'oke',
-        'okay': 'oke',
-        'oks': 'oke',
-        # Intensifier
-        'bgt': 'banget',
-        'bngt': 'banget',
-        'bngtt': 'banget',
-        'bgtt': 'banget',
-        # Positif expressions
-        'mantap': 'mantap',
-        'mantab': 'mantap',
-        'mantul': 'mantap',
-        'mantep': 'mantap',
-        'keren': 'keren',
-        'josss': 'jos',
-        'joss': 'jos',
-        # Negatif expressions
-        'jelek': 'jelek',
-        'jlek': 'jelek',
-        'parah': 'parah',
-        'ancur': 'hancur',
-        'payah': 'payah',
-        'nyebelin': 'menyebalkan',
-        'sebel': 'kesal',
-        'kesel': 'kesal',
-        # Kata partikel
-        'bkn': 'bukan',
-        'bukn': 'bukan',
-        'aja': 'saja',
-        'doang': 'saja',
-        'doank': 'saja',
-        'nih': 'ini',
-        'tuh': 'itu',
-        'bener': 'benar',
-        'bnr': 'benar',
-        'salh': 'salah',
-        'slh': 'salah',
-        # Aplikasi Gojek - keep as is
-        'aplikasinya': 'aplikasi',
-        'appnya': 'aplikasi',
-        'app': 'aplikasi',
-        'apps': 'aplikasi',
-        'apk': 'aplikasi',
-        'drivernya': 'driver',
-        'drver': 'driver',
-        'drvr': 'driver',
-        'ojol': 'ojek online',
-        # Speed
-        'lelet': 'lambat',
-        'lemot': 'lambat',
-        'cpt': 'cepat',
-        'cpet': 'cepat',
-        'cepet': 'cepat',
-        'lma': 'lama',
-    }
-    
+    """Normalisasi kata-kata slang/singkatan umum Indonesia (SLANG_DICT)"""
     words = text.lower().split()
     normalized = []
     for word in words:
-        if word in slang_dict:
-            if slang_dict[word]:  # Skip empty replacements
-                normalized.append(slang_dict[word])
+        if word in SLANG_DICT:
+            if SLANG_DICT[word]:  # Skip empty replacements
+                normalized.append(SLANG_DICT[word])
         else:
             normalized.append(word)
     
     return ' '.join(normalized)
 
-def clean_text(text):
+def clean_text_stepwise(text):
     """
-    Main cleaning function - gabungan semua tahap cleaning
+    Versi referensi clean_text: 11 tahap terpisah, satu fungsi per tahap.
+    Dipakai benchmark_cleaning.py untuk memastikan clean_text identik.
     """
     if pd.isna(text) or text is None:
         return ""
@@ -291,38 +178,160 @@ def clean_text(text):
     
     return text.strip()
 
+def clean_text(text):
+    """
+    Main cleaning function - profile 'aggressive-normalized' (hasil identik
+    dengan clean_text_stepwise): regex hanya dijalankan jika teks bisa cocok,
+    tahap slang/karakter khusus/angka/karakter tunggal digabung per token
+    """
+    return CLEANING_PROFILE.clean(text)
+
 def is_valid_review(text, min_words=3, min_chars=10):
     """
     Check apakah review valid untuk training
     """
-    if not text or pd.isna(text):
-        return False
+    if type(text) is not str:
+        if not text or pd.isna(text):
+            return False
+        text = str(text)
     
-    text = str(text).strip()
+    text = text.strip()
     
     # Minimal karakter
     if len(text) < min_chars:
         return False
     
-    # Minimal kata
-    if len(text.split()) < min_words:
+    # Minimal kata (cukup split sampai min_words kata pertama)
+    if len(text.split(None, min_words - 1)) < min_words:
         return False
     
     # Bukan hanya angka
-    if text.replace(' ', '').isdigit():
+    chars = text.replace(' ', '')
+    if chars.isdigit():
         return False
     
-    # Bukan hanya repeated characters
-    if len(set(text.replace(' ', ''))) < 3:
+    # Bukan hanya repeated characters (< 3 karakter unik): buang 2 karakter pertama
+    # yang berbeda, sisanya harus kosong
+    rest = chars.replace(chars[0], '') if chars else chars
+    if not rest or not rest.replace(rest[0], ''):
         return False
     
     return True
 
+# Versi config cleaning untuk key CleanCache: berubah otomatis jika profile
+# cleaning (pattern, SLANG_DICT, tahap) atau default is_valid_review berubah.
+# Naikkan CLEANING_REVISION jika logika is_valid_review diubah.
+CLEANING_REVISION = 2
+CLEANING_VERSION = hashlib.blake2b(repr((
+    CLEANING_REVISION,
+    CLEANING_PROFILE.id,
+    is_valid_review.__defaults__,
+)).encode('utf-8'), digest_size=8).hexdigest()
+
+def clean_text_series(series):
+    """
+    clean_text untuk satu kolom (hasil identik dengan .apply(clean_text)):
+    setiap teks unik dibersihkan sekali, setiap token unik diproses sekali
+    """
+    return CLEANING_PROFILE.clean_series(series)
+
+def is_valid_review_series(series, min_words=3, min_chars=10):
+    """is_valid_review untuk satu kolom -> mask boolean (dihitung per teks unik)"""
+    return map_unique(series, lambda text: is_valid_review(text, min_words, min_chars)).astype(bool)
+
+def _clean_and_validate_chunk(texts):
+    """Task worker clean_and_validate: satu chunk teks unik"""
+    cleaned = clean_text_series(texts)
+    return pd.DataFrame({'content_clean': cleaned, 'is_valid': is_valid_review_series(cleaned)})
+
+def _clean_validate_key_chunk(texts, prefix):
+    """_clean_and_validate_chunk + key CleanCache (hashing ikut dibagi ke worker)"""
+    result = _clean_and_validate_chunk(texts)
+    result['key'] = [cache_key(prefix, text) if type(text) is str else None for text in texts]
+    return result
+
+def clean_and_validate(series, workers=CLEAN_WORKERS, chunksize=CLEAN_CHUNK_ROWS, cache=None):
+    """
+    content -> DataFrame [content_clean, is_valid] dengan index & urutan baris
+    yang sama. Teks unik dibagi per chunk; workers > 1 membersihkan chunk di
+    process pool. Hasil identik untuk berapa pun jumlah worker.
+
+    cache (CleanCache): teks yang sudah pernah dibersihkan diambil dari
+    cache, hanya sisanya yang dibersihkan lalu disimpan. Cache kosong (run
+    pertama): tanpa hashing & lookup di proses utama, key dihitung di chunk
+    worker bersama cleaning, lalu satu insert batch.
+    """
+    if cache is None:
+        return map_unique_chunks(series, _clean_and_validate_chunk, workers=workers,
+                                 chunksize=chunksize, min_pool_values=CLEAN_POOL_MIN_UNIQUE)
+
+    def clean_all(texts):
+        fresh = map_unique_chunks(texts, functools.partial(_clean_validate_key_chunk, prefix=cache.prefix),
+                                  workers=workers, chunksize=chunksize,
+                                  min_pool_values=CLEAN_POOL_MIN_UNIQUE)
+        items = [item for item in zip(fresh['key'], fresh['content_clean'], fresh['is_valid'])
+                 if item[0] is not None]
+        cache.misses += len(set(fresh['key'].dropna()))
+        cache.put_many(items)
+        return fresh[['content_clean', 'is_valid']]
+
+    def clean_uncached(texts):
+        if cache.is_empty():
+            return clean_all(texts)
+        keys = [cache.key(text) if type(text) is str else None for text in texts]
+        cached = cache.get_many(key for key in keys if key is not None)
+        missing = [key is None or key not in cached for key in keys]
+        fresh = map_unique_chunks(texts[missing], _clean_and_validate_chunk, workers=workers,
+                                  chunksize=chunksize, min_pool_values=CLEAN_POOL_MIN_UNIQUE)
+        cache.put_many(
+            (key, content_clean, is_valid)
+            for key, content_clean, is_valid in zip(
+                [key for key, miss in zip(keys, missing) if miss],
+                fresh['content_clean'], fresh['is_valid'])
+            if key is not None
+        )
+        result = pd.DataFrame([cached.get(key, (None, False)) for key in keys], index=texts.index,
+                              columns=['content_clean', 'is_valid'])
+        result.loc[fresh.index] = fresh
+        return result.astype({'is_valid': bool})
+
+    # Satu chunk berisi semua teks unik: lookup cache (jika tidak kosong) di proses
+    # utama, cleaning teks yang belum ada di cache tetap dibagi ke worker
+    return map_unique_chunks(series, clean_uncached, workers=1, chunksize=max(1, len(series) + 1))
+
 # =====================================================
 # MAIN CLEANING PROCESS
 # =====================================================
 
-def clean_dataset(input_path, output_path, dataset_name):
+def load_input(input_path, source=INPUT_SOURCE, store_dataset=None, store_view='reviews_3class'):
+    """
+    Load dataset dari sumber yang dipilih secara eksplisit:
+    - 'csv': input_path
+    - 'store': dataset balanced `store_dataset` di ReviewStore (urutan
+      dataset dipertahankan); error jika store / dataset belum ada
+    Return (df, deskripsi sumber).
+    """
+    if source == 'csv':
+        return pd.read_csv(input_path), f'csv: {input_path}'
+    if source != 'store':
+        raise ValueError(f"source harus 'csv' atau 'store', bukan {source!r}")
+    if not store_dataset:
+        raise ValueError('source=store butuh store_dataset')
+    if not os.path.exists(REVIEW_STORE_PATH):
+        raise FileNotFoundError(f'{REVIEW_STORE_PATH} tidak ada: jalankan scrape_balanced_reviews.py, '
+                                f'import CSV lama (review_store.py import <csv> --dataset {store_dataset}), '
+                                f'atau pakai --source csv')
+    with ReviewStore(REVIEW_STORE_PATH) as store:
+        df = store.query(view=store_view, dataset=store_dataset, columns=STORE_COLUMNS)
+    if not len(df):
+        raise ValueError(f'Dataset {store_dataset!r} kosong / tidak ada di {REVIEW_STORE_PATH} '
+                         f'(review_store.py import <csv> --dataset {store_dataset})')
+    return df, f'store: {REVIEW_STORE_PATH} [{store_dataset}]'
+
+def clean_dataset(input_path, output_path, dataset_name, source=INPUT_SOURCE, store_dataset=None,
+                  store_view='reviews_3class', workers=CLEAN_WORKERS, cache=None,
+                  near_dedup_threshold=NEAR_DEDUP_THRESHOLD, near_dedup_by=NEAR_DEDUP_BY,
+                  balance_key=BALANCE_HASH_KEY):
     """
     Clean dataset dan simpan hasilnya
     """
@@ -331,40 +340,47 @@ def clean_dataset(input_path, output_path, dataset_name):
     print(f'{"="*60}')
     
     # Load data
-    print(f'\n📂 Loading: {input_path}')
-    df = pd.read_csv(input_path)
+    df, source_name = load_input(input_path, source, store_dataset, store_view)
+    print(f'\n📂 Loading ({source_name})')
     original_count = len(df)
     print(f'   Original rows: {original_count:,}')
+    if balance_key is not None and balance_key not in df.columns:
+        raise ValueError(f'Kolom balance hash {balance_key!r} tidak ada di input ({source_name}); '
+                         f'kolom tersedia: {df.columns.tolist()}')
     
     # Show sample before cleaning
     print(f'\n📝 Sample BEFORE cleaning:')
     for i, row in df.head(3).iterrows():
         print(f'   [{row["sentiment"]}] {row["content"][:80]}...')
     
-    # Step 1: Clean text
-    print(f'\n🔄 Step 1: Cleaning text...')
-    df['content_clean'] = df['content'].apply(clean_text)
-    
-    # Step 2: Remove invalid reviews
-    print(f'🔄 Step 2: Removing invalid reviews...')
-    df['is_valid'] = df['content_clean'].apply(is_valid_review)
-    invalid_count = len(df[~df['is_valid']])
-    df = df[df['is_valid']].drop(columns=['is_valid'])
-    print(f'   Removed {invalid_count:,} invalid reviews')
-    
-    # Step 3: Remove duplicates
-    print(f'🔄 Step 3: Removing duplicates...')
-    before_dedup = len(df)
-    df = df.drop_duplicates(subset=['content_clean'])
-    dup_count = before_dedup - len(df)
-    print(f'   Removed {dup_count:,} duplicates')
-    
-    # Step 4: Remove empty content_clean
-    print(f'🔄 Step 4: Removing empty content...')
-    before_empty = len(df)
-    df = df[df['content_clean'].str.len() > 0]
-    empty_count = before_empty - len(df)
-    print(f'   Removed {empty_count:,} empty reviews')
+    # Step 1: Clean text (+ flag validasi, dihitung sekalian per chunk)
+    print(f'\n🔄 Step 1: Cleaning text (maks {workers} worker)...')
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    cleaned = clean_and_validate(df['content'], workers=workers, cache=cache)
+    if cache is not None:
+        print(f'   Cache: {cache.hits - hits:,} teks dari cache, '
+              f'{cache.misses - misses:,} baru dibersihkan')
+    df['content_clean'] = cleaned['content_clean']
+    
+    # Step 2: Filter dalam satu pass (bitmask alasan drop), materialisasi sekali
+    print(f'🔄 Step 2: Removing invalid, duplicate & empty reviews...')
+    is_valid = cleaned['is_valid'].to_numpy()
+    rows = (RowFilter()
+            .add('invalid', lambda d, alive: ~is_valid, 'invalid reviews')
+            .add('duplicate', duplicated('content_clean'), 'duplicates'))
+    if near_dedup_threshold:
+        # Beda satu-dua kata / tanda baca (MinHash/LSH), hanya di antara review berlabel sama
+        if near_dedup_by in df.columns:
+            near_dup = among_alive(['content_clean', near_dedup_by], lambda values: near_duplicated(
+                values['content_clean'], near_dedup_threshold, by=values[near_dedup_by]))
+        else:
+            near_dup = among_alive('content_clean', lambda values: near_duplicated(values, near_dedup_threshold))
+        rows.add('near_duplicate', near_dup, f'near-duplicates (Jaccard >= {near_dedup_threshold})')
+    rows.add('empty', lambda d, alive: ~(d['content_clean'].str.len() > 0), 'empty reviews')
+    df, filter_stats = rows.apply(df)
+    for rule in filter_stats.itertuples():
+        print(f'   Removed {rule.dropped:,} {rule.description}')
+    filter_stats.to_csv(os.path.splitext(output_path)[0] + '_filter_stats.csv', index=False)
     
     # Show sample after cleaning
     print(f'\n📝 Sample AFTER cleaning:')
@@ -379,16 +395,12 @@ def clean_dataset(input_path, output_path, dataset_name):
         print(f'   {sentiment}: {count:,} ({pct:.1f}%)')
     
     # Balance data (undersample to min class)
-    print(f'\n⚖️ Balancing data...')
-    min_count = dist.min()
-    balanced_dfs = []
-    for sentiment in dist.index:
-        df_class = df[df['sentiment'] == sentiment]
-        df_sampled = df_class.sample(n=min_count, random_state=42)
-        balanced_dfs.append(df_sampled)
-    
-    df_balanced = pd.concat(balanced_dfs, ignore_index=True)
-    df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+    if balance_key is not None:
+        print(f'\n⚖️ Balancing data (bottom-k hash {balance_key})...')
+        df_balanced = balance_by_hash(df, 'sentiment', key=balance_key, classes=dist.index, target='min')
+    else:
+        print(f'\n⚖️ Balancing data...')
+        df_balanced = balance(df, 'sentiment', classes=dist.index, target='min', seed=42)
     
     print(f'\n📊 Final balanced distribution:')
     for sentiment, count in df_balanced['sentiment'].value_counts().items():
@@ -408,25 +420,181 @@ def clean_dataset(input_path, output_path, dataset_name):
     
     return df_balanced
 
+def clean_dataset_streaming(input_path, output_path, dataset_name, chunksize=STREAM_CHUNK_ROWS,
+                            max_per_class=STREAM_MAX_PER_CLASS, workers=CLEAN_WORKERS, cache=None,
+                            seen_path=STREAM_SEEN_PATH, seed=42):
+    """
+    Clean dataset per chunk (pd.read_csv chunksize) dan simpan hasilnya.
+    Memori puncak = satu chunk + reservoir per kelas (+ set hash dedup jika
+    seen_path=None), tidak bergantung pada ukuran input:
+    - clean & validasi per chunk (clean_and_validate, cache ikut dipakai)
+    - dedup exact lintas chunk lewat SeenSet (near-dedup tidak dijalankan)
+    - balancing: reservoir sampling per kelas, lalu semua kelas diambil
+      sebanyak kelas terkecil (maksimal max_per_class)
+    """
+    print(f'\n{"="*60}')
+    print(f'🧹 CLEANING (STREAMING): {dataset_name}')
+    print(f'{"="*60}')
+    print(f'\n📂 Streaming: {input_path} ({chunksize:,} baris per chunk)')
+    
+    original_count = invalid_count = dup_count = 0
+    reservoirs = {}
+    with SeenSet(seen_path) as seen:
+        for number, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize), start=1):
+            original_count += len(chunk)
+            
+            # Clean + validasi (konten kosong ikut dibuang)
+            cleaned = clean_and_validate(chunk['content'], workers=workers, cache=cache)
+            chunk = chunk.assign(content_clean=cleaned['content_clean'])
+            keep = cleaned['is_valid'] & (chunk['content_clean'].str.len() > 0)
+            invalid_count += int((~keep).sum())
+            chunk = chunk[keep.to_numpy()]
+            
+            # Dedup lintas chunk
+            fresh = seen.add_new(chunk['content_clean'])
+            dup_count += int((~fresh).sum())
+            chunk = chunk[fresh]
+            
+            for sentiment, rows in chunk.groupby('sentiment', sort=False):
+                if sentiment not in reservoirs:
+                    reservoirs[sentiment] = ReservoirSampler(max_per_class, seed=seed + len(reservoirs))
+                reservoirs[sentiment].add(rows)
+            print(f'   Chunk {number}: {original_count:,} baris dibaca, '
+                  f'{sum(r.seen for r in reservoirs.values()):,} lolos')
+    
+    print(f'   Removed {invalid_count:,} invalid/empty reviews')
+    print(f'   Removed {dup_count:,} duplicates')
+    if not reservoirs:
+        print('❌ Tidak ada review yang lolos cleaning!')
+        return pd.DataFrame()
+    
+    # Distribution check (semua baris yang lolos, bukan hanya isi reservoir)
+    clean_count = sum(r.seen for r in reservoirs.values())
+    print(f'\n📊 Distribution after cleaning:')
+    for sentiment, reservoir in reservoirs.items():
+        print(f'   {sentiment}: {reservoir.seen:,} ({reservoir.seen / clean_count * 100:.1f}%)')
+    
+    # Balance data (reservoir per kelas -> ukuran kelas terkecil)
+    print(f'\n⚖️ Balancing data...')
+    target = min(min(r.seen for r in reservoirs.values()), max_per_class)
+    df_balanced = pd.concat([r.sample(target, random_state=seed) for r in reservoirs.values()],
+                            ignore_index=True)
+    df_balanced = df_balanced.sample(frac=1, random_state=seed).reset_index(drop=True)
+    
+    print(f'\n📊 Final balanced distribution:')
+    for sentiment, count in df_balanced['sentiment'].value_counts().items():
+        pct = count / len(df_balanced) * 100
+        print(f'   {sentiment}: {count:,} ({pct:.1f}%)')
+    
+    # Save
+    print(f'\n💾 Saving: {output_path}')
+    df_balanced.to_csv(output_path, index=False)
+    
+    # Summary
+    print(f'\n📊 SUMMARY:')
+    print(f'   Original: {original_count:,}')
+    print(f'   After cleaning: {clean_count:,}')
+    print(f'   After balancing: {len(df_balanced):,}')
+    print(f'   Reduction: {(1 - len(df_balanced)/original_count)*100:.1f}%')
+    
+    return df_balanced
+
+def clean_file(input_path, output_path, dataset_name, source=INPUT_SOURCE, store_dataset=None,
+               store_view='reviews_3class'):
+    """
+    Clean satu dataset dengan CleanCache sendiri (satu stage pipeline.py;
+    3-class & 5-class bisa jalan paralel di proses terpisah, cache SQLite WAL)
+    """
+    if STREAMING and source != 'csv':
+        raise ValueError('Mode STREAMING hanya membaca CSV (source=csv)')
+    cache = None
+    if USE_CLEAN_CACHE:
+        cache = CleanCache(CLEAN_CACHE_PATH, version=CLEANING_VERSION,
+                           max_entries=CLEAN_CACHE_MAX_ENTRIES)
+    try:
+        # CLEAN_WORKERS dibaca saat dipanggil: pipeline.py meng-override-nya per stage
+        if STREAMING:
+            return clean_dataset_streaming(input_path, output_path, dataset_name,
+                                           workers=CLEAN_WORKERS, cache=cache)
+        return clean_dataset(input_path, output_path, dataset_name, source=source,
+                             store_dataset=store_dataset, store_view=store_view,
+                             workers=CLEAN_WORKERS, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Cleaning data review untuk training IndoBERT')
+    parser.add_argument('--source', choices=['csv', 'store'], default=INPUT_SOURCE,
+                        help=f'Sumber input: dataset di {REVIEW_STORE_PATH} (default) atau CSV *_raw_balanced.csv')
+    parser.add_argument('--balance-hash-key', default=BALANCE_HASH_KEY,
+                        help='Opt-in balancing bottom-k hash per kelas berdasarkan kolom ini '
+                             '(mis. review_id); default sample(random_state=42)')
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    source = args.source
+    if STREAMING and source != 'csv':
+        raise ValueError('Mode STREAMING hanya membaca CSV (--source csv)')
+    if STREAMING and args.balance_hash_key:
+        raise ValueError('Mode STREAMING memakai reservoir sampling, tanpa --balance-hash-key')
     print('\n' + '='*60)
     print('🧹 DATA CLEANING FOR INDOBERT TRAINING')
     print('='*60)
     print(f'Started: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
-    
-    # Clean 3-class data
-    df_3class = clean_dataset(
-        input_path='data/gojek_reviews_3class_raw_balanced.csv',
-        output_path='data/gojek_reviews_3class_clean.csv',
-        dataset_name='3-Class Dataset'
-    )
-    
-    # Clean 5-class data
-    df_5class = clean_dataset(
-        input_path='data/gojek_reviews_5class_raw_balanced.csv',
-        output_path='data/gojek_reviews_5class_clean.csv',
-        dataset_name='5-Class Dataset'
-    )
+    print(f'Profile: {CLEANING_PROFILE.id}')
+    print(f'Source: {source}')
+    print(f'Balancing: {"bottom-k hash " + args.balance_hash_key if args.balance_hash_key else "sample(random_state=42)"}')
+    
+    # Satu cache untuk kedua dataset (3-class & 5-class berasal dari review yang sama)
+    cache = None
+    if USE_CLEAN_CACHE:
+        cache = CleanCache(CLEAN_CACHE_PATH, version=CLEANING_VERSION,
+                           max_entries=CLEAN_CACHE_MAX_ENTRIES)
+    
+    try:
+        if STREAMING:
+            # CSV dibaca per chunk (tanpa ReviewStore), memori terbatas
+            df_3class = clean_dataset_streaming(
+                input_path='data/gojek_reviews_3class_raw_balanced.csv',
+                output_path='data/gojek_reviews_3class_clean.csv',
+                dataset_name='3-Class Dataset',
+                cache=cache
+            )
+            df_5class = clean_dataset_streaming(
+                input_path='data/gojek_reviews_5class_raw_balanced.csv',
+                output_path='data/gojek_reviews_5class_clean.csv',
+                dataset_name='5-Class Dataset',
+                cache=cache
+            )
+        else:
+            # Clean 3-class data
+            df_3class = clean_dataset(
+                input_path='data/gojek_reviews_3class_raw_balanced.csv',
+                output_path='data/gojek_reviews_3class_clean.csv',
+                dataset_name='3-Class Dataset',
+                source=source,
+                store_dataset='3class_raw_balanced',
+                store_view='reviews_3class',
+                cache=cache,
+                balance_key=args.balance_hash_key
+            )
+            
+            # Clean 5-class data
+            df_5class = clean_dataset(
+                input_path='data/gojek_reviews_5class_raw_balanced.csv',
+                output_path='data/gojek_reviews_5class_clean.csv',
+                dataset_name='5-Class Dataset',
+                source=source,
+                store_dataset='5class_raw_balanced',
+                store_view='reviews_5class',
+                cache=cache,
+                balance_key=args.balance_hash_key
+            )
+    finally:
+        if cache is not None:
+            cache.close()
     
     # Final summary
     print('\n' + '='*60)
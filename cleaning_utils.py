@@ -0,0 +1,98 @@
+"""
+Utilitas bersama untuk cleaning teks per kolom (bukan per baris)
+
+Berisi:
+- map_unique: jalankan fungsi per baris hanya sekali untuk setiap nilai unik
+  di kolom (pd.factorize), lalu sebar hasilnya kembali ke semua baris
+- map_unique_chunks: sama, tetapi per chunk nilai unik dan opsional paralel
+  di process pool (urutan baris tetap sama dengan input)
+- estimate_unique_ratio: perkiraan nunique/len dari sampel; kolom yang hampir
+  semuanya unik tidak di-factorize (factorize + sebar balik lebih mahal
+  daripada pemanggilan fn yang dihemat)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype
+
+CHUNK_ROWS = 50000  # Nilai unik per chunk (per task worker)
+UNIQUE_SAMPLE_ROWS = 10000  # Ukuran sampel untuk perkiraan rasio nilai unik
+MAX_UNIQUE_RATIO = 0.9      # Di atas rasio ini factorize dilewati (fn dipanggil per baris)
+
+def estimate_unique_ratio(series, sample_rows=UNIQUE_SAMPLE_ROWS):
+    """
+    Perkiraan nunique/len tanpa factorize seluruh kolom: sampel berjarak tetap,
+    jumlah nilai berbeda D diperkirakan dari tabrakan di sampel (birthday
+    bound, m^2 / 2 * duplikat). Kolom <= sample_rows dihitung persis.
+    """
+    n = len(series)
+    if n == 0:
+        return 1.0
+    sample = series.iloc[::max(1, n // sample_rows)].iloc[:sample_rows]
+    m = len(sample)
+    duplicates = m - sample.nunique(dropna=False)
+    if m == n:
+        return (m - duplicates) / n
+    if duplicates == 0:
+        return 1.0
+    return min(1.0, m * m / (2 * duplicates) / n)
+
+def map_unique(series, fn):
+    """
+    Setara series.map(fn) (NaN/None ikut dipanggil ke fn), tetapi fn hanya
+    dipanggil sekali per nilai unik. Review duplikat ("mantap", "ok",
+    copy-paste) sering muncul, jadi pekerjaan per baris turun banyak.
+
+    Hanya kolom string (boleh ada NaN) yang di-factorize; kolom campuran
+    memakai series.map biasa karena factorize menyamakan 1, 1.0, dan True.
+    Kolom yang hampir semuanya unik (> MAX_UNIQUE_RATIO) juga memakai
+    series.map: hampir tidak ada pemanggilan fn yang bisa dihemat.
+    """
+    series = pd.Series(series)
+    if infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        return series.map(fn)
+    if estimate_unique_ratio(series) > MAX_UNIQUE_RATIO:
+        return series.map(fn)
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    results = [fn(value) for value in uniques]
+    results.append(fn(np.nan))  # posisi terakhir untuk kode NaN (-1)
+    values = pd.Series(results).to_numpy()
+    return pd.Series(values[codes], index=series.index, name=series.name)
+
+def map_unique_chunks(series, chunk_fn, workers=1, chunksize=CHUNK_ROWS, min_pool_values=0):
+    """
+    chunk_fn(Series nilai unik) -> DataFrame dengan satu baris per nilai
+    (urutan sama). Nilai unik dibagi ke chunk berurutan; workers > 1
+    menjalankan chunk di ProcessPoolExecutor (chunk_fn harus fungsi level
+    modul agar bisa di-pickle), tetapi hanya jika jumlah nilai unik >=
+    min_pool_values (di bawahnya start process lebih mahal dari hematnya).
+    Hasil: DataFrame dengan index `series`, baris ke-i = hasil untuk series.iloc[i].
+    """
+    series = pd.Series(series)
+    if (infer_dtype(series, skipna=True) in ('string', 'empty')
+            and estimate_unique_ratio(series) <= MAX_UNIQUE_RATIO):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        values = pd.Series(list(uniques) + [np.nan], dtype=object)  # kode NaN (-1) -> terakhir
+    else:
+        codes = np.arange(len(series))
+        values = series.reset_index(drop=True)
+
+    workers = max(1, int(workers or 1))
+    if len(values) < min_pool_values:
+        workers = 1
+    size = max(1, min(chunksize, math.ceil(len(values) / workers)))
+    # Kolom kosong tetap satu chunk (kosong) agar hasil punya kolom dari chunk_fn
+    chunks = [values.iloc[start:start + size] for start in range(0, len(values), size)] or [values]
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            frames = list(pool.map(chunk_fn, chunks))
+    else:
+        frames = [chunk_fn(chunk) for chunk in chunks]
+
+    result = pd.concat(frames, ignore_index=True).take(codes)
+    result.index = series.index
+    return result
@@ -0,0 +1,279 @@
+"""
+Stand-in offline untuk google_play_scraper.reviews()
+
+Dipakai untuk benchmark & regression test scraper tanpa menyentuh Play Store:
+- SyntheticPlayStore: halaman review sintetis (deterministik per seed) dengan
+  latency, error rate, dan distribusi rating yang bisa diatur
+- ReplayPlayStore: memutar ulang halaman yang pernah direkam (JSONL)
+- record_pages: rekam halaman asli dari Play Store ke JSONL untuk replay
+- use_store: context manager yang mengganti reviews() di scraping_utils
+
+Signature store.reviews() sama dengan google_play_scraper.reviews():
+return (result, continuation_token), mendukung filter_score_with, dan
+continuation_token.token = None menandakan halaman terakhir.
+
+Rekam halaman asli:
+    python fake_play_store.py --app com.gojek.app --pages 10 --scores 1 2 3 4 5
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import argparse
+import json
+import os
+import random
+import threading
+import time
+
+from google_play_scraper import Sort
+from google_play_scraper.features.reviews import _ContinuationToken
+
+import scraping_utils
+from scraping_utils import _encode_review, _decode_review
+
+# =====================================================
+# KONFIGURASI DEFAULT
+# =====================================================
+REPLAY_PATH = 'data/replay/play_store_pages.jsonl'
+DEFAULT_RATING_WEIGHTS = (0.30, 0.08, 0.07, 0.10, 0.45)  # rating 1..5, mirip distribusi asli
+
+# Potongan kalimat per sentimen untuk content sintetis
+_PHRASES = {
+    'negative': ['driver lama banget', 'aplikasi sering error', 'saldo gopay hilang',
+                 'cs tidak membantu', 'order dibatalkan terus', 'tarif mahal sekali',
+                 'gak bisa login', 'kecewa sama pelayanannya'],
+    'neutral': ['lumayan lah', 'kadang cepat kadang lama', 'biasa aja sih',
+                'semoga kedepannya lebih baik', 'cukup membantu tapi masih ada bug',
+                'harga standar'],
+    'positive': ['mantap drivernya ramah', 'sangat membantu', 'pelayanan cepat',
+                 'aplikasi terbaik', 'promo banyak', 'recommended banget',
+                 'makanan sampai tepat waktu', 'terima kasih gojek'],
+}
+_FILLERS = ['kemarin', 'tadi pagi', 'di jakarta', 'pas hujan', 'jam sibuk', 'udah dua kali',
+            'padahal', 'pokoknya', 'gofood', 'goride', 'gocar', 'gosend', 'promo', 'ongkir',
+            'voucher', 'rating', 'update terbaru', 'akun saya', 'min', 'tolong', 'banget',
+            'sekali', 'juga', 'tapi', 'terus', 'lagi', 'aja', 'sih', 'deh', 'kok']
+_APP_VERSIONS = ['4.80.1', '4.81.0', '4.82.2', '4.83.0', None]
+
+class PlayStoreError(Exception):
+    """Error sintetis (mensimulasikan timeout / HTTP 429 / 5xx)"""
+
+# =====================================================
+# BASE STORE
+# =====================================================
+class FakePlayStore:
+    """
+    Dasar stand-in reviews(): latency, error injection, dan statistik.
+    Subclass mengimplementasikan _fetch(key, offset, count).
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=42):
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.pages = 0
+        self.reviews_served = 0
+        self.errors = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls = self.pages = self.reviews_served = self.errors = 0
+
+    def stats(self):
+        with self._lock:
+            return {'calls': self.calls, 'pages': self.pages,
+                    'reviews': self.reviews_served, 'errors': self.errors}
+
+    def reviews(self, app_id, lang='en', country='us', sort=Sort.NEWEST, count=100,
+                filter_score_with=None, filter_device_with=None, continuation_token=None):
+        sort = sort.value
+        if continuation_token is not None:
+            if continuation_token.token is None:
+                return [], continuation_token
+            lang = continuation_token.lang
+            country = continuation_token.country
+            sort = continuation_token.sort
+            count = continuation_token.count
+            filter_score_with = continuation_token.filter_score_with
+            filter_device_with = continuation_token.filter_device_with
+            offset = int(continuation_token.token)
+        else:
+            offset = 0
+
+        with self._lock:
+            self.calls += 1
+            delay = self.latency * self._rng.uniform(0.5, 1.5) if self.latency else 0
+            failed = self.error_rate and self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            with self._lock:
+                self.errors += 1
+            raise PlayStoreError(f'synthetic error for {app_id} (offset {offset})')
+
+        result, next_offset = self._fetch((app_id, lang, country, filter_score_with), offset, count)
+        with self._lock:
+            self.pages += 1
+            self.reviews_served += len(result)
+        token = None if next_offset is None else str(next_offset)
+        return result, _ContinuationToken(token, lang, country, sort, count,
+                                          filter_score_with, filter_device_with)
+
+    def _fetch(self, key, offset, count):
+        raise NotImplementedError
+
+# =====================================================
+# SYNTHETIC STORE
+# =====================================================
+class SyntheticPlayStore(FakePlayStore):
+    """
+    Review sintetis deterministik. Setiap (app, lang, country) punya
+    `reviews_per_app` review berurutan Sort.NEWEST; rating diambil dari
+    `rating_weights` (skew rating 1..5). filter_score_with memilih
+    subsequence dengan rating tersebut.
+    """
+
+    def __init__(self, reviews_per_app=20000, rating_weights=DEFAULT_RATING_WEIGHTS,
+                 latency=0.0, error_rate=0.0, seed=42, newest=datetime(2025, 1, 1)):
+        super().__init__(latency=latency, error_rate=error_rate, seed=seed)
+        self.reviews_per_app = reviews_per_app
+        self.rating_weights = rating_weights
+        self.seed = seed
+        self.newest = newest
+        self._streams = {}
+
+    def _stream(self, app_id, lang, country, score):
+        """Posisi review (indeks global) untuk satu stream, di-cache"""
+        key = (app_id, lang, country, score)
+        with self._lock:
+            if key not in self._streams:
+                base = (app_id, lang, country, None)
+                if base not in self._streams:
+                    rng = random.Random(f'{self.seed}-{app_id}-{lang}-{country}')
+                    self._streams[base] = rng.choices([1, 2, 3, 4, 5], weights=self.rating_weights,
+                                                      k=self.reviews_per_app)
+                if score is not None:
+                    ratings = self._streams[base]
+                    self._streams[key] = [i for i, r in enumerate(ratings) if r == score]
+            return self._streams[key]
+
+    def _review(self, app_id, lang, country, position, score):
+        rng = random.Random(f'{self.seed}-{app_id}-{lang}-{country}-{position}')
+        sentiment = 'negative' if score <= 2 else 'neutral' if score == 3 else 'positive'
+        phrases = rng.sample(_PHRASES[sentiment], k=rng.randint(1, 3))
+        fillers = rng.sample(_FILLERS, k=rng.randint(0, 5))
+        content = ' '.join([', '.join(phrases)] + fillers)
+        if rng.random() < 0.2:
+            content = content.upper() + '!!!'
+        at = self.newest - timedelta(minutes=position * 7 + rng.randint(0, 6))
+        replied = rng.random() < 0.15
+        return {
+            'reviewId': f'{app_id}-{lang}-{country}-{position:08d}',
+            'userName': f'Pengguna {rng.randint(1, 5000)}',
+            'userImage': 'https://play-lh.googleusercontent.com/a/default-user',
+            'content': content,
+            'score': score,
+            'thumbsUpCount': rng.randint(0, 30) if rng.random() < 0.3 else 0,
+            'reviewCreatedVersion': rng.choice(_APP_VERSIONS),
+            'at': at,
+            'replyContent': 'Hai Kak, mohon maaf atas ketidaknyamanannya.' if replied else None,
+            'repliedAt': at + timedelta(hours=2) if replied else None,
+            'appVersion': None,
+        }
+
+    def _fetch(self, key, offset, count):
+        app_id, lang, country, score = key
+        ratings = self._stream(app_id, lang, country, None)
+        positions = range(len(ratings)) if score is None else self._stream(app_id, lang, country, score)
+        end = min(offset + count, len(positions))
+        result = [self._review(app_id, lang, country, p, ratings[p]) for p in positions[offset:end]]
+        return result, (end if end < len(positions) else None)
+
+# =====================================================
+# REPLAY STORE
+# =====================================================
+class ReplayPlayStore(FakePlayStore):
+    """
+    Putar ulang halaman hasil record_pages(). Satu baris JSONL = satu halaman:
+    {"app_id", "lang", "country", "score", "page", "reviews": [...]}.
+    Ukuran halaman mengikuti rekaman (parameter count diabaikan).
+    """
+
+    def __init__(self, path=REPLAY_PATH, latency=0.0, error_rate=0.0, seed=42):
+        super().__init__(latency=latency, error_rate=error_rate, seed=seed)
+        self.path = path
+        self._pages = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                page = json.loads(line)
+                key = (page['app_id'], page['lang'], page['country'], page['score'])
+                reviews_data = [_decode_review(json.dumps(r)) for r in page['reviews']]
+                self._pages.setdefault(key, []).append((page['page'], reviews_data))
+        for pages in self._pages.values():
+            pages.sort(key=lambda item: item[0])
+
+    def _fetch(self, key, offset, count):
+        pages = self._pages.get(key, [])
+        if offset >= len(pages):
+            return [], None
+        next_offset = offset + 1
+        return list(pages[offset][1]), (next_offset if next_offset < len(pages) else None)
+
+# =====================================================
+# RECORD & INSTALL
+# =====================================================
+def record_pages(app_id, path=REPLAY_PATH, lang='id', country='id', scores=(None,), pages=5,
+                 count=200, delay=1.0):
+    """Rekam halaman asli dari Play Store (Sort.NEWEST) ke JSONL untuk ReplayPlayStore"""
+    from google_play_scraper import reviews
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    total = 0
+    with open(path, 'a', encoding='utf-8') as f:
+        for score in scores:
+            token = None
+            for page in range(pages):
+                result, token = reviews(app_id, lang=lang, country=country, sort=Sort.NEWEST,
+                                        count=count, filter_score_with=score,
+                                        continuation_token=token)
+                row = {'app_id': app_id, 'lang': lang, 'country': country, 'score': score,
+                       'page': page, 'reviews': [json.loads(_encode_review(r)) for r in result]}
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                total += len(result)
+                print(f'   📥 rating {score or "all"} page {page}: {len(result)} reviews')
+                if not result or token is None or token.token is None:
+                    break
+                time.sleep(delay)
+    print(f'✅ Recorded {total:,} reviews -> {path}')
+    return total
+
+@contextmanager
+def use_store(store):
+    """Ganti reviews() yang dipakai semua scraper (via scraping_utils) selama blok with"""
+    original = scraping_utils.reviews
+    scraping_utils.reviews = store.reviews
+    try:
+        yield store
+    finally:
+        scraping_utils.reviews = original
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Rekam halaman review Play Store untuk replay offline')
+    parser.add_argument('--app', default='com.gojek.app')
+    parser.add_argument('--lang', default='id')
+    parser.add_argument('--country', default='id')
+    parser.add_argument('--scores', nargs='*', type=int, default=None,
+                        help='Filter rating yang direkam (kosong = tanpa filter)')
+    parser.add_argument('--pages', type=int, default=5, help='Halaman per rating')
+    parser.add_argument('--count', type=int, default=200, help='Review per halaman')
+    parser.add_argument('--out', default=REPLAY_PATH)
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    record_pages(args.app, path=args.out, lang=args.lang, country=args.country,
+                 scores=args.scores or (None,), pages=args.pages, count=args.count)
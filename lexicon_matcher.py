@@ -0,0 +1,105 @@
+"""
+Pencocokan leksikon sentiment dengan automaton Aho-Corasick
+
+Satu automaton dibangun untuk semua kategori leksikon (mis. very_negative,
+negative, positive, very_positive), lalu setiap teks cukup di-scan sekali
+(satu transisi per karakter) untuk menemukan semua entry yang muncul.
+
+Semantik sama persis dengan pola lama per kategori:
+    sum(1 for word in WORDS if word in text)
+yaitu substring (bukan per kata), setiap entry dihitung maksimal sekali
+per teks, dan entry yang tercantum dua kali di satu list dihitung dua kali.
+Matcher tidak melakukan lowercase; teks dikirim sudah dalam bentuk yang
+sama dengan pola lama (biasanya str(text).lower()).
+
+Contoh:
+    matcher = LexiconMatcher({'negative': NEGATIVE_WORDS, 'positive': POSITIVE_WORDS})
+    matcher.counts('aplikasi bagus tapi lemot')   # (1, 1)
+    matcher.count_dict('aplikasi bagus')           # {'negative': 0, 'positive': 1}
+"""
+
+from collections import deque
+
+import numpy as np
+
+class LexiconMatcher:
+    """Automaton Aho-Corasick atas semua entry leksikon, hitungan per kategori"""
+
+    def __init__(self, lexicons):
+        self.categories = tuple(lexicons)
+        self.entries = []    # entry unik (teks)
+        weights = {}         # entry -> hitungan per kategori (kelipatan jika duplikat)
+        self._always = [0] * len(self.categories)  # entry '' selalu cocok
+        for column, category in enumerate(self.categories):
+            for word in lexicons[category]:
+                if not word:
+                    self._always[column] += 1
+                    continue
+                if word not in weights:
+                    weights[word] = [0] * len(self.categories)
+                    self.entries.append(word)
+                weights[word][column] += 1
+        self._weights = [tuple(weights[word]) for word in self.entries]
+        self._build()
+
+    def _build(self):
+        """Trie (goto) + failure link, lalu diratakan menjadi tabel transisi DFA"""
+        goto = [{}]
+        output = [[]]
+        for entry_id, word in enumerate(self.entries):
+            state = 0
+            for char in word:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state].append(entry_id)
+
+        # BFS: failure link & output gabungan, transisi lengkap tiap state
+        # (karakter di luar alfabet leksikon selalu kembali ke state 0)
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = delta[fail[state]]
+            output[state].extend(output[fail[state]])
+            for char, child in goto[state].items():
+                fail[child] = fallback.get(char, 0)
+                queue.append(child)
+            delta[state] = {**fallback, **goto[state]}
+
+        self._delta = delta
+        self._output = [tuple(entries) for entries in output]
+
+    def find(self, text):
+        """Set id entry (indeks self.entries) yang muncul di `text`, satu pass"""
+        delta = self._delta
+        output = self._output
+        found = set()
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def counts(self, text):
+        """Tuple jumlah entry yang muncul per kategori (urutan self.categories)"""
+        counts = list(self._always)
+        for entry_id in self.find(text):
+            for column, weight in enumerate(self._weights[entry_id]):
+                counts[column] += weight
+        return tuple(counts)
+
+    def count_dict(self, text):
+        """{kategori: jumlah entry yang muncul}"""
+        return dict(zip(self.categories, self.counts(text)))
+
+    def count_matrix(self, texts):
+        """Matriks int32 (len(texts), jumlah kategori) untuk banyak teks"""
+        counts = self.counts
+        matrix = np.array([counts(text) for text in texts], dtype=np.int32)
+        return matrix.reshape(len(matrix), len(self.categories))
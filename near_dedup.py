@@ -0,0 +1,203 @@
+"""
+Deteksi near-duplicate review dengan MinHash + LSH banding
+
+drop_duplicates(subset=['content_clean']) hanya membuang teks yang sama
+persis. Review yang beda satu kata, atau varian Augmenter (augmentation.py:
+swap/deletion dari kalimat yang sama), tetap lolos. Modul ini menandai
+pasangan dengan Jaccard similarity (himpunan shingle kata) >= threshold tanpa
+membandingkan semua pasangan:
+
+1. Shingling: setiap teks -> himpunan n-gram kata (SHINGLE_SIZE), diberi id
+   integer lewat satu vocabulary bersama
+2. MinHash: NUM_PERM fungsi hash multiply-shift, minimum per teks ->
+   signature (n, NUM_PERM) uint32, dihitung per chunk dengan NumPy
+3. LSH banding: signature dipotong menjadi `bands` band x `rows` baris; teks
+   dengan band identik masuk bucket yang sama (kandidat)
+4. Verifikasi: kandidat dipertahankan jika estimasi Jaccard (fraksi
+   posisi signature yang sama) >= threshold
+5. Cluster: komponen terhubung dari pasangan terverifikasi; baris pertama
+   tiap cluster dipertahankan (seperti drop_duplicates(keep='first'))
+
+Dengan SHINGLE_SIZE = 1 urutan kata diabaikan: "aplikasi bagus tidak lambat"
+dan "aplikasi lambat tidak bagus" punya Jaccard 1.0. Karena itu pasangan
+bisa dibatasi ke label yang sama (`by`, mis. kolom sentiment): review
+dengan label berbeda tidak pernah digabung. SHINGLE_SIZE = 2 peka urutan,
+tetapi tidak lagi menangkap varian swap hasil augmentasi.
+
+Waktu ~ O(n * NUM_PERM + jumlah kandidat), bukan O(n^2).
+
+Contoh:
+    df = drop_near_duplicates(df, 'content_clean', threshold=0.8, by='sentiment')
+    df['near_dup_group'] = near_duplicate_groups(df['content_clean'])
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+THRESHOLD = 0.8       # Jaccard minimum untuk dianggap near-duplicate
+NUM_PERM = 128        # Panjang signature MinHash
+SHINGLE_SIZE = 1      # n-gram kata per shingle (1 = himpunan kata: urutan kata diabaikan, tahan swap)
+CHUNK_DOCS = 5000     # Teks per chunk saat menghitung signature (batas memori)
+SEED = 42
+
+_EMPTY = np.iinfo(np.uint32).max  # Signature teks tanpa shingle
+
+# =====================================================
+# SHINGLING & MINHASH
+# =====================================================
+def shingle_hashes(texts, shingle_size=SHINGLE_SIZE):
+    """
+    Hash uint32 shingle semua teks dalam satu array datar + panjang per teks:
+    shingle teks ke-i = hashes[offset_i:offset_i + lengths[i]] (boleh
+    berulang). Teks dengan kata < shingle_size menjadi satu shingle utuh.
+    Hash dihitung di C oleh pd.util.hash_array (key tetap, deterministik).
+    """
+    shingles = []
+    for text in texts:
+        words = text.split() if isinstance(text, str) else []
+        if shingle_size > 1 and words:
+            stop = max(len(words) - shingle_size + 1, 1)
+            words = [' '.join(words[i:i + shingle_size]) for i in range(stop)]
+        shingles.append(words)
+    lengths = np.fromiter(map(len, shingles), dtype=np.int64, count=len(shingles))
+    flat = np.array(list(itertools.chain.from_iterable(shingles)), dtype=object)
+    hashes = pd.util.hash_array(flat) if len(flat) else np.empty(0, dtype=np.uint64)
+    return (hashes ^ (hashes >> np.uint64(32))).astype(np.uint32), lengths
+
+def minhash_signatures(texts, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE,
+                       chunk_docs=CHUNK_DOCS, seed=SEED):
+    """Signature MinHash (len(texts), num_perm) uint32; teks kosong = semua _EMPTY"""
+    texts = list(texts)
+    rng = np.random.default_rng(seed)
+    # Permutasi h(x) = a * x + b (mod 2^32), a ganjil -> bijeksi ruang 32 bit
+    a = (rng.integers(0, 2**31, num_perm, dtype=np.uint32) * 2 + 1).astype(np.uint32)[:, None]
+    b = rng.integers(0, 2**32, num_perm, dtype=np.uint64).astype(np.uint32)[:, None]
+
+    signatures = np.full((len(texts), num_perm), _EMPTY, dtype=np.uint32)
+    for start in range(0, len(texts), chunk_docs):
+        hashes, lengths = shingle_hashes(texts[start:start + chunk_docs], shingle_size)
+        docs = np.flatnonzero(lengths)
+        if not len(docs):
+            continue
+        # Layout (num_perm, shingle): reduceat di sumbu yang contiguous
+        permuted = np.multiply(a, hashes[None, :])
+        permuted += b
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])[docs]
+        signatures[start + docs] = np.minimum.reduceat(permuted, offsets, axis=1).T
+    return signatures
+
+# =====================================================
+# LSH
+# =====================================================
+def lsh_params(threshold=THRESHOLD, num_perm=NUM_PERM):
+    """
+    (bands, rows) dengan bands * rows == num_perm dan titik belok kurva S
+    (1 / bands) ** (1 / rows) setinggi mungkin tetapi tidak di atas
+    threshold (kandidat diverifikasi, jadi recall diutamakan)
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(b, r) for b, r in options if (1 / b) ** (1 / r) <= threshold]
+    return max(below, key=lambda br: (1 / br[0]) ** (1 / br[1])) if below else options[-1]
+
+def candidate_pairs(signatures, bands, rows, label_codes=None):
+    """
+    Pasangan (u, v), u < v, yang punya minimal satu band identik. Per
+    bucket: setiap anggota dipasangkan dengan anggota pertama dan anggota
+    sebelumnya (linear, tanpa semua pasangan dalam bucket besar).
+    `label_codes` (int per teks, -1 = tanpa label): bucket dipisah per label,
+    teks tanpa label tidak punya kandidat.
+    """
+    rng = np.random.default_rng(SEED + 1)
+    mult = rng.integers(1, 2**63, rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    label_mult = rng.integers(1, 2**63, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    valid = (signatures != _EMPTY).any(axis=1)
+    if label_codes is not None:
+        valid &= label_codes >= 0
+    valid = np.flatnonzero(valid)
+    pairs = []
+    for band in range(bands):
+        block = signatures[valid, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = (block * mult).sum(axis=1)
+        if label_codes is not None:
+            keys += label_codes[valid].astype(np.uint64) * label_mult
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        members = valid[order]
+        same = np.flatnonzero(sorted_keys[1:] == sorted_keys[:-1]) + 1
+        if not len(same):
+            continue
+        starts = np.where(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]], np.arange(len(keys)), 0)
+        first = members[np.maximum.accumulate(starts)]
+        pairs.append(np.stack([first[same], members[same]], axis=1))
+        pairs.append(np.stack([members[same - 1], members[same]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    n = np.int64(len(signatures))
+    codes = np.unique(pairs[:, 0] * n + pairs[:, 1])  # dedup pasangan lintas band
+    return np.stack([codes // n, codes % n], axis=1)
+
+def signature_similarity(signatures, pairs, chunk=1 << 16):
+    """Estimasi Jaccard tiap pasangan: fraksi posisi signature yang sama"""
+    similarity = np.empty(len(pairs), dtype=np.float64)
+    for start in range(0, len(pairs), chunk):
+        u, v = pairs[start:start + chunk].T
+        similarity[start:start + chunk] = (signatures[u] == signatures[v]).mean(axis=1)
+    return similarity
+
+def connected_groups(n, pairs):
+    """Label komponen terhubung = indeks terkecil di komponen (label propagation)"""
+    labels = np.arange(n)
+    if not len(pairs):
+        return labels
+    u, v = pairs[:, 0], pairs[:, 1]
+    while True:
+        updated = labels.copy()
+        np.minimum.at(updated, u, labels[v])
+        np.minimum.at(updated, v, labels[u])
+        updated = updated[updated]  # pointer jumping
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+# =====================================================
+# API
+# =====================================================
+def near_duplicate_groups(texts, threshold=THRESHOLD, num_perm=NUM_PERM,
+                          shingle_size=SHINGLE_SIZE, seed=SEED, by=None):
+    """
+    Array label cluster (posisi, bukan index pandas) per teks: posisi teks
+    pertama di cluster near-duplicate-nya. Teks tanpa duplikat = posisinya.
+    `by` (label per teks, opsional): hanya teks dengan label sama yang
+    digabung; label NaN tidak pernah digabung.
+    """
+    texts = list(texts)
+    signatures = minhash_signatures(texts, num_perm, shingle_size, seed=seed)
+    bands, rows = lsh_params(threshold, num_perm)
+    codes = None
+    if by is not None:
+        codes, _ = pd.factorize(pd.Series(list(by)), use_na_sentinel=True)
+    pairs = candidate_pairs(signatures, bands, rows, codes)
+    if codes is not None:
+        pairs = pairs[codes[pairs[:, 0]] == codes[pairs[:, 1]]]  # Tabrakan key antar label
+    pairs = pairs[signature_similarity(signatures, pairs) >= threshold]
+    return connected_groups(len(texts), pairs)
+
+def near_duplicated(texts, threshold=THRESHOLD, **kwargs):
+    """Seperti Series.duplicated(keep='first'), tetapi untuk near-duplicate"""
+    texts = pd.Series(texts)
+    groups = near_duplicate_groups(texts, threshold, **kwargs)
+    return pd.Series(groups != np.arange(len(texts)), index=texts.index, name=texts.name)
+
+def drop_near_duplicates(df, subset, threshold=THRESHOLD, by=None, **kwargs):
+    """
+    Seperti df.drop_duplicates(subset=[subset]), tetapi untuk near-duplicate;
+    `by` = kolom label (near-duplicate hanya di antara baris berlabel sama)
+    """
+    labels = df[by] if by is not None else None
+    return df[~near_duplicated(df[subset], threshold, by=labels, **kwargs).to_numpy()]
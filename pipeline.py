@@ -0,0 +1,442 @@
+"""
+Pipeline data deklaratif (DAG) dengan cache per stage
+
+Alur script sebelumnya implisit (scrape_* -> clean_* -> augment_data) lewat
+nama file hardcoded, jadi semuanya dijalankan ulang. Di sini setiap stage
+mendeklarasikan fungsi yang dijalankan, file input/output dan override
+config (konstanta modul). Urutan & dependensi diturunkan dari file:
+stage yang membaca output stage lain berjalan setelahnya.
+
+Stage dijalankan ulang hanya jika fingerprint-nya berubah:
+- isi file input (hash blake2b; hash di-cache per path + size + mtime)
+- kode: file modul stage + semua modul lokal yang di-import (transitif,
+  package = semua file .py di dalamnya)
+- config override & argumen fungsi
+atau jika output hilang / diubah di luar pipeline. Stage yang outputnya
+identik dengan run sebelumnya tidak memicu stage hilir (input hilir sama).
+Stage sumber (scraping, source=True) hanya jalan jika outputnya belum ada
+atau dipaksa (--force): perubahan kode scraper tidak memicu scraping ulang.
+
+Stage yang siap (semua upstream selesai) dijalankan paralel sebagai proses
+terpisah (maks --workers), log tiap stage di data/pipeline_logs/<stage>.log.
+Core dibagi rata antar stage paralel: stage dengan cpu_config (mis. cleaning
+dengan process pool) mendapat cpu_count // --workers worker, bukan semua core.
+State (fingerprint & hash output) di data/pipeline_state.json.
+
+prepare_data_for_training tidak masuk DAG default: script itu menimpa
+data/gojek_reviews_3class_clean.csv yang dibaca augment_data (siklus).
+
+Contoh:
+    python pipeline.py --dry-run          # status stage (fresh / stale + alasan)
+    python pipeline.py                    # jalankan stage yang stale
+    python pipeline.py augment            # hanya augment + upstream-nya
+    python pipeline.py --force clean_3class
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = 'data/pipeline_state.json'
+LOG_DIR = 'data/pipeline_logs'
+PIPELINE_WORKERS = 2    # Stage paralel (cabang 3-class & 5-class)
+HASH_BLOCK = 1 << 20
+
+# =====================================================
+# STAGE
+# =====================================================
+class Stage:
+    """
+    Satu langkah pipeline: `target` = 'modul:fungsi' dipanggil dengan
+    kwargs setelah konstanta modul di-override dengan `config`.
+    `optional_inputs` = file yang dibaca jika ada (ikut di-fingerprint).
+    `cpu_config` = konstanta modul yang diisi jatah core stage (tidak ikut
+    fingerprint: jumlah worker tidak mengubah output).
+    """
+
+    def __init__(self, name, target, inputs=(), outputs=(), config=None, kwargs=None,
+                 optional_inputs=(), source=False, description='', cpu_config=None):
+        self.name = name
+        self.target = target
+        self.module = target.split(':')[0]
+        self.inputs = tuple(inputs)
+        self.optional_inputs = tuple(optional_inputs)
+        self.outputs = tuple(outputs)
+        self.config = dict(config or {})
+        self.kwargs = dict(kwargs or {})
+        self.source = source
+        self.description = description
+        self.cpu_config = cpu_config
+
+    def __repr__(self):
+        return f'Stage({self.name!r}, {self.target!r})'
+
+    def run(self, cpus=None):
+        """Jalankan di proses ini (dipanggil oleh worker --run-stage)"""
+        module_name, function_name = self.target.split(':')
+        module = importlib.import_module(module_name)
+        config = dict(self.config)
+        if cpus and self.cpu_config:
+            config[self.cpu_config] = cpus
+        for key, value in config.items():
+            if not hasattr(module, key):
+                raise AttributeError(f'{module_name} tidak punya config {key}')
+            setattr(module, key, value)
+        return getattr(module, function_name)(**self.kwargs)
+
+STAGES = [
+    Stage('scrape_balanced', 'scrape_balanced_reviews:main',
+          outputs=['data/reviews.db'], source=True,
+          description='Scraping Play Store seimbang per rating (dataset 3class/5class_raw_balanced)'),
+    Stage('clean_3class', 'clean_raw_data:clean_file',
+          inputs=['data/reviews.db'],
+          outputs=['data/gojek_reviews_3class_clean.csv',
+                   'data/gojek_reviews_3class_clean_filter_stats.csv'],
+          kwargs={'input_path': None, 'source': 'store', 'store_dataset': '3class_raw_balanced',
+                  'store_view': 'reviews_3class',
+                  'output_path': 'data/gojek_reviews_3class_clean.csv',
+                  'dataset_name': '3-Class Dataset'},
+          cpu_config='CLEAN_WORKERS',
+          description='Cleaning + balancing 3 kelas'),
+    Stage('clean_5class', 'clean_raw_data:clean_file',
+          inputs=['data/reviews.db'],
+          outputs=['data/gojek_reviews_5class_clean.csv',
+                   'data/gojek_reviews_5class_clean_filter_stats.csv'],
+          kwargs={'input_path': None, 'source': 'store', 'store_dataset': '5class_raw_balanced',
+                  'store_view': 'reviews_5class',
+                  'output_path': 'data/gojek_reviews_5class_clean.csv',
+                  'dataset_name': '5-Class Dataset'},
+          cpu_config='CLEAN_WORKERS',
+          description='Cleaning + balancing 5 kelas'),
+    Stage('augment', 'augment_data:main',
+          inputs=['data/gojek_reviews_3class_clean.csv'],
+          optional_inputs=['data/gojek_reviews_scraped_all.csv',
+                           'data/gojek_reviews_balanced_9997.csv'],
+          outputs=['data/gojek_reviews_final_augmented.csv'],
+          description='Gabung data + augmentasi kelas minoritas'),
+]
+
+# =====================================================
+# DAG
+# =====================================================
+def build_graph(stages):
+    """
+    {stage: set upstream} dari file input/output; error jika satu file
+    punya dua producer, stage duplikat, atau ada siklus
+    """
+    producers = {}
+    names = set()
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f'Stage duplikat: {stage.name}')
+        names.add(stage.name)
+        for path in stage.outputs:
+            if path in producers:
+                raise ValueError(f'{path} ditulis oleh {producers[path]} dan {stage.name}')
+            producers[path] = stage.name
+    upstream = {stage.name: {producers[path] for path in stage.inputs + stage.optional_inputs
+                             if path in producers} - {stage.name}
+                for stage in stages}
+    topological_order(upstream)
+    return upstream
+
+def topological_order(upstream):
+    """Urutan stage (upstream dulu, selain itu urutan deklarasi); error jika siklus"""
+    order, done = [], set()
+    pending = list(upstream)
+    while pending:
+        ready = [name for name in pending if upstream[name] <= done]
+        if not ready:
+            raise ValueError(f'Siklus dependensi antar stage: {", ".join(pending)}')
+        order += ready
+        done.update(ready)
+        pending = [name for name in pending if name not in done]
+    return order
+
+def with_upstream(names, upstream):
+    """Stage `names` beserta semua upstream-nya"""
+    selected, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name not in upstream:
+            raise KeyError(f'Stage tidak dikenal: {name}')
+        if name not in selected:
+            selected.add(name)
+            stack.extend(upstream[name])
+    return selected
+
+# =====================================================
+# FINGERPRINT
+# =====================================================
+class PipelineState:
+    """State JSON: hash file (per path, size, mtime) + fingerprint & output per stage"""
+
+    def __init__(self, path=STATE_PATH):
+        self.path = path
+        self.data = {'files': {}, 'stages': {}}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.data = json.load(f)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def file_hash(self, path):
+        """Hash isi file (None jika tidak ada); dihitung ulang hanya jika size / mtime berubah"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self.data['files'].get(path)
+        if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return cached[2]
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK), b''):
+                digest.update(block)
+        self.data['files'][path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def stage(self, name):
+        return self.data['stages'].get(name)
+
+    def record(self, stage, fingerprint, parts, seconds):
+        self.data['stages'][stage.name] = {
+            'fingerprint': fingerprint,
+            'parts': parts,
+            'outputs': {path: self.file_hash(path) for path in stage.outputs},
+            'finished': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'seconds': round(seconds, 1),
+        }
+
+def local_module_files(module_name, root=ROOT):
+    """File .py modul lokal + semua modul lokal yang di-import (transitif)"""
+    files, stack, visited = set(), [module_name], set()
+    while stack:
+        name = stack.pop().split('.')[0]
+        if name in visited:
+            continue
+        visited.add(name)
+        if os.path.exists(os.path.join(root, f'{name}.py')):
+            paths = [os.path.join(root, f'{name}.py')]
+        elif os.path.exists(os.path.join(root, name, '__init__.py')):
+            package = os.path.join(root, name)
+            paths = [os.path.join(package, f) for f in os.listdir(package) if f.endswith('.py')]
+        else:
+            continue  # Library pihak ketiga / stdlib
+        for path in paths:
+            files.add(path)
+            with open(path, encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    stack.extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    stack.append(node.module)
+    return sorted(files)
+
+def stage_fingerprint(stage, state, root=ROOT):
+    """(fingerprint, {bagian: hash}) dari input, kode dan config stage"""
+    parts = {
+        'inputs': {path: state.file_hash(path) for path in stage.inputs + stage.optional_inputs},
+        'code': {os.path.relpath(path, root): state.file_hash(path)
+                 for path in local_module_files(stage.module, root)},
+        'config': repr((stage.target, sorted(stage.config.items()), sorted(stage.kwargs.items()))),
+    }
+    digest = hashlib.blake2b(json.dumps(parts, sort_keys=True).encode('utf-8'), digest_size=16)
+    return digest.hexdigest(), parts
+
+def stale_reason(stage, state, force=False):
+    """Alasan stage harus dijalankan (None = fresh); input wajib yang tidak ada = error"""
+    missing = [path for path in stage.inputs if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f'{stage.name}: input tidak ada: {", ".join(missing)}')
+    if force:
+        return 'dipaksa (--force)'
+    previous = state.stage(stage.name)
+    missing = [path for path in stage.outputs if not os.path.exists(path)]
+    if missing:
+        return f'output tidak ada: {", ".join(missing)}'
+    if stage.source:
+        return None  # Data hasil scraping dipakai apa adanya
+    if previous is None:
+        return 'belum pernah dijalankan lewat pipeline'
+    changed = [path for path, digest in previous['outputs'].items() if state.file_hash(path) != digest]
+    if changed:
+        return f'output diubah di luar pipeline: {", ".join(changed)}'
+    fingerprint, parts = stage_fingerprint(stage, state)
+    if fingerprint == previous['fingerprint']:
+        return None
+    old = previous.get('parts', {})
+    changed = [kind for kind in ('inputs', 'code', 'config') if parts[kind] != old.get(kind)]
+    details = []
+    for kind in ('inputs', 'code'):
+        if kind in changed and isinstance(old.get(kind), dict):
+            details += [path for path, digest in parts[kind].items() if old[kind].get(path) != digest]
+    reason = ', '.join(changed) + ' berubah'
+    return reason + (f' ({", ".join(details)})' if details else '')
+
+# =====================================================
+# RUNNER
+# =====================================================
+def launch(stage, cpus):
+    """Jalankan stage di proses terpisah (jatah `cpus` core), stdout/stderr ke file log"""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f'{stage.name}.log')
+    log = open(log_path, 'w', encoding='utf-8')
+    env = dict(os.environ, PYTHONIOENCODING='utf-8')
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--run-stage', stage.name,
+                                '--cpus', str(cpus)],
+                               stdout=log, stderr=subprocess.STDOUT, env=env)
+    return process, log, log_path
+
+def run_pipeline(stages=STAGES, targets=None, force=(), workers=PIPELINE_WORKERS, dry_run=False,
+                 state_path=STATE_PATH):
+    """
+    Jalankan stage yang stale (semua stage, atau `targets` + upstream-nya).
+    Staleness stage diputuskan tepat sebelum dijalankan, setelah upstream
+    selesai, jadi output upstream yang identik tidak memicu stage hilir.
+    Return {stage: 'fresh' / 'ran' / 'failed' / 'skipped' / 'stale'}.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    upstream = build_graph(stages)
+    selected = with_upstream(targets, upstream) if targets else set(by_name)
+    order = [name for name in topological_order(upstream) if name in selected]
+    unknown = set(force) - set(by_name)
+    if unknown:
+        raise KeyError(f'Stage tidak dikenal: {", ".join(sorted(unknown))}')
+    state = PipelineState(state_path)
+    status, running = {}, {}
+    cpus = max(1, (os.cpu_count() or 1) // max(1, workers))
+
+    if dry_run:
+        for name in order:
+            if any(status[up] != 'fresh' for up in upstream[name] if up in status):
+                reason = 'upstream stale'
+            else:
+                try:
+                    reason = stale_reason(by_name[name], state, name in force)
+                except FileNotFoundError as e:
+                    reason = f'{e} (belum dibuat upstream)' if upstream[name] else str(e)
+            status[name] = 'fresh' if reason is None else 'stale'
+            print(f'   {"✅" if reason is None else "🔄"} {name:<18} {reason or "fresh"}')
+        return status
+
+    pending = list(order)
+    while pending or running:
+        for name in list(pending):
+            if len(running) >= workers:
+                break
+            if any(status.get(up) in ('failed', 'skipped') for up in upstream[name]):
+                status[name] = 'skipped'
+                pending.remove(name)
+                print(f'⏭️  {name}: dilewati (upstream gagal)')
+                continue
+            if not all(up in status for up in upstream[name] if up in selected):
+                continue
+            pending.remove(name)
+            stage = by_name[name]
+            try:
+                reason = stale_reason(stage, state, name in force)
+            except FileNotFoundError as e:
+                status[name] = 'failed'
+                print(f'❌ {e}')
+                continue
+            if reason is None:
+                status[name] = 'fresh'
+                print(f'✅ {name}: fresh')
+                continue
+            fingerprint, parts = stage_fingerprint(stage, state)
+            process, log, log_path = launch(stage, cpus)
+            running[name] = (process, log, log_path, fingerprint, parts, time.perf_counter())
+            print(f'▶️  {name}: {reason} (log: {log_path})')
+
+        if not running:
+            continue
+        time.sleep(0.2)
+        for name, (process, log, log_path, fingerprint, parts, start) in list(running.items()):
+            if process.poll() is None:
+                continue
+            log.close()
+            del running[name]
+            seconds = time.perf_counter() - start
+            missing = [path for path in by_name[name].outputs if not os.path.exists(path)]
+            if process.returncode != 0 or missing:
+                status[name] = 'failed'
+                detail = f'exit code {process.returncode}' if process.returncode else \
+                    f'output tidak dibuat: {", ".join(missing)}'
+                print(f'❌ {name}: gagal ({detail}, {seconds:.1f}s), lihat {log_path}')
+                continue
+            state.record(by_name[name], fingerprint, parts, seconds)
+            state.save()
+            status[name] = 'ran'
+            print(f'✅ {name}: selesai ({seconds:.1f}s)')
+    state.save()
+    return status
+
+# =====================================================
+# CLI
+# =====================================================
+def parse_args():
+    parser = argparse.ArgumentParser(description='Pipeline data (DAG) dengan cache per stage')
+    parser.add_argument('targets', nargs='*', help='Stage tujuan (default: semua); upstream ikut dicek')
+    parser.add_argument('--force', nargs='+', default=[], metavar='STAGE', help='Paksa jalankan stage ini')
+    parser.add_argument('--workers', type=int, default=PIPELINE_WORKERS, help='Stage paralel maksimum')
+    parser.add_argument('--dry-run', action='store_true', help='Tampilkan status stage tanpa menjalankan')
+    parser.add_argument('--list', action='store_true', help='Daftar stage, input & output')
+    parser.add_argument('--run-stage', help=argparse.SUPPRESS)  # Dipakai proses worker
+    parser.add_argument('--cpus', type=int, help=argparse.SUPPRESS)  # Jatah core proses worker
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    by_name = {stage.name: stage for stage in STAGES}
+
+    if args.run_stage:
+        by_name[args.run_stage].run(args.cpus)
+        return
+
+    if args.list:
+        upstream = build_graph(STAGES)
+        for name in topological_order(upstream):
+            stage = by_name[name]
+            print(f'\n📦 {name} ({stage.target}){" [sumber]" if stage.source else ""}')
+            print(f'   {stage.description}')
+            print(f'   setelah: {", ".join(sorted(upstream[name])) or "-"}')
+            for path in stage.inputs:
+                print(f'   ← {path}')
+            for path in stage.optional_inputs:
+                print(f'   ← {path} (opsional)')
+            for path in stage.outputs:
+                print(f'   → {path}')
+        return
+
+    print('=' * 60)
+    print('🔗 DATA PIPELINE')
+    print('=' * 60)
+    status = run_pipeline(targets=args.targets or None, force=args.force, workers=args.workers,
+                          dry_run=args.dry_run)
+    counts = {key: list(status.values()).count(key) for key in ('ran', 'fresh', 'stale', 'failed', 'skipped')}
+    print('\n' + ', '.join(f'{key}: {count}' for key, count in counts.items() if count))
+    if counts['failed'] or counts['skipped']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
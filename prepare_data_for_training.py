@@ -4,6 +4,8 @@ Script untuk Mempersiapkan Data Training IndoBERT
 1. Hapus data duplikat
 2. Minimal cleaning (pertahankan struktur kalimat untuk IndoBERT)
 3. Balance data jika perlu
+4. Split train/val/test per grup sumber (source_group dari augment_data:
+   review asli + semua hasil augmentasinya di split yang sama)
 
 Author: Fahrezi
 Date: November 2025
@@ -11,15 +13,20 @@ Date: November 2025
 
 import pandas as pd
 import numpy as np
-import re
 import os
-from sklearn.utils import resample
+
+from balancing import balance, group_split
+from cleaning_utils import map_unique
+from near_dedup import near_duplicate_groups
+from preprocessing import get_profile
 
 # =====================================================
 # KONFIGURASI
 # =====================================================
 INPUT_FILE = 'data/gojek_reviews_final_augmented.csv'
 OUTPUT_FILE = 'data/gojek_reviews_3class_clean.csv'
+SPLIT_FRACTIONS = (('train', 0.7), ('val', 0.15), ('test', 0.15))
+NEAR_DEDUP_THRESHOLD = 0.8  # Grup near-duplicate jika input belum punya source_group
 
 # =====================================================
 # 1. LOAD DATA
@@ -67,13 +74,8 @@ counts = df_clean['sentiment'].value_counts()
 min_count = counts.min()
 
 # Undersample ke jumlah kelas terkecil
-df_balanced = pd.DataFrame()
-for sentiment in ['negative', 'neutral', 'positive']:
-    df_class = df_clean[df_clean['sentiment'] == sentiment]
-    df_sampled = resample(df_class, replace=False, n_samples=min_count, random_state=42)
-    df_balanced = pd.concat([df_balanced, df_sampled])
-
-df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+df_balanced = balance(df_clean, 'sentiment', classes=['negative', 'neutral', 'positive'],
+                      target=min_count, seed=42)
 
 print(f'Data setelah balancing: {len(df_balanced):,}')
 print(df_balanced['sentiment'].value_counts())
@@ -85,32 +87,21 @@ print('\n' + '=' * 60)
 print('🧹 CLEANING DATA UNTUK INDOBERT')
 print('=' * 60)
 
+CLEAN_PROFILE = get_profile('indobert-minimal')
+print(f'Profile: {CLEAN_PROFILE.id}')
+
 def clean_for_indobert(text):
     """
-    Minimal cleaning untuk IndoBERT:
+    Minimal cleaning untuk IndoBERT (profile 'indobert-minimal'):
     - Hapus HTML tags
     - Hapus URL
     - Normalize whitespace
     - PERTAHANKAN: tanda baca, huruf besar/kecil, struktur kalimat
     """
-    if pd.isna(text):
-        return ""
-    
-    text = str(text)
-    
-    # Hapus HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # Hapus URL
-    text = re.sub(r'http\S+|www\.\S+', '', text)
-    
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+    return CLEAN_PROFILE.clean(text)
 
 # Apply cleaning ke kolom content (teks asli)
-df_balanced['content_clean'] = df_balanced['content'].apply(clean_for_indobert)
+df_balanced['content_clean'] = map_unique(df_balanced['content'], clean_for_indobert)
 
 # Hapus baris dengan teks kosong atau terlalu pendek
 df_balanced = df_balanced[df_balanced['content_clean'].str.len() > 5].reset_index(drop=True)
@@ -122,20 +113,38 @@ for i in range(3):
     print(f'      Sentiment: {df_balanced["sentiment"].iloc[i]}')
 
 # =====================================================
-# 6. SAVE DATA
+# 6. SPLIT PER GRUP (TRAIN / VAL / TEST)
+# =====================================================
+print('\n' + '=' * 60)
+print('✂️ SPLIT TRAIN / VAL / TEST PER GRUP')
+print('=' * 60)
+
+# Varian augmentasi (swap/hapus/sinonim) satu review harus di split yang sama dengan
+# aslinya; file augmentasi lama tanpa source_group: grup = cluster near-duplicate
+if 'source_group' not in df_balanced.columns:
+    df_balanced['source_group'] = near_duplicate_groups(df_balanced['content_clean'], NEAR_DEDUP_THRESHOLD)
+    print(f'source_group tidak ada: grup dari near-duplicate (threshold {NEAR_DEDUP_THRESHOLD})')
+df_balanced['split'] = group_split(df_balanced['sentiment'], df_balanced['source_group'],
+                                   fractions=SPLIT_FRACTIONS, seed=42)
+assert (df_balanced.groupby('source_group')['split'].nunique() == 1).all()
+print(f'Grup: {df_balanced["source_group"].nunique():,}')
+print(pd.crosstab(df_balanced['sentiment'], df_balanced['split']))
+
+# =====================================================
+# 7. SAVE DATA
 # =====================================================
 print('\n' + '=' * 60)
 print('💾 SAVE DATA')
 print('=' * 60)
 
-# Simpan dengan kolom yang diperlukan
-df_save = df_balanced[['content', 'content_clean', 'sentiment']].copy()
+# Simpan dengan kolom yang diperlukan (notebook training memakai kolom split apa adanya)
+df_save = df_balanced[['content', 'content_clean', 'sentiment', 'source_group', 'split']].copy()
 df_save.to_csv(OUTPUT_FILE, index=False)
 print(f'✓ Data saved: {OUTPUT_FILE}')
 print(f'  Rows: {len(df_save):,}')
 
 # =====================================================
-# 7. SUMMARY
+# 8. SUMMARY
 # =====================================================
 print('\n' + '=' * 60)
 print('📊 SUMMARY')
@@ -163,6 +172,7 @@ print(f'''
 📌 CATATAN PENTING:
    - Data sudah bersih dari duplikat
    - Data sudah seimbang (balanced)
+   - Kolom split: train/val/test per source_group (tanpa kebocoran augmentasi)
    - Teks asli dipertahankan untuk IndoBERT
    - IndoBERT butuh struktur kalimat asli untuk konteks
 ''')
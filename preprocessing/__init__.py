@@ -0,0 +1,10 @@
+"""
+Preprocessing teks review bersama: profile bernama & ber-versi
+
+    from preprocessing import get_profile
+    profile = get_profile('indobert-minimal')
+    df['content_clean'] = profile.clean_series(df['content'])
+    print(profile.id)  # catat di cache / metadata model
+"""
+
+from preprocessing.profiles import PROFILES, PREPROCESSING_REVISION, Profile, get_profile, register
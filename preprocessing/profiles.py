@@ -0,0 +1,325 @@
+"""
+Profile preprocessing bernama + registry
+
+Profile = daftar tahap (preprocessing.stages) yang sudah di-compile, plus
+version hash dari perilaku tahap-tahapnya. Cache & model yang dilatih
+mencatat `profile.id` (nama@versi) agar jelas profile mana yang menghasilkan
+input mereka. Versi berubah otomatis jika pattern, pengganti, slang, atau
+urutan tahap berubah; naikkan PREPROCESSING_REVISION jika logika tahap
+(kode di stages.py) diubah.
+
+Profile yang tersedia:
+- aggressive-normalized : clean_raw_data (URL/email/telepon/HTML/emoji,
+                          slang, karakter khusus, angka & karakter tunggal)
+- indobert-minimal      : prepare_data_for_training (HTML, URL, whitespace;
+                          huruf besar & tanda baca dipertahankan)
+- lowercase-basic       : augment_data & scrape_reviews_complete
+- lowercase-punct       : clean_3class_data (tanda baca .,!?- dipertahankan)
+- cased-punct           : clean_5class_data (tanpa lowercase)
+"""
+
+import hashlib
+import re
+
+import pandas as pd
+
+from cleaning_utils import map_unique
+from preprocessing.stages import Lower, Strip, CollapseWhitespace, Sub, TokenFilter
+
+PREPROCESSING_REVISION = 1
+
+# =====================================================
+# PATTERN & KAMUS
+# =====================================================
+# Pattern di-compile sekali saat import (bukan setiap pemanggilan)
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+PHONE_PATTERN = re.compile(r'(\+62|62|0)[\s-]?\d{2,4}[\s-]?\d{3,4}[\s-]?\d{3,4}')
+EMOJI_PATTERN = re.compile("["
+    u"\U0001F600-\U0001F64F"  # emoticons
+    u"\U0001F300-\U0001F5FF"  # symbols & pictographs
+    u"\U0001F680-\U0001F6FF"  # transport & map symbols
+    u"\U0001F1E0-\U0001F1FF"  # flags
+    u"\U00002702-\U000027B0"
+    u"\U000024C2-\U0001F251"
+    u"\U0001f926-\U0001f937"
+    u"\U00010000-\U0010ffff"
+    u"\u2640-\u2642"
+    u"\u2600-\u2B55"
+    u"\u200d"
+    u"\u23cf"
+    u"\u23e9"
+    u"\u231a"
+    u"\ufe0f"
+    u"\u3030"
+    "]+", flags=re.UNICODE)
+HTML_PATTERN = re.compile(r'<.*?>')
+SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s]')
+KEEP_SINGLE_CHARS = ('a', 'i')  # Karakter tunggal yang bermakna dalam bahasa Indonesia
+
+# Normalisasi kata-kata slang/singkatan umum Indonesia
+SLANG_DICT = {
+    # Negasi
+    'gk': 'tidak',
+    'ga': 'tidak',
+    'gak': 'tidak',
+    'tdk': 'tidak',
+    'gx': 'tidak',
+    'ngga': 'tidak',
+    'nggak': 'tidak',
+    'enggak': 'tidak',
+    'kagak': 'tidak',
+    'kaga': 'tidak',
+    # Kata penghubung
+    'yg': 'yang',
+    'dgn': 'dengan',
+    'dg': 'dengan',
+    'utk': 'untuk',
+    'krn': 'karena',
+    'karna': 'karena',
+    'krna': 'karena',
+    # Waktu
+    'sdh': 'sudah',
+    'udh': 'sudah',
+    'udah': 'sudah',
+    'blm': 'belum',
+    'blum': 'belum',
+    'blom': 'belum',
+    'skrg': 'sekarang',
+    'skrng': 'sekarang',
+    'lg': 'lagi',
+    'lgi': 'lagi',
+    # Kata umum
+    'jg': 'juga',
+    'jga': 'juga',
+    'jd': 'jadi',
+    'jdi': 'jadi',
+    'klo': 'kalau',
+    'kalo': 'kalau',
+    'klau': 'kalau',
+    'bs': 'bisa',
+    'bsa': 'bisa',
+    'dr': 'dari',
+    'dri': 'dari',
+    'sm': 'sama',
+    'sma': 'sama',
+    'spt': 'seperti',
+    'sprti': 'seperti',
+    'spy': 'supaya',
+    'biar': 'supaya',
+    'tp': 'tapi',
+    'tpi': 'tapi',
+    # Pronouns
+    'sy': 'saya',
+    'gw': 'saya',
+    'gue': 'saya',
+    'gua': 'saya',
+    'ane': 'saya',
+    'kmu': 'kamu',
+    'lu': 'kamu',
+    'lo': 'kamu',
+    'elu': 'kamu',
+    'ente': 'kamu',
+    # Kata lain
+    'org': 'orang',
+    'orng': 'orang',
+    'ornag': 'orang',
+    'hrs': 'harus',
+    'hrus': 'harus',
+    'dpt': 'dapat',
+    'dpat': 'dapat',
+    'dapet': 'dapat',
+    'msh': 'masih',
+    'msih': 'masih',
+    'emg': 'memang',
+    'emang': 'memang',
+    'mmg': 'memang',
+    'knp': 'kenapa',
+    'knapa': 'kenapa',
+    'gmn': 'bagaimana',
+    'gmna': 'bagaimana',
+    'gimana': 'bagaimana',
+    'dmn': 'dimana',
+    'dmna': 'dimana',
+    'kpn': 'kapan',
+    # Ucapan
+    'thx': 'terima kasih',
+    'tks': 'terima kasih',
+    'thanks': 'terima kasih',
+    'makasih': 'terima kasih',
+    'mksh': 'terima kasih',
+    'makasi': 'terima kasih',
+    'trims': 'terima kasih',
+    'trmksh': 'terima kasih',
+    'ok': 'oke',
+    'okey': 'oke',
+    'okay': 'oke',
+    'oks': 'oke',
+    # Intensifier
+    'bgt': 'banget',
+    'bngt': 'banget',
+    'bngtt': 'banget',
+    'bgtt': 'banget',
+    # Positif expressions
+    'mantap': 'mantap',
+    'mantab': 'mantap',
+    'mantul': 'mantap',
+    'mantep': 'mantap',
+    'keren': 'keren',
+    'josss': 'jos',
+    'joss': 'jos',
+    # Negatif expressions
+    'jelek': 'jelek',
+    'jlek': 'jelek',
+    'parah': 'parah',
+    'ancur': 'hancur',
+    'payah': 'payah',
+    'nyebelin': 'menyebalkan',
+    'sebel': 'kesal',
+    'kesel': 'kesal',
+    # Kata partikel
+    'bkn': 'bukan',
+    'bukn': 'bukan',
+    'aja': 'saja',
+    'doang': 'saja',
+    'doank': 'saja',
+    'nih': 'ini',
+    'tuh': 'itu',
+    'bener': 'benar',
+    'bnr': 'benar',
+    'salh': 'salah',
+    'slh': 'salah',
+    # Aplikasi Gojek - keep as is
+    'aplikasinya': 'aplikasi',
+    'appnya': 'aplikasi',
+    'app': 'aplikasi',
+    'apps': 'aplikasi',
+    'apk': 'aplikasi',
+    'drivernya': 'driver',
+    'drver': 'driver',
+    'drvr': 'driver',
+    'ojol': 'ojek online',
+    # Speed
+    'lelet': 'lambat',
+    'lemot': 'lambat',
+    'cpt': 'cepat',
+    'cpet': 'cepat',
+    'cepet': 'cepat',
+    'lma': 'lama',
+}
+
+# =====================================================
+# PROFILE
+# =====================================================
+class Profile:
+    """
+    Pipeline preprocessing bernama: teks -> tahap-tahap berurutan.
+
+    non_string: perlakuan input bukan str
+    - 'str'   : NaN/None -> "", nilai lain -> str(value)
+    - 'empty' : semua input bukan str -> ""
+    """
+
+    def __init__(self, name, stages, description='', non_string='str'):
+        if non_string not in ('str', 'empty'):
+            raise ValueError(f"non_string harus 'str' atau 'empty', bukan {non_string!r}")
+        self.name = name
+        self.stages = tuple(stages)
+        self.description = description
+        self.non_string = non_string
+        self._apply = tuple(stage.apply for stage in self.stages)
+        self.version = hashlib.blake2b(repr((
+            PREPROCESSING_REVISION,
+            non_string,
+            [stage.spec for stage in self.stages],
+        )).encode('utf-8'), digest_size=8).hexdigest()
+
+    @property
+    def id(self):
+        """Identitas profile untuk dicatat cache/model: nama@versi"""
+        return f'{self.name}@{self.version}'
+
+    def __repr__(self):
+        return f'Profile({self.id!r}, {len(self.stages)} tahap)'
+
+    def clean(self, text):
+        """Bersihkan satu teks"""
+        if not isinstance(text, str):
+            if self.non_string == 'empty' or pd.isna(text):
+                return ""
+            text = str(text)
+        for apply in self._apply:
+            text = apply(text)
+        return text
+
+    def clean_series(self, series):
+        """clean untuk satu kolom (hasil identik dengan .map(clean)), sekali per teks unik"""
+        return map_unique(series, self.clean)
+
+PROFILES = {}
+
+def register(profile):
+    """Tambahkan profile ke registry (nama harus unik)"""
+    if profile.name in PROFILES:
+        raise ValueError(f'Profile {profile.name!r} sudah terdaftar')
+    PROFILES[profile.name] = profile
+    return profile
+
+def get_profile(name):
+    """Profile berdasarkan nama (KeyError berisi daftar nama jika tidak ada)"""
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise KeyError(f'Profile {name!r} tidak ada; pilihan: {sorted(PROFILES)}') from None
+
+# Guard hanya melewati regex yang memang tidak bisa cocok (hasil tetap identik)
+URL_GUARD = ('http', 'www.')
+
+register(Profile('aggressive-normalized', [
+    Lower(),
+    Sub(URL_PATTERN, guard=URL_GUARD),
+    Sub(EMAIL_PATTERN, guard=('@',)),
+    Sub(PHONE_PATTERN, guard=('0', '62')),
+    Sub(HTML_PATTERN, guard=('<',)),
+    Sub(EMOJI_PATTERN, guard='non_ascii'),
+    TokenFilter(SLANG_DICT, SPECIAL_CHAR_PATTERN, drop_numeric=True, keep_single=KEEP_SINGLE_CHARS),
+], 'Normalisasi agresif untuk klasifikasi: lowercase, hapus URL/email/telepon/HTML/emoji, '
+   'slang, karakter khusus, token angka & karakter tunggal'))
+
+register(Profile('indobert-minimal', [
+    Sub(r'<[^>]+>', guard=('<',)),
+    Sub(r'http\S+|www\.\S+', guard=URL_GUARD),
+    Sub(r'\s+', ' '),
+    Strip(),
+], 'Minimal untuk IndoBERT: hapus HTML & URL, rapikan whitespace; '
+   'huruf besar/kecil & tanda baca dipertahankan'))
+
+register(Profile('lowercase-basic', [
+    Lower(),
+    Sub(r'http\S+|www\S+|https\S+', guard=('http', 'www')),
+    Sub(r'\S+@\S+', guard=('@',)),
+    Sub(r'@\w+', guard=('@',)),
+    Sub(r'#\w+', guard=('#',)),
+    Sub(r'\s+', ' '),
+    Sub(r'[^\w\s]', ' '),
+    CollapseWhitespace(),
+    Strip(),
+], 'Lowercase, hapus URL/email/mention/hashtag, karakter khusus -> spasi',
+   non_string='empty'))
+
+register(Profile('lowercase-punct', [
+    Lower(),
+    Sub(r'http\S+|www\.\S+', guard=URL_GUARD),
+    Sub(r'@\w+|#\w+', guard=('@', '#')),
+    Sub(r'[^\w\s.,!?-]', ' '),
+    Sub(r'\s+', ' '),
+    Strip(),
+    Sub(r'^[.,!?\s]+|[.,!?\s]+$'),
+], 'Lowercase, hapus URL/mention/hashtag & emoji; tanda baca .,!?- dipertahankan'))
+
+register(Profile('cased-punct', [
+    Strip(),
+    Sub(r'\s+', ' '),
+    Sub(r'[^\w\s.,!?-]'),
+    Strip(),
+], 'Tanpa lowercase: rapikan whitespace, hapus karakter selain huruf/angka/.,!?-'))
@@ -0,0 +1,126 @@
+"""
+Tahap-tahap preprocessing teks (building block profile)
+
+Setiap tahap adalah callable str -> str dengan:
+- `apply`: fungsi str -> str tercepat untuk tahap ini (dipakai Profile)
+- `spec`: deskripsi perilaku yang stabil (pattern, pengganti, parameter)
+  untuk version hash profile
+Pattern di-compile sekali saat tahap dibuat.
+"""
+
+import re
+
+MAX_TOKEN_CACHE = 500000  # Token unik yang di-cache per TokenFilter sebelum cache dikosongkan
+
+class Stage:
+    """Basis tahap: subclass mengisi `apply` dan `spec`"""
+    spec = ()
+
+    def __call__(self, text):
+        return self.apply(text)
+
+    def __repr__(self):
+        return f'{type(self).__name__}{self.spec[1:]!r}'
+
+def _collapse_whitespace(text):
+    return ' '.join(text.split())
+
+class Lower(Stage):
+    """Lowercase"""
+    apply = staticmethod(str.lower)
+    spec = ('lower',)
+
+class Strip(Stage):
+    """Hapus whitespace di awal & akhir"""
+    apply = staticmethod(str.strip)
+    spec = ('strip',)
+
+class CollapseWhitespace(Stage):
+    """Rapikan whitespace: ' '.join(text.split())"""
+    apply = staticmethod(_collapse_whitespace)
+    spec = ('collapse_whitespace',)
+
+class Sub(Stage):
+    """
+    pattern.sub(repl, text). `guard` (opsional) membuat regex hanya
+    dijalankan jika teks bisa cocok:
+    - tuple substring: dijalankan jika salah satu substring ada di teks
+    - 'non_ascii': dijalankan jika teks mengandung karakter non-ASCII
+    Guard hanya boleh dipakai jika pattern memang tidak bisa cocok tanpanya.
+    """
+
+    def __init__(self, pattern, repl='', flags=0, guard=None):
+        self.pattern = pattern if isinstance(pattern, re.Pattern) else re.compile(pattern, flags)
+        self.repl = repl
+        self.guard = guard
+        self.spec = ('sub', self.pattern.pattern, self.pattern.flags, repl)
+        if guard == 'non_ascii':
+            self.apply = self._non_ascii
+        elif guard:
+            self.apply = self._substrings
+        else:
+            self.apply = self._always
+
+    def _always(self, text):
+        return self.pattern.sub(self.repl, text)
+
+    def _substrings(self, text):
+        for needle in self.guard:
+            if needle in text:
+                return self.pattern.sub(self.repl, text)
+        return text
+
+    def _non_ascii(self, text):
+        return text if text.isascii() else self.pattern.sub(self.repl, text)
+
+class TokenFilter(Stage):
+    """
+    Tahap per token (hasil identik dengan menjalankan langkah-langkah ini
+    berurutan pada seluruh teks):
+    1. ganti token lewat `replacements` (nilai '' = token dibuang)
+    2. karakter yang cocok dengan `special` (character class) -> spasi
+    3. buang token angka saja (drop_numeric) dan token 1 karakter kecuali
+       `keep_single`
+    4. gabungkan dengan satu spasi
+    Hasil per token unik di-cache, jadi kolom dengan kosakata berulang
+    hanya memproses setiap token sekali.
+    """
+
+    def __init__(self, replacements=None, special=None, drop_numeric=True, keep_single=()):
+        self.replacements = dict(replacements or {})
+        self.special = re.compile(special) if isinstance(special, str) else special
+        self.drop_numeric = drop_numeric
+        self.keep_single = tuple(keep_single)
+        self.spec = ('token_filter', sorted(self.replacements.items()),
+                     self.special.pattern if self.special else None, drop_numeric, self.keep_single)
+        # Tabel str.translate setara `special` untuk teks ASCII (lebih cepat dari regex)
+        self._ascii_table = ({c: ' ' for c in range(128) if self.special.match(chr(c))}
+                             if self.special else None)
+        self._cache = {}
+
+    def clean_token(self, word):
+        """Hasil tahap untuk satu token (bisa kosong atau beberapa kata)"""
+        text = self.replacements.get(word, word)
+        if self.special is not None:
+            if text.isascii():
+                text = text.translate(self._ascii_table)
+            else:
+                text = self.special.sub(' ', text)
+        keep_single = self.keep_single
+        return ' '.join([
+            part for part in text.split()
+            if (len(part) > 1 and not (self.drop_numeric and part.isdigit())) or part in keep_single
+        ])
+
+    def apply(self, text):
+        cache = self._cache
+        if len(cache) > MAX_TOKEN_CACHE:
+            cache.clear()
+        tokens = []
+        for word in text.split():
+            cleaned = cache.get(word)
+            if cleaned is None:
+                cleaned = cache[word] = self.clean_token(word)
+            if cleaned:
+                tokens.append(cleaned)
+        return ' '.join(tokens)
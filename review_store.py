@@ -0,0 +1,332 @@
+"""
+Penyimpanan review kanonik berbasis SQLite (data/reviews.db)
+
+Satu baris per review_id (upsert dari semua scraper), dengan index pada
+rating, review_date, dan app_version. Label & teks bersih tidak disalin:
+- content_clean: kolom turunan, diisi fill_content_clean() (NULL = belum)
+- reviews_3class / reviews_5class: view dengan kolom sentiment dari rating
+- dataset_members: daftar review_id (berurutan) untuk dataset hasil
+  sampling, mis. '3class_balanced' -- bukan salinan data
+
+Contoh:
+    store = ReviewStore()
+    df = store.query(view='reviews_3class', rating=3, last_days=30)
+
+CLI:
+    python review_store.py import data/gojek_reviews_raw_balanced.csv
+    python review_store.py import data/gojek_reviews_3class_raw_balanced.csv --dataset 3class_raw_balanced
+    python review_store.py clean
+    python review_store.py query --rating 3 --last-days 30 --out data/rating3_30d.csv
+"""
+
+from datetime import datetime, timedelta
+import argparse
+import os
+import sqlite3
+
+import pandas as pd
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+STORE_PATH = 'data/reviews.db'
+DEFAULT_APP_ID = 'com.gojek.app'
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'  # ISO-8601, mikrodetik (round-trip persis, urut leksikografis)
+
+REVIEW_COLUMNS = ['review_id', 'app_id', 'user_name', 'content', 'rating', 'thumbs_up',
+                  'app_version', 'review_date', 'reply_content', 'reply_date', 'scraped_at']
+DATE_COLUMNS = ['review_date', 'reply_date', 'scraped_at']
+
+# Nama kolom scraper (camelCase, lihat ReviewBuffer.FIELDS) -> kolom store
+SCRAPER_COLUMNS = {
+    'reviewId': 'review_id',
+    'userName': 'user_name',
+    'score': 'rating',
+    'thumbsUpCount': 'thumbs_up',
+    'reviewCreatedVersion': 'app_version',
+    'at': 'review_date',
+    'replyContent': 'reply_content',
+    'repliedAt': 'reply_date',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    review_id     TEXT PRIMARY KEY,
+    app_id        TEXT NOT NULL,
+    user_name     TEXT,
+    content       TEXT,
+    rating        INTEGER,
+    thumbs_up     INTEGER,
+    app_version   TEXT,
+    review_date   TEXT,
+    reply_content TEXT,
+    reply_date    TEXT,
+    scraped_at    TEXT,
+    content_clean TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_rating ON reviews(rating);
+CREATE INDEX IF NOT EXISTS idx_reviews_review_date ON reviews(review_date);
+CREATE INDEX IF NOT EXISTS idx_reviews_app_version ON reviews(app_version);
+CREATE INDEX IF NOT EXISTS idx_reviews_app_rating ON reviews(app_id, rating);
+
+CREATE TABLE IF NOT EXISTS dataset_members (
+    dataset   TEXT NOT NULL,
+    position  INTEGER NOT NULL,
+    review_id TEXT NOT NULL,
+    PRIMARY KEY (dataset, position)
+);
+
+CREATE VIEW IF NOT EXISTS reviews_3class AS
+SELECT *,
+       CASE WHEN rating <= 2 THEN 'negative'
+            WHEN rating = 3 THEN 'neutral'
+            ELSE 'positive' END AS sentiment
+FROM reviews;
+
+CREATE VIEW IF NOT EXISTS reviews_5class AS
+SELECT *,
+       CASE rating WHEN 1 THEN 'sangat_negatif'
+                   WHEN 2 THEN 'negatif'
+                   WHEN 3 THEN 'netral'
+                   WHEN 4 THEN 'positif'
+                   WHEN 5 THEN 'sangat_positif' END AS sentiment
+FROM reviews;
+"""
+
+_UPSERT_SQL = f"""
+INSERT INTO reviews ({', '.join(REVIEW_COLUMNS)})
+VALUES ({', '.join('?' for _ in REVIEW_COLUMNS)})
+ON CONFLICT(review_id) DO UPDATE SET
+    {', '.join(f'{c} = excluded.{c}' for c in REVIEW_COLUMNS if c != 'review_id')},
+    content_clean = CASE WHEN reviews.content IS excluded.content
+                         THEN reviews.content_clean ELSE NULL END
+"""
+
+# =====================================================
+# STORE
+# =====================================================
+def _format_dates(series):
+    """Tanggal apapun (datetime64 / string CSV) -> teks DATE_FORMAT (urut leksikografis)"""
+    return pd.to_datetime(series, errors='coerce').dt.strftime(DATE_FORMAT)
+
+def from_scraper_columns(df):
+    """Rename kolom camelCase scraper ke kolom store"""
+    return df.rename(columns=SCRAPER_COLUMNS)
+
+class ReviewStore:
+    """Store review kanonik di SQLite, key = review_id"""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute('SELECT COUNT(*) FROM reviews').fetchone()[0]
+
+    # ---------- tulis ----------
+    def upsert(self, df, app_id=DEFAULT_APP_ID):
+        """
+        Bulk upsert DataFrame berkolom store (review_id, user_name, ...).
+        Kolom yang tidak ada diisi NULL. content_clean di-reset hanya jika
+        content berubah. Return: jumlah baris yang ditulis.
+        """
+        df = df.drop_duplicates(subset=['review_id'], keep='first')
+        data = pd.DataFrame(index=df.index)
+        for column in REVIEW_COLUMNS:
+            if column not in df.columns:
+                data[column] = None
+            elif column in DATE_COLUMNS:
+                data[column] = _format_dates(df[column])
+            else:
+                data[column] = df[column]
+        data['app_id'] = data['app_id'].fillna(app_id)
+        data = data.astype(object)
+        data = data.where(data.notna(), None)
+        for column in ('rating', 'thumbs_up'):
+            data[column] = [None if v is None else int(v) for v in data[column]]
+        with self.conn:
+            self.conn.executemany(_UPSERT_SQL, data.itertuples(index=False, name=None))
+        return len(data)
+
+    def save_dataset(self, name, review_ids):
+        """Simpan keanggotaan dataset (urutan dipertahankan), menggantikan yang lama"""
+        with self.conn:
+            self.conn.execute('DELETE FROM dataset_members WHERE dataset = ?', (name,))
+            self.conn.executemany(
+                'INSERT INTO dataset_members (dataset, position, review_id) VALUES (?, ?, ?)',
+                ((name, position, review_id) for position, review_id in enumerate(review_ids))
+            )
+
+    def dataset_ids(self, name):
+        """review_id anggota dataset (urutan dataset); kosong jika dataset belum ada"""
+        rows = self.conn.execute(
+            'SELECT review_id FROM dataset_members WHERE dataset = ? ORDER BY position', (name,))
+        return [review_id for (review_id,) in rows]
+
+    def fill_content_clean(self, clean_fn, batch_size=5000):
+        """Isi content_clean untuk baris yang belum dibersihkan (atau content-nya berubah)"""
+        total = 0
+        while True:
+            rows = self.conn.execute(
+                'SELECT review_id, content FROM reviews WHERE content_clean IS NULL LIMIT ?',
+                (batch_size,)
+            ).fetchall()
+            if not rows:
+                return total
+            with self.conn:
+                self.conn.executemany(
+                    'UPDATE reviews SET content_clean = ? WHERE review_id = ?',
+                    ((clean_fn(content), review_id) for review_id, content in rows)
+                )
+            total += len(rows)
+
+    # ---------- baca ----------
+    def query(self, view='reviews', app_id=None, rating=None, since=None, until=None,
+              last_days=None, app_version=None, dataset=None, columns='*', limit=None):
+        """
+        Ambil subset review sebagai DataFrame.
+        - view: 'reviews', 'reviews_3class', atau 'reviews_5class'
+        - rating: int atau list of int
+        - since/until: datetime atau string; last_days: N hari terakhir
+        - dataset: hanya anggota dataset ini, dengan urutan dataset
+        """
+        if view not in ('reviews', 'reviews_3class', 'reviews_5class'):
+            raise ValueError(f'Unknown view: {view}')
+        if columns != '*':
+            columns = ', '.join(f'r.{c}' for c in columns)
+        else:
+            columns = 'r.*'
+        sql = f'SELECT {columns} FROM {view} r'
+        where, params = [], []
+        if dataset is not None:
+            sql += ' JOIN dataset_members m ON m.review_id = r.review_id'
+            where.append('m.dataset = ?')
+            params.append(dataset)
+        if app_id is not None:
+            where.append('r.app_id = ?')
+            params.append(app_id)
+        if rating is not None:
+            ratings = [rating] if isinstance(rating, int) else list(rating)
+            where.append(f'r.rating IN ({", ".join("?" for _ in ratings)})')
+            params.extend(ratings)
+        if last_days is not None:
+            since = datetime.now() - timedelta(days=last_days)
+        if since is not None:
+            where.append('r.review_date >= ?')
+            params.append(pd.Timestamp(since).strftime(DATE_FORMAT))
+        if until is not None:
+            where.append('r.review_date < ?')
+            params.append(pd.Timestamp(until).strftime(DATE_FORMAT))
+        if app_version is not None:
+            where.append('r.app_version = ?')
+            params.append(app_version)
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        if dataset is not None:
+            sql += ' ORDER BY m.position'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        df = pd.read_sql_query(sql, self.conn, params=params)
+        for column in DATE_COLUMNS:
+            if column in df.columns:
+                df[column] = pd.to_datetime(df[column], format='ISO8601')
+        return df
+
+    def counts(self, view='reviews_3class', app_id=None):
+        """Jumlah review per sentiment (atau per rating untuk view 'reviews')"""
+        key = 'rating' if view == 'reviews' else 'sentiment'
+        sql = f'SELECT {key}, COUNT(*) AS n FROM {view}'
+        params = []
+        if app_id is not None:
+            sql += ' WHERE app_id = ?'
+            params.append(app_id)
+        sql += f' GROUP BY {key} ORDER BY {key}'
+        return dict(self.conn.execute(sql, params).fetchall())
+
+# =====================================================
+# CLI
+# =====================================================
+def import_csv(store, path, app_id=DEFAULT_APP_ID, chunksize=20000, dataset=None):
+    """
+    Import CSV hasil scraper (kolom store atau camelCase) ke store.
+    dataset: simpan juga urutan review_id CSV sebagai dataset (mis. CSV
+    *_raw_balanced.csv lama -> '3class_raw_balanced')
+    """
+    total = 0
+    review_ids = []
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk = from_scraper_columns(chunk)
+        if 'review_id' not in chunk.columns:
+            raise ValueError(f'{path}: kolom review_id/reviewId tidak ditemukan')
+        total += store.upsert(chunk, app_id)
+        if dataset:
+            review_ids.extend(chunk['review_id'].tolist())
+    if dataset:
+        store.save_dataset(dataset, review_ids)
+    return total
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Review store (SQLite)')
+    parser.add_argument('--db', default=STORE_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_import = sub.add_parser('import', help='Import CSV hasil scraping')
+    p_import.add_argument('paths', nargs='+')
+    p_import.add_argument('--app-id', default=DEFAULT_APP_ID)
+    p_import.add_argument('--dataset', default=None,
+                          help='Simpan urutan review_id CSV sebagai dataset (hanya satu path)')
+
+    sub.add_parser('clean', help='Isi content_clean (clean_raw_data.clean_text)')
+
+    p_query = sub.add_parser('query', help='Ambil subset review')
+    p_query.add_argument('--view', default='reviews_3class',
+                         choices=['reviews', 'reviews_3class', 'reviews_5class'])
+    p_query.add_argument('--app-id', default=None)
+    p_query.add_argument('--rating', type=int, nargs='+', default=None)
+    p_query.add_argument('--last-days', type=int, default=None)
+    p_query.add_argument('--app-version', default=None)
+    p_query.add_argument('--dataset', default=None)
+    p_query.add_argument('--out', default=None, help='Simpan ke CSV (default: tampilkan ringkasan)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    with ReviewStore(args.db) as store:
+        if args.command == 'import':
+            if args.dataset and len(args.paths) != 1:
+                raise SystemExit('--dataset hanya untuk satu path CSV')
+            for path in args.paths:
+                count = import_csv(store, path, args.app_id, dataset=args.dataset)
+                print(f'✅ {path}: {count:,} rows upserted'
+                      + (f' (dataset {args.dataset})' if args.dataset else ''))
+            print(f'📊 Total di store: {len(store):,} reviews')
+        elif args.command == 'clean':
+            from clean_raw_data import clean_text
+            count = store.fill_content_clean(clean_text)
+            print(f'✅ content_clean diisi untuk {count:,} reviews')
+        elif args.command == 'query':
+            df = store.query(view=args.view, app_id=args.app_id, rating=args.rating,
+                             last_days=args.last_days, app_version=args.app_version,
+                             dataset=args.dataset)
+            if args.out:
+                df.to_csv(args.out, index=False)
+                print(f'✅ {args.out} ({len(df):,} rows)')
+            else:
+                print(df.head(10).to_string())
+                print(f'\n📊 {len(df):,} rows')
+
+if __name__ == '__main__':
+    main()
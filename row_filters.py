@@ -0,0 +1,96 @@
+"""
+Filter baris berbasis predicate bernama + bitmask alasan drop
+
+Pola lama `df = df[mask]` per langkah membuat salinan DataFrame baru di
+setiap langkah dan menghitung ulang jumlah baris dengan len(df[...]).
+RowFilter mengevaluasi semua predicate dalam satu pass di atas DataFrame
+asli (hanya mask boolean NumPy), menyimpan alasan drop per baris sebagai
+bitmask (bit ke-i = rule ke-i), lalu materialisasi hasil sekali.
+
+Urutan rule tetap bermakna seperti filter berantai: predicate menerima
+`alive` (baris yang belum di-drop rule sebelumnya), sehingga rule seperti
+duplikat bisa mengikuti semantik lama (kemunculan pertama di antara baris
+yang tersisa). Statistik per rule dikembalikan sebagai DataFrame terpisah.
+
+Contoh:
+    rows = (RowFilter()
+            .add('too_short', lambda df, alive: df['word_count'] < 3, '< 3 kata')
+            .add('duplicate', duplicated('content_clean'), 'content_clean duplikat'))
+    df_clean, stats = rows.apply(df)
+"""
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# PREDICATE UMUM
+# =====================================================
+def among_alive(column, fn):
+    """
+    Predicate dari fungsi per kolom: fn(Series `column` berisi baris yang
+    masih hidup saja) -> mask; baris yang sudah di-drop selalu False.
+    `column` berupa list: fn menerima DataFrame kolom-kolom tersebut.
+    """
+    def predicate(df, alive):
+        mask = np.zeros(len(df), dtype=bool)
+        if isinstance(column, str):
+            values = pd.Series(df[column].to_numpy()[alive])
+        else:
+            values = df[list(column)].iloc[alive].reset_index(drop=True)
+        mask[alive] = np.asarray(fn(values), dtype=bool)
+        return mask
+    return predicate
+
+def duplicated(column):
+    """Predicate: duplikat `column` di antara baris yang masih hidup (keep='first')"""
+    return among_alive(column, lambda values: values.duplicated())
+
+# =====================================================
+# FILTER
+# =====================================================
+class RowFilter:
+    """Daftar rule (nama, predicate, deskripsi) yang dievaluasi berurutan dalam satu pass"""
+
+    def __init__(self):
+        self.rules = []
+
+    def add(self, name, predicate, description=''):
+        """
+        predicate(df, alive) -> mask boolean (True = drop) sepanjang df.
+        `alive` = mask baris yang belum di-drop rule sebelumnya.
+        """
+        if len(self.rules) >= 64:
+            raise ValueError('RowFilter mendukung maksimal 64 rule (bitmask uint64)')
+        self.rules.append((name, predicate, description))
+        return self
+
+    def evaluate(self, df):
+        """
+        (reasons, stats): reasons = bitmask uint64 per baris (bit ke-i
+        jika rule ke-i cocok pada baris yang masih hidup saat itu), stats =
+        DataFrame per rule: matched (semua baris yang cocok), dropped
+        (baris yang di-drop oleh rule ini, bukan rule sebelumnya), remaining
+        """
+        alive = np.ones(len(df), dtype=bool)
+        reasons = np.zeros(len(df), dtype=np.uint64)
+        rows = []
+        for bit, (name, predicate, description) in enumerate(self.rules):
+            mask = np.asarray(predicate(df, alive), dtype=bool)
+            reasons |= mask.astype(np.uint64) << np.uint64(bit)
+            dropped = mask & alive
+            alive &= ~mask
+            rows.append({'rule': name, 'description': description, 'matched': int(mask.sum()),
+                         'dropped': int(dropped.sum()), 'remaining': int(alive.sum())})
+        stats = pd.DataFrame(rows, columns=['rule', 'description', 'matched', 'dropped', 'remaining'])
+        return reasons, stats
+
+    def apply(self, df):
+        """(df dengan baris yang lolos semua rule, stats) — materialisasi sekali"""
+        reasons, stats = self.evaluate(df)
+        return df[reasons == 0], stats
+
+    def reason_names(self, reasons):
+        """Bitmask -> string nama rule dipisah '|' (kosong jika lolos), untuk inspeksi"""
+        names = [name for name, _, _ in self.rules]
+        return pd.Series(reasons).map(
+            lambda bits: '|'.join(name for bit, name in enumerate(names) if int(bits) >> bit & 1))
@@ -7,17 +7,26 @@ Target: 15.000 reviews SEIMBANG
 - 5 kelas: masing-masing 3.000 per rating
 
 Output:
-- data/gojek_reviews_raw_balanced.csv
-- data/gojek_reviews_3class_raw_balanced.csv  
-- data/gojek_reviews_5class_raw_balanced.csv
+- data/reviews.db (ReviewStore): semua review sekali, key review_id
+  + dataset '3class_raw_balanced' & '5class_raw_balanced' (daftar review_id)
+- Opsional (WRITE_CSV_COPIES=True), export CSV:
+  - data/gojek_reviews_raw_balanced.csv
+  - data/gojek_reviews_3class_raw_balanced.csv
+  - data/gojek_reviews_5class_raw_balanced.csv
 """
 
 import pandas as pd
-from google_play_scraper import reviews, Sort
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 import os
 
+from balancing import balanced_positions, bottom_k_positions, membership_delta
+from review_store import ReviewStore
+from scraping_utils import (TokenBucket, ScrapeCheckpoint, ReviewIndex, RetryPolicy, ReviewBuffer,
+                            scrape_stream, sentiment_3class, sentiment_5class, SENTIMENT_5CLASS)
+
 # =====================================================
 # KONFIGURASI
 # =====================================================
@@ -29,6 +38,33 @@ COUNTRY = 'id'
 # Target per rating untuk 5 kelas (total 15.000)
 TARGET_PER_RATING = 3000  # 3.000 x 5 rating = 15.000
 
+# Mode concurrent: 5 stream rating sekaligus, dibatasi satu rate limiter global
+CONCURRENT = True
+MAX_REQUESTS_PER_SECOND = 3.0  # Budget kesopanan total (semua stream)
+
+# Retry & pacing: jeda adaptif (AIMD), backoff eksponensial, maks 5 error beruntun
+RETRY_POLICY = RetryPolicy(initial_delay=0.3, min_delay=0.1, backoff_base=3.0, max_retries=5)
+
+# Checkpoint: log per rating + continuation token, agar bisa resume setelah crash
+CHECKPOINT_DIR = 'data/checkpoints/scrape_balanced_reviews'
+
+# Mode inkremental: hanya ambil review baru per rating (reviewId & watermark)
+INCREMENTAL = False
+INDEX_DIR = 'data/review_index'
+
+# Sampling per kelas: False (default) = sample(random_state=42) seperti sebelumnya;
+# True (opt-in) = bottom-k berdasarkan hash review_id (stabil: review baru hanya
+# menambah/menggeser baris marjinal), tetapi review terpilih berbeda dari mode sample
+HASH_SAMPLING = False
+
+# Store review kanonik (SQLite): review ditulis sekali, label 3/5 kelas
+# berupa view & dataset balanced berupa daftar review_id
+REVIEW_STORE_PATH = 'data/reviews.db'
+WRITE_CSV_COPIES = False  # True: export juga 3 CSV (raw, 3class, 5class); clean_raw_data membaca store
+RAW_CSV_PATH = 'data/gojek_reviews_raw_balanced.csv'
+RAW_COLUMNS = ['review_id', 'user_name', 'content', 'rating', 'thumbs_up', 'app_version',
+               'review_date', 'reply_content', 'reply_date', 'scraped_at']
+
 # Target per sentiment untuk 3 kelas (total 15.000)
 TARGET_3CLASS = {
     'negative': 5000,   # rating 1-2
@@ -41,10 +77,66 @@ os.makedirs('data', exist_ok=True)
 # =====================================================
 # FUNGSI SCRAPING PER RATING
 # =====================================================
-def scrape_by_score(target_per_score=3000):
+class ProgressBoard:
+    """Progress per rating, aman dipakai dari beberapa thread"""
+
+    def __init__(self, target_per_score, scores=(1, 2, 3, 4, 5)):
+        self.target = target_per_score
+        self.counts = {score: 0 for score in scores}
+        self._lock = threading.Lock()
+
+    def update(self, score, current):
+        with self._lock:
+            self.counts[score] = current
+            parts = [f'R{s}: {c:,}/{self.target:,}' for s, c in self.counts.items()]
+            print(f'\r   📥 {" | ".join(parts)}', end='')
+
+def scrape_single_score(score, target_per_score, limiter=None, board=None, checkpoint=None,
+                        index=None):
+    """
+    Scrape satu stream rating (filter_score_with=score) sampai target tercapai.
+
+    Jika `limiter` diberikan, setiap request menunggu token dari limiter global
+    (mode concurrent). Jeda antar request & retry mengikuti RETRY_POLICY.
+    Jika `checkpoint` diberikan, setiap batch langsung ditulis ke disk dan
+    scraping dilanjutkan dari continuation token terakhir.
+    Jika `index` (ReviewIndex) diberikan, hanya review baru yang diambil dan
+    paging berhenti begitu watermark rating ini terlewati.
+    """
+    def on_progress(current):
+        if board is not None:
+            board.update(score, min(current, target_per_score))
+        else:
+            pct = min(current / target_per_score * 100, 100)
+            print(f'\r   📥 Rating {score}: {current:,}/{target_per_score:,} ({pct:.1f}%)', end='')
+    
+    return scrape_stream(
+        APP_ID,
+        target_per_score,
+        lang=LANG,
+        country=COUNTRY,
+        score=score,  # Filter by specific score!
+        batch_size=BATCH_SIZE,
+        limiter=limiter,
+        checkpoint=checkpoint,
+        stream=f'score_{score}',
+        index=index,
+        on_progress=on_progress,
+        label=f'rating {score}',
+        policy=RETRY_POLICY,
+        buffer=ReviewBuffer()
+    )
+
+def scrape_by_score(target_per_score=3000, concurrent=CONCURRENT, max_rps=MAX_REQUESTS_PER_SECOND,
+                    checkpoint=None, index=None):
     """
     Scrape reviews dengan filter per score (1-5)
     Untuk mendapatkan data yang seimbang per rating
+
+    concurrent=True: kelima stream rating berjalan bersamaan di thread pool,
+    dibatasi satu token bucket global (max_rps request/detik).
+    checkpoint: ScrapeCheckpoint opsional untuk resume per rating.
+    index: ReviewIndex opsional untuk mode inkremental (hanya review baru).
     """
     print('=' * 60)
     print('🔄 SCRAPING GOJEK REVIEWS - BALANCED MODE')
@@ -52,68 +144,39 @@ def scrape_by_score(target_per_score=3000):
     print(f'App ID: {APP_ID}')
     print(f'Target per rating: {target_per_score:,} reviews')
     print(f'Total target: {target_per_score * 5:,} reviews')
+    if concurrent:
+        print(f'Mode: concurrent (5 stream, max {max_rps} request/detik)')
+    else:
+        print('Mode: sekuensial')
     print('=' * 60)
     
-    all_reviews = {1: [], 2: [], 3: [], 4: [], 5: []}
+    all_reviews = {score: ReviewBuffer() for score in [1, 2, 3, 4, 5]}
     
     start_time = time.time()
     
-    for score in [1, 2, 3, 4, 5]:
-        print(f'\n⭐ Scraping rating {score}...')
-        continuation_token = None
-        batch_num = 0
-        consecutive_empty = 0
-        
-        while len(all_reviews[score]) < target_per_score:
-            batch_num += 1
-            
-            try:
-                result, continuation_token = reviews(
-                    APP_ID,
-                    lang=LANG,
-                    country=COUNTRY,
-                    sort=Sort.NEWEST,
-                    count=BATCH_SIZE,
-                    filter_score_with=score,  # Filter by specific score!
-                    continuation_token=continuation_token
-                )
-                
-                if not result:
-                    consecutive_empty += 1
-                    if consecutive_empty >= 3:
-                        print(f'\n   ⚠️ No more reviews for rating {score}')
-                        print(f'   Got {len(all_reviews[score]):,} reviews (target: {target_per_score:,})')
-                        break
-                    time.sleep(1)
-                    continue
-                
-                consecutive_empty = 0
-                all_reviews[score].extend(result)
-                
-                # Progress
-                current = len(all_reviews[score])
-                pct = min(current / target_per_score * 100, 100)
-                print(f'\r   📥 Rating {score}: {current:,}/{target_per_score:,} ({pct:.1f}%)', end='')
-                
-                # Rate limiting
-                time.sleep(0.3)
-                
-                # Stop if we have enough
-                if len(all_reviews[score]) >= target_per_score:
-                    all_reviews[score] = all_reviews[score][:target_per_score]
-                    break
-                    
-            except Exception as e:
-                print(f'\n   ❌ Error: {e}')
-                time.sleep(3)
-                continue
-        
-        print(f'\n   ✅ Rating {score}: {len(all_reviews[score]):,} reviews collected')
-    
-    # Combine all reviews
-    combined = []
-    for score in [1, 2, 3, 4, 5]:
-        combined.extend(all_reviews[score])
+    if concurrent:
+        limiter = TokenBucket(rate=max_rps)
+        board = ProgressBoard(target_per_score)
+        print()
+        with ThreadPoolExecutor(max_workers=len(all_reviews)) as executor:
+            futures = {
+                executor.submit(scrape_single_score, score, target_per_score,
+                                limiter, board, checkpoint, index): score
+                for score in all_reviews
+            }
+            for future in as_completed(futures):
+                score = futures[future]
+                all_reviews[score] = future.result()
+                print(f'\n   ✅ Rating {score}: {len(all_reviews[score]):,} reviews collected')
+    else:
+        for score in [1, 2, 3, 4, 5]:
+            print(f'\n⭐ Scraping rating {score}...')
+            all_reviews[score] = scrape_single_score(score, target_per_score,
+                                                     checkpoint=checkpoint, index=index)
+            print(f'\n   ✅ Rating {score}: {len(all_reviews[score]):,} reviews collected')
+    
+    # Combine all reviews (urut rating 1-5)
+    combined = ReviewBuffer.concat(all_reviews[score] for score in [1, 2, 3, 4, 5])
     
     elapsed = time.time() - start_time
     print(f'\n\n✅ Scraping completed in {elapsed/60:.1f} minutes')
@@ -122,15 +185,10 @@ def scrape_by_score(target_per_score=3000):
     return combined, all_reviews
 
 def process_to_dataframe(reviews_data):
-    """Convert to DataFrame"""
+    """Convert ReviewBuffer to DataFrame"""
     print('\n📝 Processing to DataFrame...')
     
-    df = pd.DataFrame(reviews_data)
-    
-    # Select columns
-    cols = ['reviewId', 'userName', 'content', 'score', 'thumbsUpCount', 
-            'reviewCreatedVersion', 'at', 'replyContent', 'repliedAt']
-    df = df[[c for c in cols if c in df.columns]]
+    df = reviews_data.to_dataframe()
     
     # Rename
     rename_map = {
@@ -151,41 +209,36 @@ def process_to_dataframe(reviews_data):
     print(f'✅ DataFrame: {len(df):,} rows')
     return df
 
+def take_balanced(df, labels, classes, target_per_class, hash_sampling=HASH_SAMPLING):
+    """
+    Undersampling per kelas dari `labels` (Series sejajar dengan df), lalu
+    shuffle. Hasil sama dengan sample per kelas dari salinan df berlabel,
+    tetapi hanya baris terpilih yang disalin (kolom 'sentiment' di akhir).
+    hash_sampling: bottom-k per kelas berdasarkan hash review_id (urutan = urutan hash).
+    """
+    counts = labels.value_counts()
+    for sentiment in classes:
+        if counts.get(sentiment, 0) < target_per_class:
+            # If not enough, take all
+            print(f'   ⚠️ {sentiment}: only {counts.get(sentiment, 0)} available (target: {target_per_class})')
+    
+    if hash_sampling:
+        picked = bottom_k_positions(labels, df['review_id'], classes, target=target_per_class)
+    else:
+        picked = balanced_positions(labels, classes, target=target_per_class, seed=42)
+    df_balanced = df.take(picked).reset_index(drop=True)
+    df_balanced['sentiment'] = labels.to_numpy()[picked]
+    return df_balanced
+
 def create_3class_balanced(df, target_per_class=5000):
     """
     Create balanced 3-class dataset
     """
     print('\n🏷️ Creating BALANCED 3-class labels...')
     
-    df_copy = df.copy()
-    
-    # Map rating to sentiment
-    def map_3class(rating):
-        if rating <= 2:
-            return 'negative'
-        elif rating == 3:
-            return 'neutral'
-        else:
-            return 'positive'
-    
-    df_copy['sentiment'] = df_copy['rating'].apply(map_3class)
-    
-    # Balance by undersampling
-    balanced_dfs = []
-    for sentiment in ['negative', 'neutral', 'positive']:
-        df_class = df_copy[df_copy['sentiment'] == sentiment]
-        
-        if len(df_class) >= target_per_class:
-            df_sampled = df_class.sample(n=target_per_class, random_state=42)
-        else:
-            # If not enough, take all
-            df_sampled = df_class
-            print(f'   ⚠️ {sentiment}: only {len(df_class)} available (target: {target_per_class})')
-        
-        balanced_dfs.append(df_sampled)
-    
-    df_balanced = pd.concat(balanced_dfs, ignore_index=True)
-    df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+    # Label = satu kolom di atas df yang sama; hanya baris terpilih yang disalin
+    labels = sentiment_3class(df['rating'])
+    df_balanced = take_balanced(df, labels, ['negative', 'neutral', 'positive'], target_per_class)
     
     print('\n📊 3-Class Balanced Distribution:')
     for sentiment, count in df_balanced['sentiment'].value_counts().items():
@@ -199,33 +252,9 @@ def create_5class_balanced(df, target_per_class=3000):
     """
     print('\n🏷️ Creating BALANCED 5-class labels...')
     
-    df_copy = df.copy()
-    
-    label_map = {
-        1: 'sangat_negatif',
-        2: 'negatif', 
-        3: 'netral',
-        4: 'positif',
-        5: 'sangat_positif'
-    }
-    df_copy['sentiment'] = df_copy['rating'].map(label_map)
-    
-    # Balance by undersampling
-    balanced_dfs = []
-    for rating in [1, 2, 3, 4, 5]:
-        sentiment = label_map[rating]
-        df_class = df_copy[df_copy['rating'] == rating]
-        
-        if len(df_class) >= target_per_class:
-            df_sampled = df_class.sample(n=target_per_class, random_state=42)
-        else:
-            df_sampled = df_class
-            print(f'   ⚠️ {sentiment}: only {len(df_class)} available (target: {target_per_class})')
-        
-        balanced_dfs.append(df_sampled)
-    
-    df_balanced = pd.concat(balanced_dfs, ignore_index=True)
-    df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+    labels = sentiment_5class(df['rating'])
+    df_balanced = take_balanced(df, labels, [SENTIMENT_5CLASS[r] for r in [1, 2, 3, 4, 5]],
+                                target_per_class)
     
     print('\n📊 5-Class Balanced Distribution:')
     order = ['sangat_negatif', 'negatif', 'netral', 'positif', 'sangat_positif']
@@ -236,12 +265,32 @@ def create_5class_balanced(df, target_per_class=3000):
     
     return df_balanced
 
-def save_data(df_raw, df_3class, df_5class):
+def load_previous(store):
+    """Review dari run sebelumnya: dari store, atau CSV lama jika store masih kosong"""
+    if len(store):
+        return store.query(app_id=APP_ID, columns=RAW_COLUMNS)
+    if os.path.exists(RAW_CSV_PATH):
+        return pd.read_csv(RAW_CSV_PATH)
+    return None
+
+def save_data(df_raw, df_3class, df_5class, store):
     """Save all data"""
     print('\n💾 Saving data...')
     
+    # Store: upsert review (sekali) + keanggotaan dataset balanced
+    store.upsert(df_raw, APP_ID)
+    for name, df_balanced in [('3class_raw_balanced', df_3class), ('5class_raw_balanced', df_5class)]:
+        added, removed = membership_delta(store.dataset_ids(name), df_balanced['review_id'])
+        store.save_dataset(name, df_balanced['review_id'])
+        print(f'   {name}: +{len(added):,} / -{len(removed):,} review dibanding sebelumnya')
+    print(f'   ✅ {REVIEW_STORE_PATH} ({len(store):,} reviews, '
+          f'datasets: 3class_raw_balanced, 5class_raw_balanced)')
+    
+    if not WRITE_CSV_COPIES:
+        return
+    
     # Save raw
-    df_raw.to_csv('data/gojek_reviews_raw_balanced.csv', index=False)
+    df_raw.to_csv(RAW_CSV_PATH, index=False)
     print(f'   ✅ data/gojek_reviews_raw_balanced.csv ({len(df_raw):,} rows)')
     
     # Save 3-class
@@ -259,10 +308,18 @@ def main():
     print(f'Started: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
     print('=' * 60)
     
-    # Scrape per rating
-    reviews_data, reviews_by_score = scrape_by_score(target_per_score=TARGET_PER_RATING)
+    # Scrape per rating (resume otomatis jika ada checkpoint dari run sebelumnya)
+    checkpoint = ScrapeCheckpoint(CHECKPOINT_DIR)
+    index = ReviewIndex(INDEX_DIR)
+    reviews_data, reviews_by_score = scrape_by_score(target_per_score=TARGET_PER_RATING,
+                                                     checkpoint=checkpoint,
+                                                     index=index if INCREMENTAL else None)
     
     if not reviews_data:
+        if INCREMENTAL:
+            print('✓ No new reviews since last run')
+            checkpoint.clear()
+            return
         print('❌ No reviews collected!')
         return
     
@@ -274,6 +331,14 @@ def main():
     # Process to DataFrame
     df_raw = process_to_dataframe(reviews_data)
     
+    store = ReviewStore(REVIEW_STORE_PATH)
+    df_previous = load_previous(store) if INCREMENTAL else None
+    if df_previous is not None:
+        # Gabungkan review baru dengan hasil run sebelumnya
+        df_raw = pd.concat([df_raw, df_previous], ignore_index=True)
+        df_raw = df_raw.drop_duplicates(subset=['review_id'], keep='first')
+        print(f'♻️ Incremental: {len(reviews_data):,} new + {len(df_previous):,} existing reviews')
+    
     # Create balanced 3-class (5000 per class = 15000 total)
     df_3class = create_3class_balanced(df_raw, target_per_class=5000)
     
@@ -281,7 +346,13 @@ def main():
     df_5class = create_5class_balanced(df_raw, target_per_class=3000)
     
     # Save
-    save_data(df_raw, df_3class, df_5class)
+    save_data(df_raw, df_3class, df_5class, store)
+    store.close()
+    
+    # Output final sudah aman: catat ke index, checkpoint tidak diperlukan lagi
+    index.record(APP_ID, reviews_data.iter_rows())
+    index.save()
+    checkpoint.clear()
     
     # Final summary
     print('\n' + '=' * 60)
@@ -0,0 +1,217 @@
+"""
+Script untuk Scraping Review BANYAK APLIKASI & LOCALE sekaligus
+dari Google Play Store (Gojek, Grab, Maxim)
+
+Setiap kombinasi (app, lang, country, rating) adalah satu job. Semua job
+dijalankan di thread pool dan berbagi budget request per host, sehingga
+total request ke Play Store tetap sopan berapapun jumlah job-nya.
+
+Output (dipartisi per app & locale):
+- data/multi_app/<app_name>/<lang>_<country>/reviews_raw.csv
+
+Jalankan:
+    python scrape_multi_app.py
+    python scrape_multi_app.py --apps gojek grab --locales id:id en:id --target 1000
+"""
+
+import pandas as pd
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import argparse
+import threading
+import time
+import os
+
+from review_store import ReviewStore
+from scraping_utils import (HostRateBudget, RetryPolicy, ScrapeCheckpoint, ReviewBuffer,
+                            scrape_stream, PLAY_STORE_HOST)
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+APPS = {
+    'gojek': 'com.gojek.app',
+    'grab': 'com.grabtaxi.passenger',
+    'maxim': 'com.taxsee.taxsee',
+}
+LOCALES = [('id', 'id')]            # (lang, country)
+SCORES = [1, 2, 3, 4, 5]            # None = tanpa filter rating
+TARGET_PER_JOB = 3000               # Review per (app, locale, rating)
+BATCH_SIZE = 200
+MAX_WORKERS = 8
+
+# Budget request per detik per host (dibagi semua worker)
+HOST_RATE_LIMITS = {PLAY_STORE_HOST: 3.0}
+
+# Retry & pacing per job: jeda adaptif (AIMD), backoff eksponensial, maks 5 error beruntun
+RETRY_POLICY = RetryPolicy(initial_delay=0.3, min_delay=0.1, backoff_base=3.0, max_retries=5)
+
+OUTPUT_DIR = 'data/multi_app'
+REVIEW_STORE_PATH = 'data/reviews.db'  # Semua partisi juga di-upsert ke store
+CHECKPOINT_DIR = 'data/checkpoints/scrape_multi_app'
+
+ScrapeJob = namedtuple('ScrapeJob', ['app_name', 'app_id', 'lang', 'country', 'score'])
+
+# =====================================================
+# JOB MATRIX
+# =====================================================
+def build_jobs(apps=APPS, locales=LOCALES, scores=SCORES):
+    """Bangun matrix job (app x locale x rating)"""
+    jobs = []
+    for app_name, app_id in apps.items():
+        for lang, country in locales:
+            for score in (scores or [None]):
+                jobs.append(ScrapeJob(app_name, app_id, lang, country, score))
+    return jobs
+
+def job_stream_name(job):
+    score = job.score if job.score is not None else 'all'
+    return f'{job.app_name}_{job.lang}_{job.country}_score_{score}'
+
+def partition_path(app_name, lang, country):
+    return os.path.join(OUTPUT_DIR, app_name, f'{lang}_{country}', 'reviews_raw.csv')
+
+# =====================================================
+# PROSES DATA
+# =====================================================
+def to_dataframe(reviews_data, job):
+    """Convert ReviewBuffer satu job ke DataFrame (kolom sama dengan scrape_balanced_reviews)"""
+    df = reviews_data.to_dataframe()
+    df = df.rename(columns={
+        'reviewId': 'review_id',
+        'userName': 'user_name',
+        'score': 'rating',
+        'thumbsUpCount': 'thumbs_up',
+        'reviewCreatedVersion': 'app_version',
+        'at': 'review_date',
+        'replyContent': 'reply_content',
+        'repliedAt': 'reply_date'
+    })
+    df['app_name'] = job.app_name
+    df['app_id'] = job.app_id
+    df['lang'] = job.lang
+    df['country'] = job.country
+    df['scraped_at'] = datetime.now()
+    return df
+
+# =====================================================
+# EKSEKUSI
+# =====================================================
+def run_jobs(jobs, target_per_job=TARGET_PER_JOB, max_workers=MAX_WORKERS,
+             host_rates=HOST_RATE_LIMITS, checkpoint=None):
+    """
+    Jalankan semua job di thread pool dengan budget request per host.
+    Return: dict {(app_name, lang, country): [DataFrame per job]}
+    """
+    budget = HostRateBudget(host_rates)
+    limiter = budget.limiter_for(PLAY_STORE_HOST)
+    progress = {job: 0 for job in jobs}
+    lock = threading.Lock()
+    total_target = target_per_job * len(jobs)
+
+    def report(job, current):
+        with lock:
+            progress[job] = min(current, target_per_job)
+            done = sum(progress.values())
+            print(f'\r   📥 Total: {done:,}/{total_target:,} ({done / total_target * 100:.1f}%)', end='')
+
+    def run(job):
+        label = f'{job.app_name} [{job.lang}-{job.country}] rating {job.score or "all"}'
+        return scrape_stream(
+            job.app_id,
+            target_per_job,
+            lang=job.lang,
+            country=job.country,
+            score=job.score,
+            batch_size=BATCH_SIZE,
+            limiter=limiter,
+            checkpoint=checkpoint,
+            stream=job_stream_name(job),
+            on_progress=lambda current: report(job, current),
+            label=label,
+            policy=RETRY_POLICY,
+            buffer=ReviewBuffer()
+        )
+
+    partitions = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            result = future.result()
+            key = (job.app_name, job.lang, job.country)
+            partitions.setdefault(key, []).append(to_dataframe(result, job))
+            print(f'\n   ✅ {job.app_name} [{job.lang}-{job.country}] '
+                  f'rating {job.score or "all"}: {len(result):,} reviews')
+
+    return partitions
+
+def save_partitions(partitions, store=None):
+    """Simpan satu CSV per (app, locale), dan upsert ke ReviewStore jika diberikan"""
+    print('\n💾 Saving partitions...')
+    summary = []
+    for (app_name, lang, country), frames in sorted(partitions.items()):
+        df = pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset=['review_id'])
+        path = partition_path(app_name, lang, country)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        df.to_csv(path, index=False)
+        print(f'   ✅ {path} ({len(df):,} rows)')
+        if store is not None:
+            store.upsert(df, APPS.get(app_name))
+        summary.append((app_name, lang, country, len(df)))
+    return summary
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Scrape review multi-app & multi-locale')
+    parser.add_argument('--apps', nargs='+', default=list(APPS),
+                        help=f'Nama app ({", ".join(APPS)})')
+    parser.add_argument('--locales', nargs='+', default=[f'{l}:{c}' for l, c in LOCALES],
+                        help='Locale dalam format lang:country, mis. id:id en:id')
+    parser.add_argument('--scores', nargs='*', type=int, default=SCORES,
+                        help='Filter rating per job (kosong = tanpa filter)')
+    parser.add_argument('--target', type=int, default=TARGET_PER_JOB,
+                        help='Target review per job')
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS)
+    parser.add_argument('--rps', type=float, default=HOST_RATE_LIMITS[PLAY_STORE_HOST],
+                        help='Budget request/detik ke Play Store (semua worker)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    apps = {name: APPS[name] for name in args.apps}
+    locales = [tuple(locale.split(':')) for locale in args.locales]
+    jobs = build_jobs(apps, locales, args.scores)
+
+    print('\n' + '=' * 60)
+    print('📱 MULTI-APP REVIEW SCRAPER')
+    print('=' * 60)
+    print(f'Started: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
+    print(f'Apps: {", ".join(apps)}')
+    print(f'Locales: {", ".join(f"{l}-{c}" for l, c in locales)}')
+    print(f'Jobs: {len(jobs)} | Workers: {args.workers} | Budget: {args.rps} request/detik')
+    print(f'Target per job: {args.target:,}')
+    print('=' * 60)
+
+    start_time = time.time()
+    checkpoint = ScrapeCheckpoint(CHECKPOINT_DIR)
+    partitions = run_jobs(jobs, target_per_job=args.target, max_workers=args.workers,
+                          host_rates={PLAY_STORE_HOST: args.rps}, checkpoint=checkpoint)
+    with ReviewStore(REVIEW_STORE_PATH) as store:
+        summary = save_partitions(partitions, store)
+        print(f'   ✅ {REVIEW_STORE_PATH} ({len(store):,} reviews)')
+
+    # Output final sudah aman, checkpoint tidak diperlukan lagi
+    checkpoint.clear()
+
+    elapsed = time.time() - start_time
+    print('\n' + '=' * 60)
+    print('📊 FINAL SUMMARY')
+    print('=' * 60)
+    for app_name, lang, country, count in summary:
+        print(f'   {app_name:6} [{lang}-{country}]: {count:,} reviews')
+    print(f'\n✅ MULTI-APP SCRAPING COMPLETED in {elapsed/60:.1f} minutes')
+
+if __name__ == '__main__':
+    main()
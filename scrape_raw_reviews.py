@@ -4,16 +4,20 @@ Menghasilkan data MENTAH (RAW) tanpa cleaning
 
 Output:
 - data/gojek_reviews_raw.csv (semua data mentah)
-- data/gojek_reviews_3class_raw.csv (dengan label 3 kelas)
-- data/gojek_reviews_5class_raw.csv (dengan label 5 kelas)
+- data/reviews.db (ReviewStore; label 3/5 kelas = view reviews_3class/reviews_5class)
+- Opsional (WRITE_CSV_COPIES=True):
+  - data/gojek_reviews_3class_raw.csv (dengan label 3 kelas)
+  - data/gojek_reviews_5class_raw.csv (dengan label 5 kelas)
 """
 
 import pandas as pd
-from google_play_scraper import reviews, Sort
 from datetime import datetime
-import time
 import os
 
+from review_store import ReviewStore, from_scraper_columns
+from scraping_utils import (ScrapeCheckpoint, ReviewIndex, RetryPolicy, ReviewBuffer,
+                            iter_review_batches, sentiment_3class, sentiment_5class)
+
 # =====================================================
 # KONFIGURASI
 # =====================================================
@@ -22,6 +26,20 @@ TOTAL_REVIEWS = 15000     # Target 15.000 reviews
 BATCH_SIZE = 200          # Jumlah review per batch
 LANG = 'id'               # Bahasa Indonesia
 COUNTRY = 'id'            # Indonesia
+CHECKPOINT_DIR = 'data/checkpoints/scrape_raw_reviews'  # Untuk resume setelah crash
+
+# Retry & pacing: jeda adaptif (AIMD) mulai 1 detik, backoff eksponensial
+# mulai 5 detik saat error, berhenti setelah 5 error berturut-turut
+RETRY_POLICY = RetryPolicy(initial_delay=1.0, min_delay=0.3, backoff_base=5.0, max_retries=5)
+
+# Mode inkremental: hanya ambil review baru (berdasarkan reviewId & watermark)
+INCREMENTAL = False
+INDEX_DIR = 'data/review_index'
+
+# Store review kanonik (SQLite); label tersedia sebagai view, jadi salinan
+# CSV berlabel hanya ditulis jika diminta (export untuk tool di luar repo)
+REVIEW_STORE_PATH = 'data/reviews.db'
+WRITE_CSV_COPIES = False
 
 # Buat folder data jika belum ada
 os.makedirs('data', exist_ok=True)
@@ -29,9 +47,32 @@ os.makedirs('data', exist_ok=True)
 # =====================================================
 # FUNGSI SCRAPING
 # =====================================================
-def scrape_gojek_reviews(target_count=10000):
+def iter_gojek_review_batches(target_count=10000, checkpoint=None, index=None):
+    """Generator batch review Gojek (lihat scraping_utils.iter_review_batches)"""
+    return iter_review_batches(
+        APP_ID,
+        lang=LANG,
+        country=COUNTRY,
+        batch_size=BATCH_SIZE,
+        limit=target_count,
+        checkpoint=checkpoint,
+        stream='all',
+        index=index,
+        policy=RETRY_POLICY,
+        label='all',
+        empty_retries=1
+    )
+
+def scrape_gojek_reviews(target_count=10000, checkpoint=None, index=None):
     """
     Scrape reviews dari Google Play Store
+
+    Jika `checkpoint` diberikan, setiap batch langsung ditulis ke disk dan
+    scraping dilanjutkan dari continuation token terakhir.
+    Jika `index` (ReviewIndex) diberikan, hanya review baru yang diambil dan
+    paging berhenti begitu halaman sudah mencapai data yang dikenal.
+
+    Return: ReviewBuffer (kolumnar, field diproyeksikan saat batch masuk)
     """
     print('=' * 60)
     print('🔄 SCRAPING GOJEK REVIEWS FROM GOOGLE PLAY STORE')
@@ -41,66 +82,21 @@ def scrape_gojek_reviews(target_count=10000):
     print(f'Language: {LANG}, Country: {COUNTRY}')
     print('-' * 60)
     
-    all_reviews = []
-    continuation_token = None
-    batch_num = 0
-    
-    while len(all_reviews) < target_count:
-        batch_num += 1
-        try:
-            # Scrape batch
-            result, continuation_token = reviews(
-                APP_ID,
-                lang=LANG,
-                country=COUNTRY,
-                sort=Sort.NEWEST,  # Ambil yang terbaru
-                count=BATCH_SIZE,
-                continuation_token=continuation_token
-            )
-            
-            if not result:
-                print(f'⚠️ No more reviews available')
-                break
-            
-            all_reviews.extend(result)
-            print(f'📥 Batch {batch_num}: Got {len(result)} reviews | Total: {len(all_reviews)}')
-            
-            # Jika tidak ada token lanjutan, berarti sudah habis
-            if continuation_token is None:
-                print('✓ Reached end of reviews')
-                break
-            
-            # Delay untuk menghindari rate limiting
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f'❌ Error at batch {batch_num}: {e}')
-            time.sleep(5)  # Wait longer on error
-            continue
+    all_reviews = ReviewBuffer()
+    for batch_num, batch in enumerate(iter_gojek_review_batches(target_count, checkpoint, index), 1):
+        all_reviews.extend(batch)
+        print(f'📥 Batch {batch_num}: Got {len(batch)} reviews | Total: {len(all_reviews)}')
     
     print(f'\n✓ Total scraped: {len(all_reviews)} reviews')
     return all_reviews
 
 def create_dataframe(reviews_data):
     """
-    Convert reviews data ke DataFrame
+    Convert ReviewBuffer ke DataFrame
+    Kolom: reviewId, userName, content (teks MENTAH), score (1-5),
+    thumbsUpCount, reviewCreatedVersion, at, replyContent, repliedAt
     """
-    data = []
-    for review in reviews_data:
-        data.append({
-            'reviewId': review.get('reviewId', ''),
-            'userName': review.get('userName', ''),
-            'content': review.get('content', ''),  # Review text MENTAH
-            'score': review.get('score', 0),       # Rating 1-5
-            'thumbsUpCount': review.get('thumbsUpCount', 0),
-            'reviewCreatedVersion': review.get('reviewCreatedVersion', ''),
-            'at': review.get('at', ''),            # Tanggal review
-            'replyContent': review.get('replyContent', ''),
-            'repliedAt': review.get('repliedAt', '')
-        })
-    
-    df = pd.DataFrame(data)
-    return df
+    return reviews_data.to_dataframe()
 
 def add_3class_labels(df):
     """
@@ -109,15 +105,7 @@ def add_3class_labels(df):
     - neutral: rating 3
     - positive: rating 4-5
     """
-    def get_sentiment_3class(score):
-        if score <= 2:
-            return 'negative'
-        elif score == 3:
-            return 'neutral'
-        else:
-            return 'positive'
-    
-    df['sentiment'] = df['score'].apply(get_sentiment_3class)
+    df['sentiment'] = sentiment_3class(df['score'])
     return df
 
 def add_5class_labels(df):
@@ -129,14 +117,7 @@ def add_5class_labels(df):
     - positif: rating 4
     - sangat_positif: rating 5
     """
-    label_map = {
-        1: 'sangat_negatif',
-        2: 'negatif',
-        3: 'netral',
-        4: 'positif',
-        5: 'sangat_positif'
-    }
-    df['sentiment'] = df['score'].map(label_map)
+    df['sentiment'] = sentiment_5class(df['score'])
     return df
 
 # =====================================================
@@ -147,16 +128,31 @@ if __name__ == '__main__':
     print(f'🕐 Started at: {start_time.strftime("%Y-%m-%d %H:%M:%S")}')
     print()
     
-    # 1. Scrape reviews
-    reviews_data = scrape_gojek_reviews(TOTAL_REVIEWS)
+    # 1. Scrape reviews (resume otomatis jika ada checkpoint dari run sebelumnya)
+    checkpoint = ScrapeCheckpoint(CHECKPOINT_DIR)
+    index = ReviewIndex(INDEX_DIR)
+    reviews_data = scrape_gojek_reviews(TOTAL_REVIEWS, checkpoint=checkpoint,
+                                        index=index if INCREMENTAL else None)
     
     if not reviews_data:
+        if INCREMENTAL:
+            print('✓ No new reviews since last run')
+            checkpoint.clear()
+            exit(0)
         print('❌ No reviews scraped!')
         exit(1)
     
     # 2. Create base DataFrame
     df_raw = create_dataframe(reviews_data)
     
+    raw_path = 'data/gojek_reviews_raw.csv'
+    if INCREMENTAL and os.path.exists(raw_path):
+        # Gabungkan review baru dengan hasil run sebelumnya
+        df_previous = pd.read_csv(raw_path)
+        df_raw = pd.concat([df_raw, df_previous], ignore_index=True)
+        df_raw = df_raw.drop_duplicates(subset=['reviewId'], keep='first')
+        print(f'\n♻️ Incremental: {len(reviews_data)} new + {len(df_previous)} existing reviews')
+    
     print('\n' + '=' * 60)
     print('📊 DATA SUMMARY')
     print('=' * 60)
@@ -165,29 +161,34 @@ if __name__ == '__main__':
     print(df_raw['score'].value_counts().sort_index())
     
     # 3. Save RAW data (tanpa label sentiment)
-    raw_path = 'data/gojek_reviews_raw.csv'
     df_raw.to_csv(raw_path, index=False, encoding='utf-8')
     print(f'\n✓ Saved: {raw_path} ({len(df_raw)} rows)')
     
-    # 4. Create 3-class version
-    df_3class = df_raw.copy()
-    df_3class = add_3class_labels(df_3class)
+    # 4. Upsert ke review store (label 3/5 kelas = view, bukan salinan)
+    with ReviewStore(REVIEW_STORE_PATH) as store:
+        store.upsert(from_scraper_columns(df_raw), APP_ID)
+        print(f'✓ Saved: {REVIEW_STORE_PATH} ({len(store)} reviews)')
+        print(f'  Distribution (3 kelas): {store.counts("reviews_3class", APP_ID)}')
+        print(f'  Distribution (5 kelas): {store.counts("reviews_5class", APP_ID)}')
     
     path_3class = 'data/gojek_reviews_3class_raw.csv'
-    df_3class.to_csv(path_3class, index=False, encoding='utf-8')
-    print(f'✓ Saved: {path_3class} ({len(df_3class)} rows)')
-    print(f'  Distribution:')
-    print(df_3class['sentiment'].value_counts())
-    
-    # 5. Create 5-class version
-    df_5class = df_raw.copy()
-    df_5class = add_5class_labels(df_5class)
-    
     path_5class = 'data/gojek_reviews_5class_raw.csv'
-    df_5class.to_csv(path_5class, index=False, encoding='utf-8')
-    print(f'\n✓ Saved: {path_5class} ({len(df_5class)} rows)')
-    print(f'  Distribution:')
-    print(df_5class['sentiment'].value_counts())
+    if WRITE_CSV_COPIES:
+        # 5. Create 3-class version
+        # Label hanya berupa kolom 'sentiment' di atas df_raw yang sama (tanpa copy)
+        add_3class_labels(df_raw)
+        df_raw.to_csv(path_3class, index=False, encoding='utf-8')
+        print(f'✓ Saved: {path_3class} ({len(df_raw)} rows)')
+        
+        # 6. Create 5-class version (kolom 'sentiment' ditimpa label 5 kelas)
+        add_5class_labels(df_raw)
+        df_raw.to_csv(path_5class, index=False, encoding='utf-8')
+        print(f'✓ Saved: {path_5class} ({len(df_raw)} rows)')
+    
+    # Output final sudah aman: catat ke index, checkpoint tidak diperlukan lagi
+    index.record(APP_ID, reviews_data.iter_rows())
+    index.save()
+    checkpoint.clear()
     
     # Summary
     end_time = datetime.now()
@@ -199,8 +200,10 @@ if __name__ == '__main__':
     print(f'Duration: {duration}')
     print(f'\n📁 Output files:')
     print(f'   1. {raw_path} - Data mentah tanpa label')
-    print(f'   2. {path_3class} - Data dengan label 3 kelas')
-    print(f'   3. {path_5class} - Data dengan label 5 kelas')
+    print(f'   2. {REVIEW_STORE_PATH} - Store (view reviews_3class & reviews_5class)')
+    if WRITE_CSV_COPIES:
+        print(f'   3. {path_3class} - Data dengan label 3 kelas')
+        print(f'   4. {path_5class} - Data dengan label 5 kelas')
     print()
     print('⚠️  CATATAN: Data ini BELUM di-cleaning!')
     print('    Kolom "content" berisi teks review MENTAH dari user')
@@ -7,11 +7,17 @@ Jalankan: python scrape_reviews_complete.py
 
 import pandas as pd
 import numpy as np
-from google_play_scraper import reviews, Sort
-from datetime import datetime
-import time
+from collections import Counter
+import hashlib
 import re
 import os
+import threading
+
+from balancing import balance
+from cleaning_utils import map_unique
+from lexicon_matcher import LexiconMatcher
+from preprocessing import get_profile
+from scraping_utils import ScrapeCheckpoint, ReviewIndex, RetryPolicy, iter_review_batches, prefetch
 
 # ============================================
 # CONFIGURATION
@@ -21,42 +27,24 @@ TARGET_PER_CLASS = 5000   # Target per kelas
 BATCH_SIZE = 200          # Reviews per batch
 MAX_REVIEWS = 50000       # Maximum total reviews to fetch
 OUTPUT_DIR = 'data'
+CHECKPOINT_DIR = os.path.join(OUTPUT_DIR, 'checkpoints', 'scrape_reviews_complete')
+INCREMENTAL = False       # True: hanya ambil review baru sejak run terakhir
+INDEX_DIR = os.path.join(OUTPUT_DIR, 'review_index')
+
+# Retry & pacing: jeda adaptif (AIMD), backoff eksponensial, maks 5 error beruntun
+RETRY_POLICY = RetryPolicy(initial_delay=0.5, min_delay=0.1, backoff_base=2.0, max_retries=5)
+
+# Jumlah batch yang di-prefetch di background (cleaning overlap dengan network)
+PREFETCH_BATCHES = 2
 
 # ============================================
 # TEXT CLEANING FUNCTIONS
 # ============================================
+CLEAN_PROFILE = get_profile('lowercase-basic')
+
 def clean_text(text):
-    """Bersihkan text review"""
-    if pd.isna(text) or not isinstance(text, str):
-        return ""
-    
-    text = str(text)
-    
-    # Lowercase
-    text = text.lower()
-    
-    # Remove URLs
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-    
-    # Remove emails
-    text = re.sub(r'\S+@\S+', '', text)
-    
-    # Remove mentions
-    text = re.sub(r'@\w+', '', text)
-    
-    # Remove hashtags
-    text = re.sub(r'#\w+', '', text)
-    
-    # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters but keep Indonesian chars
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    # Remove extra whitespace
-    text = ' '.join(text.split())
-    
-    return text.strip()
+    """Bersihkan text review (profile 'lowercase-basic')"""
+    return CLEAN_PROFILE.clean(text)
 
 def is_valid_review(text, min_words=3, max_words=500):
     """Cek apakah review valid"""
@@ -94,6 +82,27 @@ def get_sentiment_from_score(score):
     else:
         return 'neutral_candidate'  # Score 3, perlu analisis lebih lanjut
 
+# Kata-kata positif yang kuat
+NEUTRAL_POSITIVE_WORDS = [
+    'bagus', 'mantap', 'keren', 'recommended', 'puas', 'senang', 
+    'suka', 'cepat', 'ramah', 'nyaman', 'terbaik', 'top', 'josss',
+    'mantul', 'oke banget', 'luar biasa', 'hebat', 'memuaskan'
+]
+
+# Kata-kata negatif yang kuat
+NEUTRAL_NEGATIVE_WORDS = [
+    'jelek', 'buruk', 'kecewa', 'lambat', 'parah', 'mengecewakan',
+    'tidak recommended', 'mahal', 'lama', 'error', 'bug', 'masalah',
+    'susah', 'ribet', 'payah', 'sampah', 'brengsek', 'bangsat',
+    'uninstall', 'hapus', 'bintang 1', 'worst', 'terrible'
+]
+
+# Satu automaton Aho-Corasick untuk kedua leksikon (satu scan per teks)
+NEUTRAL_LEXICON = LexiconMatcher({
+    'positive': NEUTRAL_POSITIVE_WORDS,
+    'negative': NEUTRAL_NEGATIVE_WORDS,
+})
+
 def analyze_neutral_text(text):
     """
     Analisis teks untuk menentukan apakah benar-benar neutral
@@ -101,24 +110,8 @@ def analyze_neutral_text(text):
     """
     text_lower = text.lower()
     
-    # Kata-kata positif yang kuat
-    positive_words = [
-        'bagus', 'mantap', 'keren', 'recommended', 'puas', 'senang', 
-        'suka', 'cepat', 'ramah', 'nyaman', 'terbaik', 'top', 'josss',
-        'mantul', 'oke banget', 'luar biasa', 'hebat', 'memuaskan'
-    ]
-    
-    # Kata-kata negatif yang kuat
-    negative_words = [
-        'jelek', 'buruk', 'kecewa', 'lambat', 'parah', 'mengecewakan',
-        'tidak recommended', 'mahal', 'lama', 'error', 'bug', 'masalah',
-        'susah', 'ribet', 'payah', 'sampah', 'brengsek', 'bangsat',
-        'uninstall', 'hapus', 'bintang 1', 'worst', 'terrible'
-    ]
-    
     # Hitung kata positif dan negatif
-    pos_count = sum(1 for word in positive_words if word in text_lower)
-    neg_count = sum(1 for word in negative_words if word in text_lower)
+    pos_count, neg_count = NEUTRAL_LEXICON.counts(text_lower)
     
     # Jika tidak ada kata positif/negatif yang kuat, kemungkinan neutral
     if pos_count == 0 and neg_count == 0:
@@ -133,47 +126,149 @@ def analyze_neutral_text(text):
 # ============================================
 # SCRAPING FUNCTION
 # ============================================
-def scrape_reviews(app_id, count=1000, lang='id', country='id'):
-    """Scrape reviews dari Google Play Store"""
-    all_reviews = []
-    continuation_token = None
-    
+def iter_reviews(app_id, count=1000, lang='id', country='id', checkpoint=None, index=None, stop=None):
+    """
+    Generator batch review dari Google Play Store (maksimal `count` review)
+
+    Jika `checkpoint` diberikan, setiap batch langsung ditulis ke disk dan
+    scraping dilanjutkan dari continuation token terakhir.
+    Jika `index` (ReviewIndex) diberikan, hanya review baru yang diambil dan
+    paging berhenti begitu halaman sudah mencapai data yang dikenal.
+    `stop` (threading.Event dari prefetch) memotong backoff saat consumer berhenti.
+    """
+    return iter_review_batches(
+        app_id,
+        lang=lang,
+        country=country,
+        batch_size=BATCH_SIZE,
+        limit=count,
+        checkpoint=checkpoint,
+        stream='all',
+        index=index,
+        policy=RETRY_POLICY,
+        label=app_id,
+        empty_retries=1,
+        stop=stop
+    )
+
+def scrape_reviews(app_id, count=1000, lang='id', country='id', checkpoint=None, index=None):
+    """Scrape reviews dari Google Play Store ke satu list"""
     print(f"🔄 Scraping {count} reviews dari {app_id}...")
-    
-    fetched = 0
-    while fetched < count:
-        batch_count = min(BATCH_SIZE, count - fetched)
-        
-        try:
-            result, continuation_token = reviews(
-                app_id,
-                lang=lang,
-                country=country,
-                sort=Sort.NEWEST,
-                count=batch_count,
-                continuation_token=continuation_token
-            )
-            
-            if not result:
-                print("   Tidak ada review lagi")
-                break
-            
-            all_reviews.extend(result)
-            fetched += len(result)
-            
-            print(f"   Fetched: {fetched}/{count}", end='\r')
-            
-            # Rate limiting
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"\n   Error: {e}")
-            time.sleep(2)
-            continue
-    
+    all_reviews = []
+    for batch in iter_reviews(app_id, count, lang, country, checkpoint, index):
+        all_reviews.extend(batch)
+        print(f"   Fetched: {len(all_reviews)}/{count}", end='\r')
     print(f"\n✓ Total fetched: {len(all_reviews)} reviews")
     return all_reviews
 
+# ============================================
+# STREAMING PIPELINE (CLEAN -> VALIDASI -> LABEL -> SINK)
+# ============================================
+# Setiap stage menerima iterator batch dan meng-yield batch baru, sehingga
+# hanya beberapa batch yang hidup di memori pada satu waktu. Untuk urutan
+# review yang sama, hasilnya identik dengan pipeline DataFrame lama
+# (dropna -> clean_text -> is_valid_review -> drop_duplicates -> label).
+OUTPUT_COLUMNS = ['userName', 'content', 'score', 'at', 'content_clean', 'sentiment']
+SENTIMENT_CLASSES = ('negative', 'neutral', 'positive')
+
+def record_stage(batches, index, app_id, stats):
+    """Hitung review hasil scraping dan catat ke index (di-commit saat save)"""
+    for batch in batches:
+        stats['scraped'] += len(batch)
+        index.record(app_id, batch)
+        yield batch
+
+def clean_stage(batches, stats):
+    """Stage 1: buang content kosong, tambahkan content_clean"""
+    for batch in batches:
+        stats['raw'] += len(batch)
+        reviews_data = [review for review in batch
+                        if review.get('content') is not None and not pd.isna(review.get('content'))]
+        stats['null'] += len(batch) - len(reviews_data)
+        # Satu panggilan per kolom batch: teks duplikat dibersihkan sekali
+        cleaned = map_unique(pd.Series([r['content'] for r in reviews_data], dtype=object), clean_text)
+        yield [{
+            'userName': review.get('userName'),
+            'content': review['content'],
+            'score': review.get('score'),
+            'at': review.get('at'),
+            'content_clean': content_clean
+        } for review, content_clean in zip(reviews_data, cleaned)]
+
+def validate_stage(batches, stats):
+    """Stage 2: buang review tidak valid dan duplikat (hash content_clean)"""
+    seen = set()
+    for batch in batches:
+        out = []
+        valid = map_unique(pd.Series([row['content_clean'] for row in batch], dtype=object),
+                           is_valid_review)
+        for row, is_valid in zip(batch, valid):
+            if not is_valid:
+                stats['invalid'] += 1
+                continue
+            key = hashlib.blake2b(row['content_clean'].encode('utf-8'), digest_size=16).digest()
+            if key in seen:
+                stats['duplicate'] += 1
+                continue
+            seen.add(key)
+            out.append(row)
+        yield out
+
+def label_stage(batches, stats):
+    """Stage 3: label dari score; score 3 dicek teksnya, yang ambigu dibuang"""
+    for batch in batches:
+        out = []
+        for row in batch:
+            sentiment = get_sentiment_from_score(row['score'])
+            if sentiment == 'neutral_candidate':
+                sentiment = 'neutral' if analyze_neutral_text(row['content_clean']) else 'ambiguous'
+            if sentiment == 'ambiguous':
+                stats['ambiguous'] += 1
+                continue
+            row['sentiment'] = sentiment
+            out.append(row)
+        yield out
+
+def concat_batches(*sources):
+    """Gabungkan beberapa iterator batch (bisa di-close seperti stage lain)"""
+    for batches in sources:
+        yield from batches
+
+def iter_previous_batches(path, chunksize=5000):
+    """Batch review dari output run sebelumnya (mode inkremental)"""
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        yield chunk[['userName', 'content', 'score', 'at']].to_dict('records')
+
+class CsvSink:
+    """Stage 4: append setiap batch ke CSV dan hitung jumlah per kelas"""
+
+    def __init__(self, path, columns=OUTPUT_COLUMNS):
+        self.path = path
+        self.columns = columns
+        self.rows = 0
+        self.counts = {sentiment: 0 for sentiment in SENTIMENT_CLASSES}
+        if os.path.exists(path):
+            os.remove(path)
+
+    def write(self, batch):
+        if not batch:
+            return
+        df_batch = pd.DataFrame(batch, columns=self.columns)
+        df_batch.to_csv(self.path, mode='a', header=self.rows == 0, index=False)
+        self.rows += len(batch)
+        for row in batch:
+            self.counts[row['sentiment']] += 1
+
+    def close(self):
+        if self.rows == 0:
+            pd.DataFrame(columns=self.columns).to_csv(self.path, index=False)
+
+    def target_reached(self, target_per_class):
+        return all(count >= target_per_class for count in self.counts.values())
+
+    def status(self):
+        return ' | '.join(f"{s[:3]}: {self.counts[s]:,}" for s in SENTIMENT_CLASSES)
+
 # ============================================
 # MAIN SCRAPING PROCESS
 # ============================================
@@ -189,59 +284,65 @@ def main():
     # Create output directory
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
-    # Step 1: Scrape reviews
-    print("\n📥 STEP 1: Scraping reviews...")
-    raw_reviews = scrape_reviews(APP_ID, count=MAX_REVIEWS)
-    
-    if not raw_reviews:
+    # Step 1-3: Scrape -> clean -> validasi -> label, per batch (streaming)
+    # Scraping berhenti begitu semua kelas mencapai TARGET_PER_CLASS
+    # (mode inkremental: sampai caught up dengan index)
+    print("\n📥 STEP 1-3: Scraping, cleaning & labeling (streaming)...")
+    checkpoint = ScrapeCheckpoint(CHECKPOINT_DIR)
+    index = ReviewIndex(INDEX_DIR)
+    stats = Counter()
+    raw_path = os.path.join(OUTPUT_DIR, 'gojek_reviews_scraped_all.csv')
+    partial_path = raw_path + '.partial'
+    sink = CsvSink(partial_path)
+    
+    stop = threading.Event()
+    source = prefetch(iter_reviews(APP_ID, count=MAX_REVIEWS, checkpoint=checkpoint,
+                                   index=index if INCREMENTAL else None, stop=stop),
+                      depth=PREFETCH_BATCHES, stop=stop)
+    batches = record_stage(source, index, APP_ID, stats)
+    if INCREMENTAL and os.path.exists(raw_path):
+        # Review lama diproses setelah review baru (dedup keep='first' seperti sebelumnya)
+        batches = concat_batches(batches, iter_previous_batches(raw_path))
+    stages = [source, batches]
+    stages.append(clean_stage(stages[-1], stats))
+    stages.append(validate_stage(stages[-1], stats))
+    stages.append(label_stage(stages[-1], stats))
+    
+    try:
+        for batch in stages[-1]:
+            sink.write(batch)
+            print(f"   Fetched: {stats['scraped']}/{MAX_REVIEWS} | {sink.status()}", end='\r')
+            if not INCREMENTAL and sink.target_reached(TARGET_PER_CLASS):
+                print(f"\n   🎯 Semua kelas sudah mencapai target {TARGET_PER_CLASS}")
+                break
+    finally:
+        for stage in reversed(stages):
+            stage.close()
+    sink.close()
+    
+    if stats['scraped'] == 0:
+        os.remove(partial_path)
+        if INCREMENTAL:
+            print("✓ Tidak ada review baru sejak run terakhir")
+            checkpoint.clear()
+            return
         print("❌ Gagal mengambil reviews!")
         return
     
-    # Convert to DataFrame
-    df = pd.DataFrame(raw_reviews)
-    print(f"   Raw reviews: {len(df)}")
-    
-    # Keep only needed columns
-    df = df[['userName', 'content', 'score', 'at']].copy()
-    
-    # Step 2: Clean data
-    print("\n🧹 STEP 2: Cleaning data...")
-    
-    # Remove nulls
-    df = df.dropna(subset=['content'])
-    print(f"   After removing nulls: {len(df)}")
-    
-    # Clean text
-    df['content_clean'] = df['content'].apply(clean_text)
-    
-    # Filter valid reviews
-    df = df[df['content_clean'].apply(is_valid_review)]
-    print(f"   After filtering invalid: {len(df)}")
-    
-    # Remove duplicates
-    df = df.drop_duplicates(subset=['content_clean'])
-    print(f"   After removing duplicates: {len(df)}")
+    print(f"\n   Raw reviews: {stats['scraped']}")
+    if INCREMENTAL:
+        print(f"   Incremental: {stats['scraped']} baru + {stats['raw'] - stats['scraped']} lama")
     
-    # Step 3: Assign sentiment
-    print("\n🏷️ STEP 3: Assigning sentiment labels...")
+    remaining = stats['raw'] - stats['null']
+    print(f"   After removing nulls: {remaining}")
+    remaining -= stats['invalid']
+    print(f"   After filtering invalid: {remaining}")
+    remaining -= stats['duplicate']
+    print(f"   After removing duplicates: {remaining}")
+    print(f"   Ambiguous score-3 reviews dropped: {stats['ambiguous']}")
     
-    df['sentiment'] = df['score'].apply(get_sentiment_from_score)
-    
-    # For neutral candidates (score 3), analyze text
-    neutral_mask = df['sentiment'] == 'neutral_candidate'
-    df.loc[neutral_mask, 'is_truly_neutral'] = df.loc[neutral_mask, 'content_clean'].apply(analyze_neutral_text)
-    
-    # Keep only truly neutral reviews from score 3
-    df.loc[neutral_mask & (df['is_truly_neutral'] == True), 'sentiment'] = 'neutral'
-    df.loc[neutral_mask & (df['is_truly_neutral'] != True), 'sentiment'] = 'ambiguous'
-    
-    # Drop ambiguous
-    df = df[df['sentiment'] != 'ambiguous']
-    df = df[df['sentiment'] != 'neutral_candidate']
-    
-    # Drop helper column
-    if 'is_truly_neutral' in df.columns:
-        df = df.drop(columns=['is_truly_neutral'])
+    os.replace(partial_path, raw_path)
+    df = pd.read_csv(raw_path)
     
     print(f"\n📊 Distribution after cleaning:")
     print(df['sentiment'].value_counts())
@@ -260,18 +361,9 @@ def main():
     
     print(f"\n   Target per class: {target}")
     
-    # Balance by undersampling
-    df_balanced = pd.DataFrame()
-    for sentiment in ['negative', 'neutral', 'positive']:
-        df_class = df[df['sentiment'] == sentiment]
-        if len(df_class) >= target:
-            df_sampled = df_class.sample(n=target, random_state=42)
-        else:
-            df_sampled = df_class  # Keep all if less than target
-        df_balanced = pd.concat([df_balanced, df_sampled])
-    
-    # Shuffle
-    df_balanced = df_balanced.sample(frac=1, random_state=42).reset_index(drop=True)
+    # Balance by undersampling (kelas yang kurang dari target diambil semua), lalu shuffle
+    df_balanced = balance(df, 'sentiment', classes=['negative', 'neutral', 'positive'],
+                          target=target, seed=42)
     
     print(f"\n📊 Final balanced distribution:")
     print(df_balanced['sentiment'].value_counts())
@@ -279,9 +371,7 @@ def main():
     # Step 5: Save data
     print("\n💾 STEP 5: Saving data...")
     
-    # Save raw cleaned data (before balancing)
-    raw_path = os.path.join(OUTPUT_DIR, 'gojek_reviews_scraped_all.csv')
-    df.to_csv(raw_path, index=False)
+    # Raw cleaned data (before balancing) sudah ditulis per batch oleh CsvSink
     print(f"   ✓ All cleaned data: {raw_path} ({len(df)} rows)")
     
     # Save balanced data
@@ -289,13 +379,17 @@ def main():
     df_balanced.to_csv(balanced_path, index=False)
     print(f"   ✓ Balanced data: {balanced_path} ({len(df_balanced)} rows)")
     
+    # Output final sudah aman: simpan index, checkpoint tidak diperlukan lagi
+    index.save()
+    checkpoint.clear()
+    
     # Summary
     print("\n" + "=" * 60)
     print("✅ SCRAPING COMPLETED!")
     print("=" * 60)
     print(f"""
 📊 SUMMARY:
-   • Total scraped: {len(raw_reviews)}
+   • Total scraped: {stats['scraped']}
    • After cleaning: {len(df)}
    • Final balanced: {len(df_balanced)}
    
@@ -0,0 +1,743 @@
+"""
+Utilitas bersama untuk script scraping Google Play Store
+
+Berisi:
+- TokenBucket: pembatas laju request global (thread-safe)
+- ScrapeCheckpoint: log JSONL per stream + continuation token, untuk resume
+- ReviewIndex: index reviewId + watermark tanggal, untuk scraping inkremental
+- HostRateBudget: satu TokenBucket per host, dibagi semua worker
+- RetryPolicy/AdaptivePacer: backoff eksponensial + jitter, batas retry, jeda AIMD
+- ReviewBuffer: accumulator kolumnar (array bertipe + string ter-intern)
+- sentiment_3class/sentiment_5class: label sentiment dari rating (vectorized)
+- iter_review_batches: generator batch review satu stream (app, locale, rating)
+- scrape_stream: kumpulkan satu stream ke list atau ReviewBuffer
+- prefetch: jalankan generator di thread lain agar network & proses overlap
+"""
+
+from array import array
+from datetime import datetime, timedelta
+import json
+import os
+import queue
+import random
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+from google_play_scraper import reviews, Sort
+
+PLAY_STORE_HOST = 'play.google.com'
+
+# =====================================================
+# RATE LIMITER
+# =====================================================
+class TokenBucket:
+    """
+    Token bucket thread-safe untuk membatasi laju request.
+
+    Semua stream scraping berbagi satu bucket, sehingga total throughput
+    dibatasi oleh `rate` (request per detik), bukan oleh jumlah stream.
+    `capacity` menentukan burst maksimum.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError('rate harus > 0')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens=1.0):
+        """Tunggu (blocking) sampai `tokens` tersedia, lalu ambil"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+class HostRateBudget:
+    """
+    Budget request per host. Setiap host punya satu TokenBucket yang dibagi
+    oleh semua worker, berapapun jumlah job yang sedang berjalan.
+    """
+
+    def __init__(self, rates, default_rate=3.0):
+        self.rates = dict(rates)
+        self.default_rate = default_rate
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def limiter_for(self, host):
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rates.get(host, self.default_rate))
+            return self._buckets[host]
+
+# =====================================================
+# RETRY & PACING ADAPTIF
+# =====================================================
+class RetryPolicy:
+    """
+    Kebijakan retry & pacing bersama untuk semua scraper.
+
+    - Saat error: backoff eksponensial dengan jitter,
+      sleep ~ uniform(cap/2, cap), cap = min(backoff_max, backoff_base * 2^(n-1))
+    - Maksimal `max_retries` error berturut-turut per stream, lalu stream berhenti
+    - Jeda antar request adaptif (AIMD): turun `decrease_step` detik setiap
+      respons sehat, dikali `increase_factor` setiap error
+    """
+
+    def __init__(self, initial_delay=0.5, min_delay=0.1, max_delay=10.0,
+                 decrease_step=0.05, increase_factor=2.0,
+                 backoff_base=1.0, backoff_max=60.0, max_retries=5):
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decrease_step = decrease_step
+        self.increase_factor = increase_factor
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retries = max_retries
+
+    def pacer(self, label='stream', stop=None):
+        """Buat pacer baru (state per stream); stop: threading.Event untuk memotong jeda"""
+        return AdaptivePacer(self, label, stop)
+
+class StreamStats:
+    """Statistik per stream: request, retry, error, review/detik"""
+
+    def __init__(self, label):
+        self.label = label
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.reviews = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def reviews_per_second(self):
+        return self.reviews / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return (f'{self.requests:,} requests, {self.retries:,} retries, '
+                f'{self.errors:,} errors, {self.reviews:,} reviews '
+                f'({self.reviews_per_second:.1f} reviews/s)')
+
+class AdaptivePacer:
+    """
+    State pacing & retry untuk satu stream (lihat RetryPolicy).
+    Jika `stop` (threading.Event) diberikan, semua jeda memakai stop.wait()
+    sehingga backoff/pause langsung selesai saat stream dihentikan.
+    """
+
+    def __init__(self, policy, label='stream', stop=None):
+        self.policy = policy
+        self.delay = policy.initial_delay
+        self.failures = 0
+        self.stats = StreamStats(label)
+        self.stop = stop
+
+    @property
+    def stopped(self):
+        return self.stop is not None and self.stop.is_set()
+
+    def wait(self, seconds):
+        """Tunggu `seconds` detik, atau kurang jika stop di-set. Return False jika stop"""
+        if self.stop is None:
+            time.sleep(seconds)
+            return True
+        return not self.stop.wait(seconds)
+
+    def before_request(self):
+        self.stats.requests += 1
+
+    def on_success(self, n_reviews):
+        """Respons sehat: reset hitungan error, percepat (additive decrease)"""
+        self.failures = 0
+        self.stats.reviews += n_reviews
+        self.delay = max(self.policy.min_delay, self.delay - self.policy.decrease_step)
+
+    def on_error(self):
+        """
+        Catat error, perlambat (multiplicative increase), lalu tunggu backoff.
+        Return False jika batas retry berturut-turut sudah habis.
+        """
+        self.stats.errors += 1
+        self.failures += 1
+        self.delay = min(self.policy.max_delay,
+                         max(self.delay, self.policy.min_delay) * self.policy.increase_factor)
+        if self.failures > self.policy.max_retries:
+            return False
+        self.stats.retries += 1
+        cap = min(self.policy.backoff_max, self.policy.backoff_base * 2 ** (self.failures - 1))
+        self.wait(random.uniform(cap / 2, cap))
+        return True
+
+    def pause(self):
+        """Jeda adaptif sebelum request berikutnya"""
+        self.wait(self.delay)
+
+# =====================================================
+# CHECKPOINT (CRASH-SAFE & RESUMABLE)
+# =====================================================
+DATETIME_FIELDS = ('at', 'repliedAt')
+
+def encode_token(token):
+    """Serialisasi continuation token google_play_scraper ke dict JSON"""
+    if token is None:
+        return None
+    return {slot: getattr(token, slot, None) for slot in token.__slots__}
+
+def decode_token(data):
+    """Bangun ulang continuation token dari dict hasil encode_token"""
+    if data is None:
+        return None
+    from google_play_scraper.features.reviews import _ContinuationToken
+    return _ContinuationToken(**data)
+
+def _encode_review(review):
+    row = dict(review)
+    for key in DATETIME_FIELDS:
+        if isinstance(row.get(key), datetime):
+            row[key] = row[key].isoformat()
+    return json.dumps(row, ensure_ascii=False, default=str)
+
+def _decode_review(line):
+    row = json.loads(line)
+    for key in DATETIME_FIELDS:
+        if isinstance(row.get(key), str):
+            row[key] = datetime.fromisoformat(row[key])
+    return row
+
+class ScrapeCheckpoint:
+    """
+    Checkpoint scraping di disk.
+
+    Setiap stream (mis. 'all' atau 'score_3') punya log `<stream>.jsonl` yang
+    di-append per batch, dan `state.json` menyimpan continuation token, jumlah
+    review, serta offset byte log yang sudah ter-commit. Baris yang ditulis
+    setelah offset terakhir (crash di tengah batch) dibuang saat load.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.state_path = os.path.join(directory, 'state.json')
+        self._lock = threading.Lock()
+        self._state = self._read_state()
+
+    def _read_state(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_state(self):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+
+    def _log_path(self, stream):
+        return os.path.join(self.directory, f'{stream}.jsonl')
+
+    def load(self, stream):
+        """
+        Muat progress stream.
+        Return: (reviews, continuation_token, exhausted)
+        """
+        with self._lock:
+            info = self._state.get(stream, {})
+            offset = info.get('offset', 0)
+            log_path = self._log_path(stream)
+            reviews_data = []
+            if os.path.exists(log_path):
+                with open(log_path, 'r+b') as f:
+                    f.truncate(offset)
+                    for line in f:
+                        reviews_data.append(_decode_review(line.decode('utf-8')))
+            token = decode_token(info.get('token'))
+            return reviews_data, token, info.get('exhausted', False)
+
+    def append(self, stream, batch, continuation_token):
+        """Tulis batch ke log (flush + fsync), lalu commit token & offset"""
+        data = ''.join(_encode_review(r) + '\n' for r in batch).encode('utf-8')
+        with self._lock:
+            info = self._state.setdefault(stream, {
+                'count': 0, 'offset': 0, 'token': None, 'exhausted': False
+            })
+            with open(self._log_path(stream), 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            info['count'] += len(batch)
+            info['offset'] += len(data)
+            info['token'] = encode_token(continuation_token)
+            info['updated_at'] = datetime.now().isoformat()
+            self._write_state()
+
+    def mark_exhausted(self, stream):
+        """Tandai stream sudah habis (tidak ada review lagi)"""
+        with self._lock:
+            info = self._state.setdefault(stream, {
+                'count': 0, 'offset': 0, 'token': None, 'exhausted': False
+            })
+            info['exhausted'] = True
+            self._write_state()
+
+    def clear(self):
+        """Hapus seluruh checkpoint (dipanggil setelah output final tersimpan)"""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self._state = {}
+
+# =====================================================
+# INDEX REVIEW (SCRAPING INKREMENTAL)
+# =====================================================
+class ReviewIndex:
+    """
+    Index persisten reviewId yang sudah pernah di-scrape, plus watermark
+    (tanggal `at` terbaru) per app dan rating.
+
+    Disimpan di `directory`:
+    - `<app_id>.ids`: satu reviewId per baris (append-only)
+    - `watermarks.json`: {app_id: {rating: iso_datetime}}
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.watermark_path = os.path.join(directory, 'watermarks.json')
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._pending = {}
+        self._pending_marks = {}
+        self._watermarks = {}
+        if os.path.exists(self.watermark_path):
+            with open(self.watermark_path, encoding='utf-8') as f:
+                self._watermarks = json.load(f)
+
+    def _ids_path(self, app_id):
+        return os.path.join(self.directory, f'{app_id}.ids')
+
+    def _known(self, app_id):
+        if app_id not in self._ids:
+            known = set()
+            path = self._ids_path(app_id)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    known.update(line.strip() for line in f if line.strip())
+            self._ids[app_id] = known
+        return self._ids[app_id]
+
+    def watermark(self, app_id, score=None):
+        """
+        Tanggal review terbaru yang sudah tercatat.
+        score=None (stream tanpa filter rating): watermark terlama dari
+        kelima rating, agar tidak ada rating yang terlewat.
+        """
+        marks = self._watermarks.get(app_id, {})
+        if score is not None:
+            value = marks.get(str(score))
+        else:
+            values = [marks.get(str(s)) for s in (1, 2, 3, 4, 5)]
+            value = None if None in values else min(values)
+        return datetime.fromisoformat(value) if value else None
+
+    def select_new(self, app_id, page, score=None):
+        """
+        Saring satu halaman (urutan Sort.NEWEST) ke review yang belum dikenal.
+        Return: (review_baru, caught_up)
+        caught_up=True jika halaman sudah melewati watermark atau tidak ada
+        review baru sama sekali -> paging boleh berhenti.
+        """
+        with self._lock:
+            known = self._known(app_id)
+            mark = self.watermark(app_id, score)
+            fresh = []
+            crossed = False
+            for review in page:
+                at = review.get('at')
+                if mark is not None and isinstance(at, datetime) and at < mark:
+                    crossed = True
+                    continue
+                if review.get('reviewId') in known:
+                    continue
+                fresh.append(review)
+            return fresh, crossed or not fresh
+
+    def record(self, app_id, reviews_data):
+        """
+        Catat reviewId dan watermark per rating. Watermark baru hanya berlaku
+        setelah save(), sehingga select_new pada run yang sama tidak terpengaruh.
+        """
+        with self._lock:
+            known = self._known(app_id)
+            pending = self._pending.setdefault(app_id, [])
+            marks = self._pending_marks.setdefault(app_id, {})
+            for review in reviews_data:
+                review_id = review.get('reviewId')
+                if review_id and review_id not in known:
+                    known.add(review_id)
+                    pending.append(review_id)
+                at = review.get('at')
+                if isinstance(at, datetime):
+                    key = str(review.get('score'))
+                    if key not in marks or at > marks[key]:
+                        marks[key] = at
+
+    def save(self):
+        """Tulis reviewId baru (append) dan watermark (atomic replace)"""
+        with self._lock:
+            for app_id, pending in self._pending.items():
+                if pending:
+                    with open(self._ids_path(app_id), 'a', encoding='utf-8') as f:
+                        f.write('\n'.join(pending) + '\n')
+            self._pending = {}
+            for app_id, pending_marks in self._pending_marks.items():
+                marks = self._watermarks.setdefault(app_id, {})
+                for key, value in pending_marks.items():
+                    if key not in marks or value > datetime.fromisoformat(marks[key]):
+                        marks[key] = value.isoformat()
+            self._pending_marks = {}
+            tmp_path = self.watermark_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._watermarks, f, indent=2)
+            os.replace(tmp_path, self.watermark_path)
+
+# =====================================================
+# BUFFER KOLUMNAR
+# =====================================================
+_NAT = np.iinfo(np.int64).min     # representasi NaT di datetime64[ns]
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+class _InternedColumn:
+    """Kolom string ter-intern: kode int32 per baris + daftar nilai unik"""
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values = []
+        self._lookup = {}
+
+    def intern(self, value):
+        code = self._lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self._lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(-1 if value is None else self.intern(value))
+
+    def extend(self, other):
+        if not other.values:
+            self.codes.extend(array('i', [-1]) * len(other.codes))
+            return
+        remap = np.array([self.intern(v) for v in other.values], dtype=np.int32)
+        codes = np.frombuffer(other.codes, dtype=np.int32)
+        self.codes.frombytes(np.where(codes < 0, -1, remap[codes]).astype(np.int32).tobytes())
+
+    def to_series(self):
+        codes = np.frombuffer(self.codes, dtype=np.int32)
+        return pd.Categorical.from_codes(codes, categories=self.values)
+
+def _datetime_to_ns(value):
+    if value is None:
+        return _NAT
+    return (value - _EPOCH) // _MICROSECOND * 1000
+
+class ReviewBuffer:
+    """
+    Accumulator kolumnar untuk review hasil scraping.
+
+    Setiap batch langsung diproyeksikan ke FIELDS saat masuk: angka dan
+    tanggal disimpan di array bertipe, userName & reviewCreatedVersion
+    di-intern (nilai unik disimpan sekali), sisanya list string. Dict review
+    dari google_play_scraper tidak ditahan setelah batch selesai diproses.
+    """
+
+    FIELDS = ('reviewId', 'userName', 'content', 'score', 'thumbsUpCount',
+              'reviewCreatedVersion', 'at', 'replyContent', 'repliedAt')
+    _TEXT = ('reviewId', 'content', 'replyContent')
+    _INTERNED = ('userName', 'reviewCreatedVersion')
+    _DATETIME = ('at', 'repliedAt')
+
+    def __init__(self):
+        self.columns = {}
+        for field in self._TEXT:
+            self.columns[field] = []
+        for field in self._INTERNED:
+            self.columns[field] = _InternedColumn()
+        for field in self._DATETIME:
+            self.columns[field] = array('q')
+        self.columns['score'] = array('b')
+        self.columns['thumbsUpCount'] = array('q')
+
+    def __len__(self):
+        return len(self.columns['reviewId'])
+
+    def extend(self, batch):
+        """Tambahkan satu batch (list of dict) -- hanya FIELDS yang disimpan"""
+        cols = self.columns
+        for review in batch:
+            for field in self._TEXT:
+                cols[field].append(review.get(field))
+            for field in self._INTERNED:
+                cols[field].append(review.get(field))
+            for field in self._DATETIME:
+                cols[field].append(_datetime_to_ns(review.get(field)))
+            cols['score'].append(review.get('score') or 0)
+            cols['thumbsUpCount'].append(review.get('thumbsUpCount') or 0)
+
+    def extend_buffer(self, other):
+        """Gabungkan ReviewBuffer lain (urutan baris dipertahankan)"""
+        for field in self.FIELDS:
+            self.columns[field].extend(other.columns[field])
+
+    @classmethod
+    def concat(cls, buffers):
+        merged = cls()
+        for buffer in buffers:
+            merged.extend_buffer(buffer)
+        return merged
+
+    def iter_rows(self, fields=('reviewId', 'score', 'at')):
+        """Iterasi baris sebagai dict kecil (mis. untuk ReviewIndex.record)"""
+        columns = [pd.DatetimeIndex(self.column(field)).to_pydatetime() if field in self._DATETIME
+                   else self.column(field) for field in fields]
+        for values in zip(*columns):
+            yield {field: (None if pd.isna(value) else value) for field, value in zip(fields, values)}
+
+    def column(self, field):
+        """Satu kolom sebagai array/Series siap pakai pandas"""
+        data = self.columns[field]
+        if field in self._INTERNED:
+            return data.to_series()
+        if field in self._DATETIME:
+            return np.frombuffer(data, dtype=np.int64).view('datetime64[ns]')
+        if field in ('score', 'thumbsUpCount'):
+            return np.frombuffer(data, dtype=np.int8 if field == 'score' else np.int64).astype(np.int64)
+        return data
+
+    def to_dataframe(self):
+        """DataFrame dengan kolom FIELDS (satu salinan, tanpa dict per baris)"""
+        return pd.DataFrame({field: self.column(field) for field in self.FIELDS},
+                            columns=list(self.FIELDS))
+
+# =====================================================
+# LABEL RATING
+# =====================================================
+SENTIMENT_5CLASS = {
+    1: 'sangat_negatif',
+    2: 'negatif',
+    3: 'netral',
+    4: 'positif',
+    5: 'sangat_positif'
+}
+
+def sentiment_3class(scores):
+    """Rating -> negative (1-2) / neutral (3) / positive (4-5), untuk satu Series"""
+    values = np.asarray(scores)
+    labels = np.select([values <= 2, values == 3], ['negative', 'neutral'], 'positive')
+    return pd.Series(labels.astype(object), index=getattr(scores, 'index', None))
+
+def sentiment_5class(scores):
+    """Rating -> label 5 kelas, untuk satu Series"""
+    return pd.Series(scores).map(SENTIMENT_5CLASS)
+
+# =====================================================
+# GENERATOR BATCH REVIEW (SATU STREAM)
+# =====================================================
+def iter_review_batches(app_id, lang='id', country='id', score=None, batch_size=200, limit=None,
+                        limiter=None, checkpoint=None, stream='all', index=None, policy=None,
+                        label=None, empty_retries=3, stop=None):
+    """
+    Generator batch review (list of dict) untuk satu stream (app, locale, dan
+    filter rating opsional) dengan Sort.NEWEST.
+
+    Berhenti saat `limit` review sudah di-yield, stream habis, sudah caught up
+    dengan index, atau batas retry habis. Consumer boleh berhenti kapan saja
+    (break / close) -- tidak ada request lanjutan setelah itu.
+
+    - limiter: TokenBucket bersama (budget global antar stream)
+    - policy: RetryPolicy untuk jeda adaptif & retry (default: RetryPolicy())
+    - checkpoint/stream: ScrapeCheckpoint; review dari checkpoint di-yield
+      lebih dulu sebagai satu batch, lalu scraping lanjut dari token terakhir
+    - index: ReviewIndex untuk mode inkremental (hanya review baru)
+    - empty_retries: jumlah halaman kosong berturut-turut sebelum menyerah
+    - stop: threading.Event (mis. dari prefetch); jika di-set, jeda/backoff
+      langsung selesai dan generator berhenti sebelum request berikutnya
+    """
+    label = label or stream
+    policy = policy or RetryPolicy()
+    pacer = policy.pacer(label, stop)
+    continuation_token = None
+    consecutive_empty = 0
+    yielded = 0
+    
+    try:
+        if checkpoint is not None:
+            resumed, continuation_token, exhausted = checkpoint.load(stream)
+            if resumed:
+                print(f'\n   ♻️ {label}: resume dari checkpoint ({len(resumed):,} reviews)')
+                yielded += len(resumed)
+                yield resumed
+            if exhausted:
+                return
+        
+        while (limit is None or yielded < limit) and not pacer.stopped:
+            if limiter is not None:
+                limiter.acquire()
+            
+            pacer.before_request()
+            try:
+                result, next_token = reviews(
+                    app_id,
+                    lang=lang,
+                    country=country,
+                    sort=Sort.NEWEST,
+                    count=batch_size if limit is None else min(batch_size, limit - yielded),
+                    filter_score_with=score,
+                    continuation_token=continuation_token
+                )
+            except Exception as e:
+                print(f'\n   ❌ Error ({label}): {e}')
+                if not pacer.on_error():
+                    print(f'\n   ⛔ {label}: giving up after {policy.max_retries} consecutive retries')
+                    return
+                continue
+            
+            continuation_token = next_token
+            if not result:
+                consecutive_empty += 1
+                if consecutive_empty >= empty_retries:
+                    if checkpoint is not None:
+                        checkpoint.mark_exhausted(stream)
+                    print(f'\n   ⚠️ No more reviews for {label} (got {yielded:,})')
+                    return
+                pacer.wait(1)
+                continue
+            
+            consecutive_empty = 0
+            pacer.on_success(len(result))
+            caught_up = False
+            if index is not None:
+                result, caught_up = index.select_new(app_id, result, score)
+            
+            if checkpoint is not None:
+                checkpoint.append(stream, result, continuation_token)
+            
+            yielded += len(result)
+            if result:
+                yield result
+            
+            # Token kosong = halaman terakhir; caught_up = sisanya sudah dikenal
+            end_of_stream = continuation_token is None or getattr(continuation_token, 'token', None) is None
+            if caught_up or end_of_stream:
+                if checkpoint is not None:
+                    checkpoint.mark_exhausted(stream)
+                if caught_up:
+                    print(f'\n   ✓ {label}: caught up with previously scraped reviews')
+                else:
+                    print(f'\n   ✓ {label}: reached end of reviews')
+                return
+            
+            # Rate limiting adaptif
+            pacer.pause()
+    finally:
+        print(f'\n   📈 {label}: {pacer.stats.summary()}')
+
+def scrape_stream(app_id, target, lang='id', country='id', score=None, batch_size=200,
+                  limiter=None, checkpoint=None, stream='all', index=None,
+                  on_progress=None, label=None, policy=None, buffer=None):
+    """
+    Kumpulkan satu stream sampai `target` review (lihat iter_review_batches).
+    on_progress(current): callback setiap batch masuk.
+    buffer: ReviewBuffer opsional; jika diberikan, batch diproyeksikan ke
+    buffer tersebut (bukan list of dict) dan buffer yang dikembalikan.
+    """
+    collected = buffer if buffer is not None else []
+    for batch in iter_review_batches(app_id, lang=lang, country=country, score=score,
+                                     batch_size=batch_size, limit=target, limiter=limiter,
+                                     checkpoint=checkpoint, stream=stream, index=index,
+                                     policy=policy, label=label):
+        collected.extend(batch[:target - len(collected)])
+        if on_progress is not None:
+            on_progress(len(collected))
+    return collected
+
+# =====================================================
+# PREFETCH (OVERLAP NETWORK & PROSES)
+# =====================================================
+class _PrefetchError:
+    def __init__(self, error):
+        self.error = error
+
+_PREFETCH_DONE = object()
+
+def prefetch(batches, depth=2, stop=None):
+    """
+    Jalankan generator `batches` di thread terpisah dengan antrian terbatas
+    (`depth` batch), sehingga proses di consumer berjalan bersamaan dengan
+    request berikutnya. Exception dari producer diteruskan ke consumer.
+
+    stop: threading.Event yang di-set saat consumer berhenti (close/break).
+    Berikan event yang sama ke generator (iter_review_batches(stop=...)) agar
+    backoff/pause di producer langsung selesai dan thread.join tidak menunggu.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stop = stop if stop is not None else threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for batch in batches:
+                if not put(batch):
+                    break
+        except Exception as e:
+            put(_PrefetchError(e))
+        finally:
+            batches.close()
+            put(_PREFETCH_DONE)
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _PREFETCH_DONE:
+                break
+            if isinstance(item, _PrefetchError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
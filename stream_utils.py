@@ -0,0 +1,135 @@
+"""
+Utilitas mode streaming (out-of-core): memproses CSV per chunk dengan
+memori terbatas
+
+Berisi:
+- SeenSet: dedup lintas chunk lewat hash 64-bit teks; set di memori atau
+  di SQLite (on-disk) untuk korpus yang sangat besar
+- ReservoirSampler: sampel acak seragam berukuran tetap dari aliran
+  baris (Algorithm R, divektorkan per chunk)
+
+Contoh:
+    seen = SeenSet()
+    reservoir = ReservoirSampler(capacity=10000, seed=42)
+    for chunk in pd.read_csv(path, chunksize=100000):
+        chunk = chunk[seen.add_new(chunk['content_clean'])]
+        reservoir.add(chunk)
+    sample = reservoir.sample(5000)
+"""
+
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+_SQL_BATCH = 900  # Parameter per query IN (...) (batas SQLite lama: 999)
+
+# =====================================================
+# DEDUP LINTAS CHUNK
+# =====================================================
+class SeenSet:
+    """
+    Himpunan hash 64-bit (pd.util.hash_array, deterministik) dari nilai
+    yang sudah pernah muncul. path=None: set Python di memori (~100 byte
+    per nilai unik); path: tabel SQLite sehingga memori tetap konstan.
+    Kolisi hash 64-bit diabaikan (peluang ~n^2 / 2^65).
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._seen = set()
+        self.conn = None
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(path)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=OFF')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS seen (key INTEGER PRIMARY KEY)')
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        if self.conn is not None:
+            return self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        return len(self._seen)
+
+    def add_new(self, values):
+        """
+        Mask boolean (numpy): True untuk kemunculan pertama sebuah nilai
+        (dalam chunk ini dan semua chunk sebelumnya). Setara dengan
+        ~duplicated(keep='first') atas gabungan semua chunk.
+        """
+        values = pd.Series(values, dtype=object)
+        keys = pd.util.hash_array(values.to_numpy()).view(np.int64)
+        first = ~pd.Series(keys).duplicated().to_numpy()
+        candidates = keys[first].tolist()
+        if self.conn is None:
+            seen = self._seen
+            fresh = [key not in seen for key in candidates]
+            seen.update(candidates)
+        else:
+            known = set()
+            for start in range(0, len(candidates), _SQL_BATCH):
+                batch = candidates[start:start + _SQL_BATCH]
+                known.update(row[0] for row in self.conn.execute(
+                    f'SELECT key FROM seen WHERE key IN ({", ".join("?" for _ in batch)})', batch))
+            fresh = [key not in known for key in candidates]
+            with self.conn:
+                self.conn.executemany('INSERT OR IGNORE INTO seen (key) VALUES (?)',
+                                      ((key,) for key in candidates))
+        first[first] = fresh
+        return first
+
+# =====================================================
+# RESERVOIR SAMPLING
+# =====================================================
+class ReservoirSampler:
+    """
+    Sampel acak seragam berisi maksimal `capacity` baris dari semua baris
+    yang pernah di-add (Algorithm R). Memori = capacity baris, berapa pun
+    jumlah baris input.
+    """
+
+    def __init__(self, capacity, seed=42):
+        self.capacity = capacity
+        self.seen = 0
+        self.rng = np.random.default_rng(seed)
+        self.frame = None
+
+    def add(self, frame):
+        """Masukkan satu chunk baris (DataFrame) ke reservoir"""
+        frame = frame.reset_index(drop=True)
+        if self.frame is None:
+            self.frame = frame.iloc[:0]
+        free = max(self.capacity - len(self.frame), 0)
+        if free:
+            head = frame.iloc[:free]
+            self.frame = pd.concat([self.frame, head], ignore_index=True)
+        rest = frame.iloc[free:]
+        if len(rest):
+            # Baris ke-t (0-based, global) menggantikan slot j ~ U[0, t] jika j < capacity;
+            # slot yang terkena beberapa kali dalam satu chunk dipegang baris terakhir
+            positions = self.seen + free + np.arange(len(rest))
+            slots = self.rng.integers(0, positions + 1)
+            keep = np.flatnonzero(slots < self.capacity)
+            slots = pd.Series(slots[keep])
+            last = ~slots.duplicated(keep='last').to_numpy()
+            rows = rest.iloc[keep[last]].set_axis(slots[last].to_numpy())
+            self.frame = pd.concat([self.frame.drop(index=rows.index), rows]).sort_index()
+        self.seen += len(frame)
+
+    def sample(self, n=None, random_state=42):
+        """n baris acak dari reservoir (tetap sampel seragam dari semua baris input)"""
+        frame = self.frame if self.frame is not None else pd.DataFrame()
+        if n is None or n >= len(frame):
+            return frame.reset_index(drop=True)
+        return frame.sample(n=n, random_state=random_state).reset_index(drop=True)
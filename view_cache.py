@@ -0,0 +1,331 @@
+"""
+Cache multi-view augmentasi + tokenisasi untuk epoch training (memory-mapped)
+
+SentimentDataset lama di notebook training meng-augmentasi (word dropout,
+swap, hapus/duplikasi kata) dan men-tokenisasi ulang setiap sampel di setiap
+epoch (hingga 20+ epoch). Di sini langkah itu dilakukan sekali, offline:
+- untuk setiap sampel dibuat VIEWS versi augmentasi (kebijakan augmentasi
+  notebook yang sama, RNG ber-seed per view: hasil reprodusibel)
+- semua view ditokenisasi sekali (teks unik saja; view yang tidak berubah
+  berbagi hasil tokenisasi)
+- disimpan sebagai array .npy yang dibuka dengan memmap:
+  input_ids (VIEWS, N, max_length) int32, lengths (VIEWS, N) uint16,
+  labels (N,) int64, meta.json (parameter + cache key)
+
+ViewCacheDataset memilih view (epoch + seed) % VIEWS tanpa kerja teks per
+step; attention_mask dibangun dari lengths. __getitem__ mengembalikan
+array NumPy (default collate DataLoader mengubahnya menjadi tensor).
+
+Kebijakan per notebook (port dari SentimentDataset._augment_text masing-masing):
+- stacked:             3class_final (dropout 50% -> swap 30% -> duplikasi 20%)
+- enhanced:            3class_kaggle_optimized
+- uniform-dropout:     5class (30% baris, dropout 10-20%, minimal 2 kata)
+- dropout-swap:        5class_kaggle_optimized
+- dropout-swap-light:  cpu (dropout 30%, swap 20%)
+- dropout-swap-delete: local (dropout 30%, swap 20%, hapus satu kata 20%)
+- none:                val / test (hanya tokenisasi)
+
+Contoh (notebook):
+    build_view_cache(train_df['content_clean'], train_df['label'], tokenizer,
+                     'data/view_cache/train', views=CONFIG['epochs'], policy='dropout-swap-delete')
+    train_dataset = ViewCacheDataset('data/view_cache/train')
+    for epoch in range(CONFIG['epochs']):
+        train_dataset.set_epoch(epoch)   # sebelum iterasi DataLoader
+        ...
+
+CLI (butuh transformers):
+    python view_cache.py --input data/train.csv --out data/view_cache/train \\
+        --text-col content_clean --label-col label --views 8 --policy dropout-swap
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+
+import numpy as np
+import pandas as pd
+
+# =====================================================
+# KONFIGURASI
+# =====================================================
+VIEWS = 8                # View augmentasi per sampel
+MAX_LENGTH = 128
+TOKENIZE_BATCH = 4096    # Teks unik per panggilan tokenizer
+MODEL_NAME = 'indobenchmark/indobert-base-p1'
+CACHE_REVISION = 2       # Naikkan jika format file / kebijakan augmentasi diubah
+
+# =====================================================
+# KEBIJAKAN AUGMENTASI (port dari SentimentDataset._augment_text di notebook)
+# =====================================================
+def augment_stacked(text, rng, word_dropout_prob=0.15):
+    """3class_final: dropout, swap dan duplikasi kata diundi terpisah (bisa bertumpuk)"""
+    text = str(text)
+    words = text.split()
+    if len(words) <= 3:
+        return text
+    if rng.random() < 0.5:
+        words = [w for w in words if rng.random() > word_dropout_prob]
+    if rng.random() < 0.3 and len(words) > 2:
+        idx = rng.randint(0, len(words) - 2)
+        words[idx], words[idx + 1] = words[idx + 1], words[idx]
+    if rng.random() < 0.2 and len(words) > 1:
+        idx = rng.randint(0, len(words) - 1)
+        words.insert(idx, words[idx])
+    return ' '.join(words) if words else text
+
+def augment_uniform_dropout(text, rng, augment_prob=0.3, min_drop=0.1, max_drop=0.2, min_words=2):
+    """5class: dropout dengan rate acak [min_drop, max_drop]; batal jika sisa < min_words kata"""
+    if rng.random() > augment_prob:
+        return text
+    words = text.split()
+    if len(words) <= 3:
+        return text
+    drop_rate = rng.uniform(min_drop, max_drop)
+    keep_words = [w for w in words if rng.random() > drop_rate]
+    if len(keep_words) < min_words:
+        return text
+    return ' '.join(keep_words)
+
+def augment_dropout_swap(text, rng, word_dropout_prob=0.1, augment_prob=0.5):
+    """5class_kaggle_optimized: dropout kata atau swap kata bersebelahan"""
+    if rng.random() > augment_prob:
+        return text
+    words = str(text).split()
+    if len(words) <= 3:
+        return text
+    if rng.random() < 0.5:
+        words = [w for w in words if rng.random() > word_dropout_prob]
+    elif len(words) > 2:
+        idx = rng.randint(0, len(words) - 2)
+        words[idx], words[idx + 1] = words[idx + 1], words[idx]
+    return ' '.join(words) if words else text
+
+def augment_dropout_swap_light(text, rng, word_dropout_prob=0.15):
+    """cpu: dropout 30%, swap 20%, tanpa augmentasi 50%"""
+    text = str(text)
+    words = text.split()
+    if len(words) <= 3:
+        return text
+    aug_type = rng.random()
+    if aug_type < 0.3:
+        words = [w for w in words if rng.random() > word_dropout_prob]
+    elif aug_type < 0.5:
+        if len(words) > 2:
+            idx = rng.randint(0, len(words) - 2)
+            words[idx], words[idx + 1] = words[idx + 1], words[idx]
+    return ' '.join(words) if words else text
+
+def augment_dropout_swap_delete(text, rng, word_dropout_prob=0.2):
+    """local: dropout 30%, swap 20%, hapus satu kata 20%, tanpa augmentasi 30%"""
+    text = str(text)
+    words = text.split()
+    if len(words) <= 3:
+        return text
+    aug_type = rng.random()
+    if aug_type < 0.3:
+        words = [w for w in words if rng.random() > word_dropout_prob]
+    elif aug_type < 0.5:
+        if len(words) > 2:
+            idx = rng.randint(0, len(words) - 2)
+            words[idx], words[idx + 1] = words[idx + 1], words[idx]
+    elif aug_type < 0.7:
+        if len(words) > 4:
+            words.pop(rng.randint(0, len(words) - 1))
+    return ' '.join(words) if words else text
+
+def augment_enhanced(text, rng, word_dropout_prob=0.15, augment_prob=0.7):
+    """3class_kaggle_optimized: dropout, swap, hapus 1-2 kata, acak bagian tengah, duplikasi"""
+    if rng.random() > augment_prob:
+        return text
+    words = str(text).split()
+    if len(words) <= 4:
+        return text
+    aug_type = rng.random()
+    if aug_type < 0.25:
+        words = [w for w in words if rng.random() > word_dropout_prob]
+    elif aug_type < 0.45:
+        if len(words) > 2:
+            idx = rng.randint(0, len(words) - 2)
+            words[idx], words[idx + 1] = words[idx + 1], words[idx]
+    elif aug_type < 0.60:
+        if len(words) > 5:
+            for _ in range(rng.randint(1, 2)):
+                if len(words) > 4:
+                    words.pop(rng.randint(1, len(words) - 2))
+    elif aug_type < 0.75:
+        if len(words) > 5:
+            mid_start = len(words) // 4
+            mid_end = 3 * len(words) // 4
+            middle = words[mid_start:mid_end]
+            rng.shuffle(middle)
+            words = words[:mid_start] + middle + words[mid_end:]
+    elif aug_type < 0.90:
+        if len(words) > 3:
+            dup_idx = rng.randint(0, len(words) - 1)
+            words.insert(dup_idx, words[dup_idx])
+    return ' '.join(words) if words else text
+
+POLICIES = {
+    'stacked': augment_stacked,
+    'uniform-dropout': augment_uniform_dropout,
+    'dropout-swap': augment_dropout_swap,
+    'dropout-swap-light': augment_dropout_swap_light,
+    'dropout-swap-delete': augment_dropout_swap_delete,
+    'enhanced': augment_enhanced,
+    'none': lambda text, rng, **kwargs: text,
+}
+
+def view_texts(texts, view, policy='dropout-swap', seed=42, **policy_kwargs):
+    """Teks untuk satu view: RNG sendiri per (seed, view), jadi view bisa dibangun terpisah"""
+    augment = POLICIES[policy]
+    rng = random.Random(f'{seed}:{view}')
+    return [augment(str(text), rng, **policy_kwargs) for text in texts]
+
+# =====================================================
+# BUILD
+# =====================================================
+def _tokenizer_id(tokenizer):
+    """Identitas tokenizer untuk cache key (nama model + ukuran vocab jika ada)"""
+    return (getattr(tokenizer, 'name_or_path', type(tokenizer).__name__),
+            getattr(tokenizer, 'vocab_size', None))
+
+def cache_key(texts, labels, tokenizer, views, max_length, policy, seed, policy_kwargs):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((CACHE_REVISION, _tokenizer_id(tokenizer), views, max_length, policy, seed,
+                        sorted(policy_kwargs.items()))).encode('utf-8'))
+    digest.update(pd.util.hash_array(np.asarray([str(t) for t in texts], dtype=object)).tobytes())
+    digest.update(np.asarray(labels, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+def tokenize_unique(texts, tokenizer, max_length=MAX_LENGTH, batch=TOKENIZE_BATCH):
+    """
+    (input_ids int32 (U, max_length), lengths uint16 (U,), codes): teks unik
+    ditokenisasi sekali (padding='max_length', truncation) lewat
+    tokenizer(list_teks, ...) gaya HuggingFace; codes memetakan teks -> baris unik
+    """
+    codes, uniques = pd.factorize(pd.Series(texts, dtype=object))
+    input_ids = np.empty((len(uniques), max_length), dtype=np.int32)
+    lengths = np.empty(len(uniques), dtype=np.uint16)
+    for start in range(0, len(uniques), batch):
+        chunk = [str(t) for t in uniques[start:start + batch]]
+        encoding = tokenizer(chunk, add_special_tokens=True, max_length=max_length,
+                             padding='max_length', truncation=True, return_attention_mask=True)
+        input_ids[start:start + len(chunk)] = np.asarray(encoding['input_ids'], dtype=np.int32)
+        lengths[start:start + len(chunk)] = np.asarray(encoding['attention_mask'], dtype=np.uint8).sum(axis=1)
+    return input_ids, lengths, codes
+
+def build_view_cache(texts, labels, tokenizer, out_dir, views=VIEWS, max_length=MAX_LENGTH,
+                     policy='dropout-swap', seed=42, force=False, **policy_kwargs):
+    """
+    Bangun cache di out_dir (dilewati jika cache dengan key yang sama sudah
+    ada, kecuali force=True). Return meta (dict).
+    """
+    texts = [str(t) for t in texts]
+    labels = np.asarray(labels, dtype=np.int64)
+    key = cache_key(texts, labels, tokenizer, views, max_length, policy, seed, policy_kwargs)
+    meta_path = os.path.join(out_dir, 'meta.json')
+    if not force and os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('key') == key:
+            return meta
+
+    os.makedirs(out_dir, exist_ok=True)
+    # Semua view sekaligus: teks yang sama (view tanpa augmentasi) ditokenisasi sekali
+    all_texts = [text for view in range(views)
+                 for text in view_texts(texts, view, policy, seed, **policy_kwargs)]
+    unique_ids, unique_lengths, codes = tokenize_unique(all_texts, tokenizer, max_length)
+
+    input_ids = np.lib.format.open_memmap(os.path.join(out_dir, 'input_ids.npy'), mode='w+',
+                                          dtype=np.int32, shape=(views, len(texts), max_length))
+    lengths = np.lib.format.open_memmap(os.path.join(out_dir, 'lengths.npy'), mode='w+',
+                                        dtype=np.uint16, shape=(views, len(texts)))
+    codes = codes.reshape(views, len(texts))
+    for view in range(views):
+        input_ids[view] = unique_ids[codes[view]]
+        lengths[view] = unique_lengths[codes[view]]
+    input_ids.flush()
+    lengths.flush()
+    del input_ids, lengths
+    np.save(os.path.join(out_dir, 'labels.npy'), labels)
+
+    meta = {'key': key, 'rows': len(texts), 'views': views, 'max_length': max_length,
+            'policy': policy, 'seed': seed, 'policy_kwargs': policy_kwargs,
+            'tokenizer': list(_tokenizer_id(tokenizer)), 'unique_texts': len(unique_ids)}
+    # meta.json ditulis terakhir: cache yang build-nya terputus tidak dianggap valid
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+# =====================================================
+# DATASET
+# =====================================================
+class ViewCacheDataset:
+    """
+    Dataset map-style (kompatibel torch DataLoader) di atas cache memmap.
+    View yang dipakai = (epoch + seed) % views; panggil set_epoch(epoch)
+    sebelum iterasi DataLoader setiap epoch (worker dibuat ulang per epoch
+    jika persistent_workers=False, jadi epoch ikut tersalin).
+    """
+
+    def __init__(self, cache_dir, seed=0):
+        with open(os.path.join(cache_dir, 'meta.json'), encoding='utf-8') as f:
+            self.meta = json.load(f)
+        self.input_ids = np.load(os.path.join(cache_dir, 'input_ids.npy'), mmap_mode='r')
+        self.lengths = np.load(os.path.join(cache_dir, 'lengths.npy'), mmap_mode='r')
+        self.labels = np.load(os.path.join(cache_dir, 'labels.npy'))
+        self.views = self.meta['views']
+        self.seed = seed
+        self.view = seed % self.views
+        self._positions = np.arange(self.meta['max_length'])
+
+    def set_epoch(self, epoch):
+        self.view = (epoch + self.seed) % self.views
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, idx):
+        return {
+            'input_ids': self.input_ids[self.view, idx].astype(np.int64),
+            'attention_mask': (self._positions < self.lengths[self.view, idx]).astype(np.int64),
+            'label': self.labels[idx],
+        }
+
+# =====================================================
+# CLI
+# =====================================================
+def parse_args():
+    parser = argparse.ArgumentParser(description='Bangun cache multi-view augmentasi + tokenisasi')
+    parser.add_argument('--input', required=True, help='CSV split training')
+    parser.add_argument('--out', required=True, help='Folder cache')
+    parser.add_argument('--text-col', default='content_clean')
+    parser.add_argument('--label-col', default='label')
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--views', type=int, default=VIEWS)
+    parser.add_argument('--max-length', type=int, default=MAX_LENGTH)
+    parser.add_argument('--policy', default='dropout-swap', choices=sorted(POLICIES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--force', action='store_true')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    from transformers import BertTokenizerFast  # Hanya dibutuhkan untuk CLI
+
+    df = pd.read_csv(args.input)
+    labels = df[args.label_col]
+    if not pd.api.types.is_integer_dtype(labels):
+        labels = pd.Series(pd.factorize(labels, sort=True)[0])
+    tokenizer = BertTokenizerFast.from_pretrained(args.model)
+    print(f'🧩 Membangun {args.views} view x {len(df):,} sampel ({args.policy})...')
+    meta = build_view_cache(df[args.text_col].fillna(''), labels, tokenizer, args.out,
+                            views=args.views, max_length=args.max_length, policy=args.policy,
+                            seed=args.seed, force=args.force)
+    print(f'✅ {args.out}: {meta["rows"]:,} sampel, {meta["views"]} view, '
+          f'{meta["unique_texts"]:,} teks unik ditokenisasi')
+
+if __name__ == '__main__':
+    main()